@@ -1,5 +1,4 @@
 import os
-import json
 import threading
 import time
 from flask import Flask, render_template, jsonify, request
@@ -7,99 +6,47 @@ import scraper
 
 app = Flask(__name__)
 
-SETTINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "settings.json")
-IGNORELIST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ignorelist.json")
-
-_cached_settings = None
-_cached_ignorelist = None
-_settings_lock = threading.Lock()
-_ignorelist_lock = threading.Lock()
-
-def load_ignorelist(force_reload=False):
-    global _cached_ignorelist
-    if _cached_ignorelist is not None and not force_reload:
-        return _cached_ignorelist
-    with _ignorelist_lock:
-        if _cached_ignorelist is not None and not force_reload:
-            return _cached_ignorelist
-        if not os.path.exists(IGNORELIST_PATH):
-            _cached_ignorelist = []
-            return _cached_ignorelist
-        try:
-            with open(IGNORELIST_PATH, "r", encoding="utf-8") as f:
-                _cached_ignorelist = json.load(f)
-        except:
-            _cached_ignorelist = []
-    return _cached_ignorelist
-
-def save_ignorelist(lst):
-    global _cached_ignorelist
-    try:
-        with _ignorelist_lock:
-            _cached_ignorelist = lst
-            tmp = IGNORELIST_PATH + ".tmp"
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(lst, f, indent=4, ensure_ascii=False)
-            # Atomic rename with retries for transient locks (Windows lock issues)
-            for attempt in range(5):
-                try:
-                    os.replace(tmp, IGNORELIST_PATH)
-                    break
-                except PermissionError:
-                    time.sleep(0.1)
-            else:
-                os.replace(tmp, IGNORELIST_PATH)
-    except Exception as e:
-        print(f"Error saving ignorelist: {e}")
-
-def load_settings(force_reload=False):
-    global _cached_settings
-    if _cached_settings is not None and not force_reload:
-        return _cached_settings
-    with _settings_lock:
-        if _cached_settings is not None and not force_reload:
-            return _cached_settings
-        if not os.path.exists(SETTINGS_PATH):
-            _cached_settings = {"unchecked_tournaments": []}
-            return _cached_settings
-        try:
-            with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
-                _cached_settings = json.load(f)
-        except:
-            _cached_settings = {"unchecked_tournaments": []}
-    return _cached_settings
-
-def save_settings(settings):
-    global _cached_settings
-    try:
-        with _settings_lock:
-            _cached_settings = settings
-            tmp_path = SETTINGS_PATH + ".tmp"
-            with open(tmp_path, "w", encoding="utf-8") as f:
-                json.dump(settings, f, indent=4, ensure_ascii=False)
-            # Atomic rename with retries for transient locks (Windows lock issues)
-            for attempt in range(5):
-                try:
-                    os.replace(tmp_path, SETTINGS_PATH)
-                    break
-                except PermissionError:
-                    time.sleep(0.1)
-            else:
-                os.replace(tmp_path, SETTINGS_PATH)
-    except Exception as e:
-        print(f"Error saving settings: {e}")
-        if os.path.exists(SETTINGS_PATH + ".tmp"):
-            try:
-                os.remove(SETTINGS_PATH + ".tmp")
-            except:
-                pass
-
 def start_background_sync():
     pass  # Auto-sync disabled — sync only on manual button click
 
+BACKUP_INTERVAL = 24 * 60 * 60  # nightly snapshot of the match databases
+
+def start_backup_scheduler():
+    """Daemon thread that takes a snapshot once the newest one is a day old.
+
+    The backup itself runs on its own thread and connection (see
+    scraper.backup_databases), so it never holds up syncs or requests.
+    """
+    def loop():
+        while True:
+            try:
+                latest = scraper.list_backups()
+                if not latest or time.time() - latest[0].get("created_at", 0) >= BACKUP_INTERVAL:
+                    scraper.start_backup()
+            except Exception as e:
+                print(f"Backup scheduler failed: {e}")
+            time.sleep(60 * 60)
+
+    threading.Thread(target=loop, name="backup-scheduler", daemon=True).start()
+
+DB_MAINTENANCE_INTERVAL = 5 * 60
+
+def start_db_maintenance():
+    """Daemon thread running scraper.run_db_maintenance every few minutes
+    (WAL checkpoint when large, incremental vacuum, PRAGMA optimize)."""
+    def loop():
+        while True:
+            time.sleep(DB_MAINTENANCE_INTERVAL)
+            try:
+                scraper.run_db_maintenance()
+            except Exception as e:
+                print(f"DB maintenance failed: {e}")
+
+    threading.Thread(target=loop, name="db-maintenance", daemon=True).start()
+
 def _get_visible_matches():
-    settings = load_settings()
-    ignore_list = load_ignorelist()
+    settings = scraper.get_settings()
+    ignore_list = scraper.get_ignore_list()
     ignore_names = {t["name"] for t in ignore_list}
     all_tournament_rows = scraper.load_tournament_overview()
     tournament_rows = [row for row in all_tournament_rows if row["tournament"] not in ignore_names]
@@ -129,13 +76,12 @@ def index():
     }
 
     # Enrich ignore list entries that are missing logos and persist if any updated
-    updated = False
+    missing_logos = {}
     for entry in ignore_list:
         if not entry.get("logo") and entry["name"] in logo_lookup:
-            entry["logo"] = logo_lookup[entry["name"]]
-            updated = True
-    if updated:
-        save_ignorelist(ignore_list)
+            entry["logo"] = missing_logos[entry["name"]] = logo_lookup[entry["name"]]
+    if missing_logos:
+        scraper.set_ignored_tournament_logos(missing_logos)
 
     tournament_order = settings.get("tournament_order", {})
     sorted_tournaments = sorted(
@@ -179,40 +125,27 @@ def api_match_detail(match_id):
     
     force_refresh = request.args.get("refresh") == "true"
     
-    # Re-fetch if no stats, or if players is old format (has team1/team2 keys directly)
-    players = match.get("players", {})
-    old_format = isinstance(players, dict) and ("team1" in players or "team2" in players) and "all" not in players and "0" not in players
-    missing_all = isinstance(players, dict) and "all" not in players
-    # Check if any player is missing a photo
-    missing_photos = any(
-        not p.get("photo")
-        for map_data in players.values() if isinstance(map_data, dict)
-        for team in ("team1", "team2")
-        for p in map_data.get(team, [])
-    )
-    missing_new_stats = any(
-        "kd_diff" not in p
-        for map_data in players.values() if isinstance(map_data, dict)
-        for team in ("team1", "team2")
-        for p in map_data.get(team, [])
-    )
+    # Re-fetch if stats are incomplete, the player payload is in an older
+    # format (flat team1/team2, no kd_diff), or player photos are missing.
+    # All three come from the state columns stored with the row.
     stats_only = request.args.get("stats_only") == "true"
-    if (force_refresh or not scraper.has_complete_match_stats(match) or old_format or missing_all or (missing_photos and not stats_only) or missing_new_stats) and match.get("href"):
+    if (force_refresh or scraper.match_needs_detail_refresh(match, include_photos=not stats_only)) and match.get("href"):
         details = scraper.fetch_match_detail_page(match["href"], include_player_photos=not stats_only)
         if details:
             match.update(details)
             if details.get("status"):
                 match["status"] = details["status"]
             scraper.upsert_match(match)
+        # Every fetch moves the match's stats retry schedule (missing-stats button)
+        match["next_attempt_at"] = scraper.record_stats_attempt(match, fetched=bool(details))
     match["has_stats"] = scraper.has_complete_match_stats(match)
     match["has_details"] = scraper.has_complete_match_data(match)
     return jsonify(match)
 
 @app.route("/api/matches")
 def api_matches():
-    settings = load_settings()
-    ignore_list = load_ignorelist()
-    ignore_names = {t["name"] for t in ignore_list}
+    settings = scraper.get_settings()
+    ignore_names = scraper.get_ignored_tournament_names()
     saved_start = settings.get("scrape_start", 1)
     saved_end = settings.get("scrape_end", 5)
     start_page = request.args.get("start", saved_start, type=int)
@@ -221,6 +154,12 @@ def api_matches():
     end_page = max(start_page, end_page)
     scraper.fetch_and_update_matches(start_page=start_page, end_page=end_page)
 
+    # Link tournaments stored before event ids existed to their VLR event
+    try:
+        scraper.backfill_event_ids()
+    except Exception as e:
+        print(f"Error backfilling event ids: {e}")
+
     # Existing imported event pages can contain older Group Stage/Play-In
     # matches that are no longer present in VLR's recent-results feed.
     try:
@@ -240,6 +179,12 @@ def api_matches():
     except Exception as e:
         print(f"Error backfilling tournament logos: {e}")
 
+    # Keep matches.db to the current seasons
+    try:
+        scraper.archive_old_tournaments()
+    except Exception as e:
+        print(f"Error archiving old tournaments: {e}")
+
     # Load missing stats for completed matches if requested
     if request.args.get("load_missing") == "true":
         scraper.load_missing_stats()
@@ -254,9 +199,7 @@ def api_matches():
 
 @app.route("/api/matches/view")
 def api_matches_view():
-    settings = load_settings()
-    ignore_list = load_ignorelist()
-    ignore_names = {t["name"] for t in ignore_list}
+    ignore_names = scraper.get_ignored_tournament_names()
     tournament_rows = scraper.load_tournament_overview()
     tournament_rows = [row for row in tournament_rows if row["tournament"] not in ignore_names]
     tournament_names = [row["tournament"] for row in tournament_rows]
@@ -272,8 +215,7 @@ def api_matches_all():
     Heavier than /api/matches (slimmed list) — used only on demand by the
     player leaderboard, tournament standings and team history panels.
     """
-    ignore_list = load_ignorelist()
-    ignore_names = {t["name"] for t in ignore_list}
+    ignore_names = scraper.get_ignored_tournament_names()
     tournament_rows = scraper.load_tournament_overview()
     tournament_rows = [row for row in tournament_rows if row["tournament"] not in ignore_names]
     tournament_names = [row["tournament"] for row in tournament_rows]
@@ -283,54 +225,140 @@ def api_matches_all():
     )
     return jsonify(matches)
 
-def _name_matches(names, name):
-    """Loose tournament-name match: exact, or containment either direction.
+@app.route("/api/leaderboard")
+def api_leaderboard():
+    """Top-N player aggregates for the selected tournaments.
 
-    The VLR.gg tournaments page and the match-list parser can name the same
-    event slightly differently (e.g. "VCT 2026 — EMEA Stage 2" vs "Stage 2 W3"),
-    so exact matches miss real hits. A minimum length avoids false positives
-    on short shared substrings.
+    ?tournament=<name> (repeatable) limits the leaderboard to those events,
+    ?split=true keeps a player's rows per team, ?limit=N caps the rows and
+    ?sort=rating|acs|kills|... picks the ranking column.
     """
-    if not name:
-        return False
-    nl = name.strip().lower()
-    for k in names:
-        kl = k.strip().lower()
-        if not kl:
-            continue
-        if kl == nl:
-            return True
-        if len(kl) >= 6 and len(nl) >= 6 and (kl in nl or nl in kl):
-            return True
-    return False
+    tournaments = request.args.getlist("tournament")
+    ignore_names = scraper.get_ignored_tournament_names()
+    tournaments = [t for t in tournaments if t not in ignore_names]
+    players = scraper.get_player_leaderboard(
+        tournament_names=tournaments,
+        split_by_team=request.args.get("split") == "true",
+        limit=request.args.get("limit", 200, type=int),
+        sort=request.args.get("sort", "rating"),
+        query=request.args.get("q", "").strip(),
+    )
+    return jsonify({"players": players})
+
+@app.route("/api/form")
+def api_form():
+    """Player or team form over a date window, from the weekly buckets.
+
+    ?kind=player|team (default player), ?days=N (default 30) or explicit
+    ?since=/?until= unix bounds (widened to whole weeks), ?tournament=,
+    ?player= / ?team= (repeatable), ?split=true (players per team),
+    ?sort=, ?limit= and ?min_maps=.
+    """
+    now = int(time.time())
+    until = request.args.get("until", type=int) or now
+    since = request.args.get("since", type=int)
+    if since is None:
+        since = until - max(1, request.args.get("days", 30, type=int)) * 86400
+    ignore_names = scraper.get_ignored_tournament_names()
+    requested = request.args.getlist("tournament")
+    tournaments = [t for t in requested if t not in ignore_names]
+    kind = "team" if request.args.get("kind") == "team" else "player"
+    rows = []
+    if tournaments or not requested:
+        options = dict(
+            tournament_names=tournaments,
+            limit=request.args.get("limit", 100, type=int),
+            min_maps=request.args.get("min_maps", 1, type=int),
+        )
+        if kind == "team":
+            rows = scraper.get_team_form(
+                since, until, teams=request.args.getlist("team"),
+                sort=request.args.get("sort", "map_winrate"), **options,
+            )
+        else:
+            rows = scraper.get_player_form(
+                since, until, players=request.args.getlist("player"),
+                split_by_team=request.args.get("split") == "true",
+                sort=request.args.get("sort", "rating"), **options,
+            )
+    since, until = scraper.form_window(since, until)
+    return jsonify({"kind": kind, "since": since, "until": until, f"{kind}s": rows})
+
+@app.route("/api/standings")
+def api_standings():
+    """Series/map/round standings for each ?tournament=<name> (repeatable)."""
+    ignore_names = scraper.get_ignored_tournament_names()
+    tournaments = [t for t in request.args.getlist("tournament") if t not in ignore_names]
+    return jsonify({"standings": scraper.get_tournament_standings(tournaments)})
+
+@app.route("/api/team/<path:name>/history")
+def api_team_history(name):
+    """One page of a team's matches, newest first.
+
+    ?status=completed|all (default completed), ?since=/?until= unix bounds,
+    ?tournament=<name> (repeatable), ?limit=N and ?cursor=<next_cursor>.
+    """
+    status = request.args.get("status", "completed")
+    statuses = None if status == "all" else [s for s in status.split(",") if s]
+    ignore_names = scraper.get_ignored_tournament_names()
+    tournaments = [t for t in request.args.getlist("tournament") if t not in ignore_names]
+    if request.args.getlist("tournament") and not tournaments:
+        return jsonify({"team": name, "logo": "", "matches": [], "next_cursor": None, "summary": None})
+    return jsonify(scraper.get_team_history(
+        name,
+        statuses=statuses,
+        since=request.args.get("since", type=int),
+        until=request.args.get("until", type=int),
+        tournament_names=tournaments,
+        cursor=request.args.get("cursor"),
+        limit=request.args.get("limit", 50, type=int),
+    ))
+
+@app.route("/api/search")
+def api_search():
+    """Prefix search over teams, tournaments, series and players.
+
+    ?q=<words> (each word matches a name/alias prefix), ?kind=team|tournament|
+    series|player (repeatable or comma separated) and ?limit=N (max 100).
+    """
+    query = request.args.get("q", "").strip()
+    kinds = [k for value in request.args.getlist("kind") for k in value.split(",") if k]
+    results = scraper.search_entities(
+        query, kinds=kinds or None, limit=request.args.get("limit", scraper.SEARCH_LIMIT, type=int)
+    ) if query else []
+    return jsonify({"query": query, "results": results})
 
 @app.route("/api/tournaments")
 def api_tournaments():
-    """Return the cached tournament list (fetched from VLR.gg at most once/day).
-
-    ?refresh=true forces a re-fetch from page 1. ?pages=N makes N pages of the
-    /events listing available (missing pages are fetched on demand and cached).
-    Each item gets `added`/`ignored` flags so the UI can mark tournaments that
-    are already in the DB / ignore list.
+    """Return one page of the VLR.gg tournament catalog (stored in the DB).
+
+    ?q= (name prefix search), ?region=, ?status=, ?page= and ?per_page= pick
+    the page. ?refresh=true re-fetches the listing from page 1 and ?pages=N
+    makes N pages of the /events listing available first (missing pages are
+    fetched on demand). Each item gets `added`/`ignored` flags so the UI can
+    mark tournaments that are already in the DB / ignore list: by VLR event
+    id, or by exact name for tournaments not linked to an event yet.
     """
     refresh = request.args.get("refresh") == "true"
-    try:
-        pages = max(1, int(request.args.get("pages") or 1))
-    except (TypeError, ValueError):
-        pages = 1
-    result = scraper.get_tournaments(refresh=refresh, pages=pages)
-    known = scraper.get_known_tournament_names()
-    ignored = {t["name"] for t in load_ignorelist()}
-    for t in result["tournaments"]:
-        t["added"] = _name_matches(known, t["name"])
-        t["ignored"] = _name_matches(ignored, t["name"])
-    return jsonify({
-        "tournaments": result["tournaments"],
-        "fetched_at": result["fetched_at"],
-        "error": result["error"],
-        "total_pages": result["total_pages"],
-        "pages_fetched": result["pages_fetched"],
-    })
+    pages = request.args.get("pages", 1, type=int)
+    result = scraper.load_tournament_catalog(refresh=refresh, pages=pages)
+    catalog = scraper.query_tournament_catalog(
+        query=request.args.get("q", ""),
+        region=request.args.get("region", ""),
+        status=request.args.get("status", ""),
+        page=request.args.get("page", 1, type=int),
+        per_page=request.args.get("per_page", scraper.TOURNAMENT_CATALOG_PAGE_SIZE, type=int),
+    )
+    if catalog["tournaments"]:
+        known_names = scraper.get_known_tournament_names()
+        known_ids = set(scraper.get_known_events())
+        ignored_names = scraper.get_ignored_tournament_names()
+        ignored_ids = scraper.get_ignored_event_ids()
+        for t in catalog["tournaments"]:
+            event_id = int(t["id"])
+            t["added"] = event_id in known_ids or t["name"] in known_names
+            t["ignored"] = event_id in ignored_ids or t["name"] in ignored_names
+    return jsonify(dict(catalog, **result))
 
 @app.route("/api/tournaments/progress")
 def api_tournaments_progress():
@@ -352,24 +380,23 @@ def api_tournaments_add():
         return jsonify({"status": "error", "message": "No tournaments provided."}), 400
 
     results = []
+    stored_names = scraper.get_event_names(t.get("id") for t in items)
     for i, t in enumerate(items):
         name = t.get("name", "")
-        # 1. Un-ignore (in case it was previously ignored) and restore matches to main DB
-        if name:
-            lst = load_ignorelist()
-            was_ignored = any(x["name"] == name for x in lst)
-            if was_ignored:
-                save_ignorelist([x for x in lst if x["name"] != name])
+        # The event may already be stored under another spelling
+        names = {n for n in (name, stored_names.get(int(t["id"]) if str(t.get("id") or "").isdigit() else None)) if n}
+        # 1. Un-ignore (in case it was previously ignored)
+        if names:
+            ignored = names & scraper.get_ignored_tournament_names()
+            if ignored:
                 try:
-                    scraper.move_tournament_from_ignored(name)
+                    scraper.set_tournaments_ignored(ignored, ignored=False)
                 except Exception as e:
-                    print(f"Warning: move_tournament_from_ignored failed for '{name}': {e}")
+                    print(f"Warning: un-ignoring '{name}' failed: {e}")
             # 2. Un-hide (remove from unchecked_tournaments so it shows in the sidebar)
-            settings = load_settings()
-            unchecked = settings.get("unchecked_tournaments", [])
-            if name in unchecked:
-                settings["unchecked_tournaments"] = [u for u in unchecked if u != name]
-                save_settings(settings)
+            unchecked = scraper.get_settings().get("unchecked_tournaments", [])
+            if names & set(unchecked):
+                scraper.update_settings({"unchecked_tournaments": [u for u in unchecked if u not in names]})
         # 3. Fetch the event page matches (light listing only, no player stats)
         added, error = scraper.add_tournament(t)
         results.append({"name": name, "added": added, "error": error})
@@ -378,46 +405,76 @@ def api_tournaments_add():
 
     return jsonify({"status": "success", "results": results, "total_added": sum(r["added"] for r in results)})
 
-@app.route("/api/settings", methods=["GET", "POST"])
+@app.route("/api/settings", methods=["GET", "POST", "PATCH"])
 def api_settings():
-    if request.method == "POST":
-        data = request.json or {}
-        save_settings(data)
-        return jsonify({"status": "success", "settings": data})
+    """GET all settings, POST to replace them, PATCH {key: value} to change
+    only those keys (null deletes a key). Writes are single transactions."""
+    if request.method == "GET":
+        return jsonify(scraper.get_settings())
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"status": "error", "message": "Expected a JSON object."}), 400
+    if request.method == "PATCH":
+        settings = scraper.update_settings(data)
     else:
-        return jsonify(load_settings())
+        settings = scraper.replace_settings(data)
+    return jsonify({"status": "success", "settings": settings})
 
 @app.route("/api/ignorelist", methods=["GET"])
 def api_ignorelist_get():
-    return jsonify(load_ignorelist())
+    return jsonify(scraper.get_ignore_list())
 
 @app.route("/api/ignorelist/add", methods=["POST"])
 def api_ignorelist_add():
     tournaments = request.json or []  # [{name, logo}, ...]
-    lst = load_ignorelist()
-    existing_names = {t["name"] for t in lst}
+    existing_names = scraper.get_ignored_tournament_names()
+    logos = {}
     for t in tournaments:
         if t.get("name") and t["name"] not in existing_names:
-            lst.append({"name": t["name"], "logo": t.get("logo", "")})
-            existing_names.add(t["name"])
-            scraper.move_tournament_to_ignored(t["name"])
-    save_ignorelist(lst)
-    return jsonify({"status": "success", "ignorelist": lst})
+            logos[t["name"]] = t.get("logo", "")
+    scraper.set_tournaments_ignored(list(logos), ignored=True, logos=logos)
+    return jsonify({"status": "success", "ignorelist": scraper.get_ignore_list()})
 
 @app.route("/api/ignorelist/remove", methods=["POST"])
 def api_ignorelist_remove():
     tournament = (request.json or {}).get("tournament", "")
-    lst = [t for t in load_ignorelist() if t["name"] != tournament]
-    save_ignorelist(lst)
     try:
-        scraper.move_tournament_from_ignored(tournament)
+        scraper.set_tournaments_ignored([tournament], ignored=False)
     except Exception as e:
-        print(f"Warning: move_tournament_from_ignored failed for '{tournament}': {e}")
-    return jsonify({"status": "success", "ignorelist": lst})
+        print(f"Warning: un-ignoring '{tournament}' failed: {e}")
+    return jsonify({"status": "success", "ignorelist": scraper.get_ignore_list()})
+
+@app.route("/api/db/stats")
+def api_db_stats():
+    """Connection pool, page/freelist/WAL sizes and last maintenance run."""
+    return jsonify({"pools": scraper.get_db_stats(), "file": scraper.get_db_file_stats()})
+
+@app.route("/api/admin/backup", methods=["GET", "POST"])
+def api_admin_backup():
+    """GET: backup status and snapshots. POST: start a snapshot in the background."""
+    if request.method == "POST":
+        data = request.get_json(silent=True)
+        if data is None:
+            data = {}  # body is optional
+        if not isinstance(data, dict):
+            return jsonify({"status": "error", "message": "Expected a JSON object."}), 400
+        try:
+            keep = int(data.get("keep", scraper.BACKUP_KEEP))
+        except (TypeError, ValueError):
+            keep = 0
+        if keep < 1:
+            return jsonify({"status": "error", "message": "keep must be a positive integer."}), 400
+        started = scraper.start_backup(compress=bool(data.get("compress", True)), keep=keep)
+        return jsonify({"started": started, "status": scraper.get_backup_status()}), 202 if started else 409
+    return jsonify({"status": scraper.get_backup_status(), "backups": scraper.list_backups()})
 
 
 if __name__ == "__main__":
     # Start the background sync thread
     start_background_sync()
+    # The debug reloader runs this block twice; only the serving child starts these.
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_backup_scheduler()
+        start_db_maintenance()
     # Run server on port 5025
     app.run(host="0.0.0.0", port=5025, debug=True, threaded=True)  # threaded so /api/tournaments/progress answers while a refresh runs
@@ -1,7 +1,13 @@
 import os
 import re
+import atexit
+import copy
 import json
+import gzip
+import shutil
+import hashlib
 import sqlite3
+import zlib
 import requests
 import threading
 import time
@@ -9,11 +15,18 @@ from bs4 import BeautifulSoup
 from datetime import datetime, timezone, timedelta
 import zoneinfo
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, ExitStack
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 JSON_PATH = os.path.join(BASE_DIR, "matches.json")
 DB_PATH = os.path.join(BASE_DIR, "matches.db")
 IGNORED_DB_PATH = os.path.join(BASE_DIR, "ignored_matches.db")
+# Per-year archive databases (matches_<year>.db) for old completed tournaments.
+ARCHIVE_DIR = os.path.join(BASE_DIR, "archive")
+# Completed tournaments whose last match is older than this are archived.
+ARCHIVE_AFTER_DAYS = 365
+# Snapshots made by backup_databases(), one directory per snapshot.
+BACKUP_DIR = os.path.join(BASE_DIR, "backups")
 IMAGE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "images_cache")
 
 # Ensure image cache directory exists
@@ -26,6 +39,11 @@ _cache_lock = threading.Lock()
 _cached_matches = None
 _db_init_lock = threading.Lock()
 _db_initialized = False
+# Computed standings per tournament; entries are dropped by
+# _invalidate_standings whenever a match of that tournament is written.
+_standings_cache = {}
+_standings_cache_lock = threading.Lock()
+_standings_generation = 0
 
 MATCH_COLUMNS = [
     "id",
@@ -54,12 +72,602 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 }
 
+# When set to a list, every statement run on a pooled connection is appended
+# to it (used by tests/test_query_plans.py).
+_sql_trace = None
+
+# WAL maintenance (see run_db_maintenance): a TRUNCATE checkpoint runs once
+# the -wal file passes WAL_CHECKPOINT_BYTES, and any reset WAL is cut back to
+# WAL_SIZE_LIMIT_BYTES.
+WAL_CHECKPOINT_BYTES = 32 * 1024 * 1024
+WAL_SIZE_LIMIT_BYTES = 8 * 1024 * 1024
+# Free pages are returned to the filesystem VACUUM_STEP_PAGES at a time,
+# at most VACUUM_MAX_STEPS steps per maintenance run, once more than
+# VACUUM_MIN_FREE_PAGES are free.
+VACUUM_MIN_FREE_PAGES = 256
+VACUUM_STEP_PAGES = 128
+VACUUM_MAX_STEPS = 64
+VACUUM_STEP_SLEEP = 0.05
+
+# Idle connections kept per database file. Nested or concurrent checkouts
+# beyond this open short-lived overflow connections instead of blocking.
+DB_POOL_SIZE = 4
+# Prepared statements cached per connection (sqlite3 default is 128).
+DB_STATEMENT_CACHE_SIZE = 256
+
+class _ConnectionPool:
+    """Bounded pool of long-lived SQLite connections for one database file.
+
+    Pragmas are applied once when a connection is opened; after that a
+    checkout is a list pop. Each checkout is a transaction: committed when
+    the block exits normally, rolled back on error.
+    """
+
+    def __init__(self, path, size=DB_POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = []
+        self._lock = threading.Lock()
+        self._conn_stats = {}
+        self.stats = {"opened": 0, "closed": 0, "checkouts": 0, "reused": 0, "overflow": 0, "in_use": 0, "peak_in_use": 0}
+
+    def _open(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=30,
+            check_same_thread=False,
+            cached_statements=DB_STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Checkpoints that reset the WAL truncate it back to this size.
+        conn.execute(f"PRAGMA journal_size_limit={int(WAL_SIZE_LIMIT_BYTES)}")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+            self.stats["checkouts"] += 1
+            self.stats["in_use"] += 1
+            self.stats["peak_in_use"] = max(self.stats["peak_in_use"], self.stats["in_use"])
+            if conn is not None:
+                self.stats["reused"] += 1
+            elif self.stats["in_use"] > self.size:
+                self.stats["overflow"] += 1
+        if conn is None:
+            conn = self._open()
+            with self._lock:
+                self.stats["opened"] += 1
+                self._conn_stats[id(conn)] = {"opened_at": int(time.time()), "checkouts": 0, "busy_seconds": 0.0}
+        trace = _sql_trace
+        if trace is not None:
+            conn.set_trace_callback(trace.append)
+        started = time.perf_counter()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            if trace is not None:
+                conn.set_trace_callback(None)
+            self._release(conn, time.perf_counter() - started)
+
+    def _release(self, conn, busy):
+        keep = True
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            keep = False
+        with self._lock:
+            self.stats["in_use"] -= 1
+            entry = self._conn_stats.get(id(conn))
+            if entry is not None:
+                entry["checkouts"] += 1
+                entry["busy_seconds"] += busy
+            if keep and len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+            self.stats["closed"] += 1
+            self._conn_stats.pop(id(conn), None)
+        conn.close()
+
+    def close_idle(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+            for conn in idle:
+                self._conn_stats.pop(id(conn), None)
+            self.stats["closed"] += len(idle)
+        for conn in idle:
+            conn.close()
+
+    def snapshot(self):
+        with self._lock:
+            idle_ids = {id(conn) for conn in self._idle}
+            return {
+                "path": self.path,
+                "size": self.size,
+                "idle": len(self._idle),
+                **self.stats,
+                "connections": [
+                    {**entry, "busy_seconds": round(entry["busy_seconds"], 4), "idle": conn_id in idle_ids}
+                    for conn_id, entry in self._conn_stats.items()
+                ],
+            }
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def _pool_for(path):
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None:
+            pool = _pools[path] = _ConnectionPool(path)
+        return pool
+
 def _get_conn():
-    conn = sqlite3.connect(DB_PATH, timeout=30)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA synchronous=NORMAL")
-    return conn
+    """Check out a pooled connection to matches.db (use as a context manager)."""
+    return _pool_for(DB_PATH).connection()
+
+@contextmanager
+def _attached(conn, path, alias):
+    """ATTACH another database for the duration of a block.
+
+    Pooled connections outlive the block, so the attachment must not leak
+    into the next checkout. ATTACH cannot run inside an open transaction,
+    so attach before the first write; the block's writes are committed at
+    its end because DETACH cannot run inside one either. A migration step
+    that reads archives therefore does only that (its commit lands just
+    before its version bump), never after writes of its own.
+    """
+    conn.execute(f"ATTACH DATABASE ? AS {alias}", (path,))
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute(f"DETACH DATABASE {alias}")
+
+# Tables whose rows move to an archive together with their tournament. The
+# archive copies have the same columns and indexes; teams, aliases and the
+# ignore state stay in matches.db.
+ARCHIVE_TABLES = (
+    "matches", "match_maps", "player_map_stats", "player_aggregates", "player_week_stats", "team_week_stats",
+)
+
+def _archive_path(year):
+    return os.path.join(ARCHIVE_DIR, f"matches_{int(year)}.db")
+
+def _archive_paths(archive_dir=None):
+    """Existing archive files as {year: path}, oldest first."""
+    archive_dir = archive_dir or ARCHIVE_DIR
+    if not os.path.isdir(archive_dir):
+        return {}
+    found = {}
+    for name in sorted(os.listdir(archive_dir)):
+        m = re.fullmatch(r"matches_(\d{4})\.db", name)
+        if m:
+            found[int(m.group(1))] = os.path.join(archive_dir, name)
+    return found
+
+def _ensure_archive_schema(conn, alias):
+    """Create (or extend) the archive tables attached as `alias` from main's DDL."""
+    for table in ARCHIVE_TABLES:
+        ddl = conn.execute(
+            "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()[0]
+        conn.execute(re.sub(r"^CREATE TABLE\s+\S+", f"CREATE TABLE IF NOT EXISTS {alias}.{table}", ddl, count=1))
+        existing = set(_table_columns(conn, table, alias))
+        for _, name, decl, notnull, default, _ in conn.execute(f"PRAGMA main.table_info({table})").fetchall():
+            if name not in existing:
+                extra = f" NOT NULL DEFAULT {default}" if notnull else (f" DEFAULT {default}" if default is not None else "")
+                conn.execute(f"ALTER TABLE {alias}.{table} ADD COLUMN {name} {decl}{extra}")
+        for (ddl,) in conn.execute(
+            "SELECT sql FROM main.sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (table,)
+        ).fetchall():
+            conn.execute(re.sub(
+                r"^CREATE (UNIQUE )?INDEX\s+(\S+)", lambda m: f"CREATE {m.group(1) or ''}INDEX IF NOT EXISTS {alias}.{m.group(2)}", ddl, count=1
+            ))
+
+@contextmanager
+def _with_archives(conn):
+    """Expose hot and archived rows together for the duration of a block.
+
+    Attaches every archive file and creates TEMP views all_<table> as a
+    UNION ALL over matches.db and the archives. Yields {table: name to
+    read from}; with no archives these are the plain tables and nothing is
+    attached. Columns an older archive lacks read as NULL.
+    """
+    paths = _archive_paths()
+    if not paths:
+        yield {table: table for table in ARCHIVE_TABLES}
+        return
+    with ExitStack() as stack:
+        aliases = []
+        for year, path in paths.items():
+            alias = f"archive_{year}"
+            stack.enter_context(_attached(conn, path, alias))
+            aliases.append(alias)
+        try:
+            for table in ARCHIVE_TABLES:
+                columns = _table_columns(conn, table)
+                arms = [f"SELECT {', '.join(columns)} FROM main.{table}"]
+                for alias in aliases:
+                    present = set(_table_columns(conn, table, alias))
+                    if present:
+                        select = ", ".join(c if c in present else f"NULL AS {c}" for c in columns)
+                        arms.append(f"SELECT {select} FROM {alias}.{table}")
+                conn.execute(f"CREATE TEMP VIEW all_{table} AS {' UNION ALL '.join(arms)}")
+            yield {table: f"all_{table}" for table in ARCHIVE_TABLES}
+        finally:
+            for table in ARCHIVE_TABLES:
+                conn.execute(f"DROP VIEW IF EXISTS temp.all_{table}")
+
+def get_db_stats():
+    """Pool and per-connection statistics for every opened database."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.snapshot() for pool in pools]
+
+_maintenance_lock = threading.Lock()
+_last_maintenance = {}
+
+def _db_file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def get_db_file_stats():
+    """Page, freelist and WAL sizes of matches.db plus the last maintenance run."""
+    _ensure_db()
+    with _get_conn() as conn:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    return {
+        "path": DB_PATH,
+        "page_size": page_size,
+        "page_count": page_count,
+        "freelist_count": freelist,
+        "free_bytes": freelist * page_size,
+        "db_bytes": _db_file_size(DB_PATH),
+        "wal_bytes": _db_file_size(DB_PATH + "-wal"),
+        "auto_vacuum": {0: "none", 1: "full", 2: "incremental"}.get(auto_vacuum, auto_vacuum),
+        "archives": {str(year): _db_file_size(path) for year, path in _archive_paths().items()},
+        "last_maintenance": dict(_last_maintenance),
+    }
+
+def run_db_maintenance(force_checkpoint=False):
+    """One maintenance pass over matches.db; returns what it did.
+
+    Releases free pages with short incremental_vacuum steps (each its own
+    small write transaction, so syncs interleave), runs PRAGMA optimize,
+    then checkpoints (TRUNCATE) if the WAL has grown large. Meant to be called
+    periodically from a background thread; overlapping calls are skipped.
+    """
+    if not _maintenance_lock.acquire(blocking=False):
+        return None
+    try:
+        _ensure_db()
+        result = {"started_at": int(time.time()), "checkpoint": None, "vacuumed_pages": 0}
+        threshold = VACUUM_MIN_FREE_PAGES
+        for _ in range(VACUUM_MAX_STEPS):
+            with _get_conn() as conn:
+                if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                    break
+                free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if free < threshold:
+                    break
+                step = min(free, VACUUM_STEP_PAGES)
+                # Through execute() the pragma frees a single page per call;
+                # executescript steps it to completion.
+                conn.executescript(f"PRAGMA incremental_vacuum({int(step)});")
+            result["vacuumed_pages"] += step
+            # Once started, keep going until the freelist is empty.
+            threshold = 1
+            time.sleep(VACUUM_STEP_SLEEP)
+        with _get_conn() as conn:
+            conn.execute("PRAGMA optimize")
+        # Last, so the vacuum steps above are folded back into the file too.
+        wal_bytes = _db_file_size(DB_PATH + "-wal")
+        if force_checkpoint or wal_bytes >= WAL_CHECKPOINT_BYTES:
+            flush_match_writes()
+            with _get_conn() as conn:
+                busy, log_pages, done_pages = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+            result["checkpoint"] = {
+                "wal_bytes_before": wal_bytes,
+                "busy": bool(busy),
+                "log_pages": log_pages,
+                "checkpointed_pages": done_pages,
+            }
+        result["finished_at"] = int(time.time())
+        result["wal_bytes"] = _db_file_size(DB_PATH + "-wal")
+        _last_maintenance.clear()
+        _last_maintenance.update(result)
+        return result
+    finally:
+        _maintenance_lock.release()
+
+def close_db_connections():
+    """Close all idle pooled connections (checked-out ones close on return)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_idle()
+
+# Columns added to `matches` after the original CREATE TABLE, in the order
+# they were appended with ALTER TABLE. Each group is added only by its own
+# migration step (the number in the comment); shipped groups never change.
+TEAM_ID_COLUMNS = (  # 1
+    ("team1_id", "TEXT"),
+    ("team2_id", "TEXT"),
+)
+PAYLOAD_STATE_COLUMNS = (  # 8
+    ("stats_state", "INTEGER NOT NULL DEFAULT 0"),
+    ("details_state", "INTEGER NOT NULL DEFAULT 0"),
+    ("payload_format_version", "INTEGER NOT NULL DEFAULT 0"),
+)
+LISTING_HASH_COLUMNS = (("listing_hash", "TEXT"),)  # 12
+EVENT_ID_COLUMNS = (("event_id", "INTEGER"),)  # 18
+STATS_RETRY_COLUMNS = (  # 19
+    ("attempt_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("next_attempt_at", "INTEGER NOT NULL DEFAULT 0"),
+    ("last_error", "TEXT"),
+)
+MATCH_EXTRA_COLUMNS = (
+    TEAM_ID_COLUMNS + PAYLOAD_STATE_COLUMNS + LISTING_HASH_COLUMNS + EVENT_ID_COLUMNS + STATS_RETRY_COLUMNS
+)
+# The columns migrations 6 and 11 write. They insert with their own
+# statement instead of the live upsert, so they keep doing what they did
+# when they shipped.
+_MATCH_COLUMNS_V6 = tuple(MATCH_COLUMNS) + tuple(name for name, _ in TEAM_ID_COLUMNS)
+_MATCH_COLUMNS_V11 = _MATCH_COLUMNS_V6 + tuple(name for name, _ in PAYLOAD_STATE_COLUMNS)
+
+def _insert_match_rows(conn, columns, rows):
+    conn.executemany(
+        f"INSERT INTO matches ({', '.join(columns)}) VALUES ({', '.join(':' + name for name in columns)}) "
+        "ON CONFLICT(id) DO NOTHING",
+        rows,
+    )
+
+def _ensure_columns(conn, table, columns):
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for name, decl in columns:
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
+def _table_columns(conn, table, schema="main"):
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+def _create_schema(conn):
+    """Create the match tables and indexes (schema version 1)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS matches (
+            id TEXT PRIMARY KEY,
+            href TEXT,
+            date TEXT,
+            time TEXT,
+            team1 TEXT,
+            team2 TEXT,
+            score1 TEXT,
+            score2 TEXT,
+            tournament TEXT,
+            series TEXT,
+            tournament_logo TEXT,
+            eta TEXT,
+            status TEXT,
+            team1_logo TEXT,
+            team2_logo TEXT,
+            unix_timestamp INTEGER,
+            bst_time TEXT,
+            maps_json TEXT,
+            players_json TEXT,
+            last_updated INTEGER
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_tournament ON matches(tournament)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_status ON matches(status)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_unix_timestamp ON matches(unix_timestamp)")
+    _ensure_columns(conn, "matches", TEAM_ID_COLUMNS)
+    # Team history reads each side separately, newest first.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_team1_ts ON matches(team1, unix_timestamp)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_team2_ts ON matches(team2, unix_timestamp)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_team1_id ON matches(team1_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_team2_id ON matches(team2_id)")
+
+    # Canonical team identities. `id` is the VLR team id from /team/<id>/
+    # links; teams only ever seen through a logo get a provisional
+    # "logo:<file>" id that is merged into the real id once it is learned.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS teams (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            logo TEXT,
+            logo_key TEXT,
+            updated_at INTEGER
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_teams_logo_key ON teams(logo_key)")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS team_aliases (
+            name_key TEXT PRIMARY KEY,
+            team_id TEXT NOT NULL,
+            name TEXT
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_team_aliases_team ON team_aliases(team_id)")
+    # Last known real logo per normalized team name, so upserts can fill
+    # blank logos without scanning every stored match.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS team_logos (
+            name_key TEXT PRIMARY KEY,
+            logo TEXT NOT NULL
+        )
+        """
+    )
+
+    # Normalized copies of maps_json / players_json so stat queries can be
+    # answered by SQL instead of decoding every match blob. The blobs remain
+    # the source for the detail modal; these tables are rebuilt from them on
+    # every stats write (see _refresh_match_stats).
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS match_maps (
+            match_id TEXT NOT NULL,
+            map_index INTEGER NOT NULL,
+            name TEXT,
+            score1 INTEGER,
+            score2 INTEGER,
+            winner INTEGER,
+            tournament TEXT,
+            unix_timestamp INTEGER,
+            PRIMARY KEY (match_id, map_index)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS player_map_stats (
+            match_id TEXT NOT NULL,
+            map_key TEXT NOT NULL,
+            side INTEGER NOT NULL,
+            slot INTEGER NOT NULL,
+            team TEXT,
+            player TEXT,
+            player_href TEXT,
+            photo TEXT,
+            agents_json TEXT,
+            rating REAL,
+            acs REAL,
+            kills INTEGER,
+            deaths INTEGER,
+            assists INTEGER,
+            kd_diff INTEGER,
+            kast REAL,
+            adr REAL,
+            hs REAL,
+            fk INTEGER,
+            fd INTEGER,
+            fk_diff INTEGER,
+            tournament TEXT,
+            unix_timestamp INTEGER,
+            PRIMARY KEY (match_id, map_key, side, slot)
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_match_maps_tournament ON match_maps(tournament)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pms_player ON player_map_stats(player)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pms_team ON player_map_stats(team)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pms_tournament ON player_map_stats(tournament, map_key)")
+
+    # Per-player, per-tournament, per-team running totals over the "all" stat
+    # tables, refreshed for the affected tournaments whenever stats are
+    # written. The leaderboard sums these rows instead of scanning matches.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS player_aggregates (
+            tournament TEXT NOT NULL,
+            player TEXT NOT NULL,
+            team TEXT NOT NULL,
+            matches_played INTEGER NOT NULL DEFAULT 0,
+            rating_sum REAL NOT NULL DEFAULT 0,
+            rating_n INTEGER NOT NULL DEFAULT 0,
+            acs_sum REAL NOT NULL DEFAULT 0,
+            acs_n INTEGER NOT NULL DEFAULT 0,
+            kills INTEGER NOT NULL DEFAULT 0,
+            deaths INTEGER NOT NULL DEFAULT 0,
+            assists INTEGER NOT NULL DEFAULT 0,
+            kast_sum REAL NOT NULL DEFAULT 0,
+            kast_n INTEGER NOT NULL DEFAULT 0,
+            adr_sum REAL NOT NULL DEFAULT 0,
+            adr_n INTEGER NOT NULL DEFAULT 0,
+            hs_sum REAL NOT NULL DEFAULT 0,
+            hs_n INTEGER NOT NULL DEFAULT 0,
+            fk INTEGER NOT NULL DEFAULT 0,
+            fd INTEGER NOT NULL DEFAULT 0,
+            photo TEXT,
+            team_logo TEXT,
+            agents_json TEXT,
+            PRIMARY KEY (tournament, player, team)
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_player_aggregates_player ON player_aggregates(player)")
+
+# Schema changes are numbered migrations recorded in PRAGMA user_version,
+# so each one runs exactly once per database file and a normal startup is
+# a single version check. Append new steps with the next number; never
+# renumber or edit a step that has shipped. Each step gets the connection
+# and is committed together with its version bump; only step 16 commits on
+# its own, because VACUUM cannot run inside a transaction.
+def _main_db_migrations():
+    return (
+        (1, _create_schema),
+        (2, _migrate_players_json_to_stats),
+        (3, _migrate_player_aggregates),
+        (4, _backfill_team_ids),
+        (5, _seed_team_logos),
+        (6, _migrate_json_to_sqlite),
+        # 7 moved ignored tournaments into ignored_matches.db; superseded by
+        # the ignored_tournaments state in 11, so it no longer does anything.
+        (7, _skip_migration),
+        (8, _migrate_payload_state),
+        (9, _migrate_compress_payloads),
+        (10, _migrate_tournament_summary),
+        (11, _migrate_ignore_state),
+        (12, _migrate_listing_hash),
+        (13, _migrate_query_indexes),
+        (14, _migrate_archived_tournaments),
+        (15, _migrate_missing_stats_index),
+        (16, _migrate_incremental_vacuum),
+        (17, _migrate_settings_store),
+        (18, _migrate_events),
+        (19, _migrate_stats_retry),
+        (20, _migrate_search_index),
+        (21, _migrate_tournament_catalog),
+        (22, _migrate_week_stats),
+        (23, _migrate_players),
+        (24, _migrate_summary_trigger_guard),
+        (25, _migrate_archived_matches),
+        (26, _migrate_search_index_archives),
+        (27, _migrate_week_stats_archives),
+        (28, _migrate_players_archives),
+        (29, _migrate_search_ignored_people),
+    )
+
+def _skip_migration(conn):
+    pass
+
+def _apply_migrations(conn, migrations, label):
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    latest = migrations[-1][0]
+    if version > latest:
+        print(f"Warning: {label} schema version {version} is newer than this code ({latest}).")
+        return
+    if version == latest:
+        return
+    print(f"Upgrading {label} schema from version {version} to {latest}...")
+    for number, step in migrations:
+        if number <= version:
+            continue
+        step(conn)
+        conn.execute(f"PRAGMA user_version = {int(number)}")
+        conn.commit()
 
 def _ensure_db():
     global _db_initialized
@@ -69,86 +677,11 @@ def _ensure_db():
         if _db_initialized:
             return
         with _get_conn() as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS matches (
-                    id TEXT PRIMARY KEY,
-                    href TEXT,
-                    date TEXT,
-                    time TEXT,
-                    team1 TEXT,
-                    team2 TEXT,
-                    score1 TEXT,
-                    score2 TEXT,
-                    tournament TEXT,
-                    series TEXT,
-                    tournament_logo TEXT,
-                    eta TEXT,
-                    status TEXT,
-                    team1_logo TEXT,
-                    team2_logo TEXT,
-                    unix_timestamp INTEGER,
-                    bst_time TEXT,
-                    maps_json TEXT,
-                    players_json TEXT,
-                    last_updated INTEGER
-                )
-                """
-            )
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_tournament ON matches(tournament)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_status ON matches(status)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_unix_timestamp ON matches(unix_timestamp)")
-            conn.commit()
-        _migrate_json_to_sqlite()
-        _migrate_ignored_tournaments_to_db()
+            _apply_migrations(conn, _main_db_migrations(), "matches.db")
         _db_initialized = True
 
-_ignored_db_initialized = False
-_ignored_db_init_lock = threading.Lock()
 IGNORELIST_PATH = os.path.join(BASE_DIR, "ignorelist.json")
 
-def _ensure_ignored_db():
-    global _ignored_db_initialized
-    if _ignored_db_initialized:
-        return
-    with _ignored_db_init_lock:
-        if _ignored_db_initialized:
-            return
-        with sqlite3.connect(IGNORED_DB_PATH, timeout=30) as conn:
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS matches (
-                    id TEXT PRIMARY KEY,
-                    href TEXT,
-                    date TEXT,
-                    time TEXT,
-                    team1 TEXT,
-                    team2 TEXT,
-                    score1 TEXT,
-                    score2 TEXT,
-                    tournament TEXT,
-                    series TEXT,
-                    tournament_logo TEXT,
-                    eta TEXT,
-                    status TEXT,
-                    team1_logo TEXT,
-                    team2_logo TEXT,
-                    unix_timestamp INTEGER,
-                    bst_time TEXT,
-                    maps_json TEXT,
-                    players_json TEXT,
-                    last_updated INTEGER
-                )
-                """
-            )
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_tournament ON matches(tournament)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_status ON matches(status)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_unix_timestamp ON matches(unix_timestamp)")
-            conn.commit()
-        _ignored_db_initialized = True
-
 def _load_ignore_names():
     if not os.path.exists(IGNORELIST_PATH):
         return set()
@@ -159,92 +692,399 @@ def _load_ignore_names():
     except Exception:
         return set()
 
-def move_tournament_to_ignored(tournament_name):
+# Ignoring a tournament is one row in ignored_tournaments; its matches stay
+# where they are and every reader filters with this predicate (a lookup in
+# the small primary-key table), so ignore/unignore never rewrites matches.
+NOT_IGNORED_SQL = "tournament NOT IN (SELECT tournament FROM ignored_tournaments)"
+
+# The ignore list (name + logo, in the order tournaments were ignored) is
+# read on most requests, so it is cached until the next ignore/unignore.
+_ignore_list_cache = None
+_ignore_list_lock = threading.Lock()
+
+def _invalidate_ignore_list():
+    global _ignore_list_cache
+    with _ignore_list_lock:
+        _ignore_list_cache = None
+
+def set_tournaments_ignored(tournament_names, ignored=True, logos=None):
+    """Ignore (or un-ignore) tournaments in one transaction.
+
+    `logos` ({name: logo}) is stored with newly ignored tournaments for the
+    ignore-list UI.
+    """
+    names = sorted({str(t) for t in tournament_names or [] if t})
+    if not names:
+        return 0
+    logos = logos or {}
     _ensure_db()
-    _ensure_ignored_db()
     with _get_conn() as conn:
-        conn.execute("ATTACH DATABASE ? AS ignored_db", (IGNORED_DB_PATH,))
-        # Move matches to ignored DB
-        conn.execute("""
-            INSERT OR REPLACE INTO ignored_db.matches
-            SELECT * FROM main.matches WHERE tournament = ?
-        """, (tournament_name,))
-        # Delete from main DB
-        conn.execute("DELETE FROM main.matches WHERE tournament = ?", (tournament_name,))
-        conn.commit()
-    with _get_conn() as conn:
-        conn.execute("VACUUM")
-
-def move_tournament_from_ignored(tournament_name):
+        if ignored:
+            now = int(time.time())
+            conn.executemany(
+                """
+                INSERT INTO ignored_tournaments (tournament, ignored_at, logo) VALUES (?, ?, ?)
+                ON CONFLICT(tournament) DO UPDATE SET
+                    logo=CASE WHEN excluded.logo != '' THEN excluded.logo ELSE ignored_tournaments.logo END
+                """,
+                [(name, now, logos.get(name) or "") for name in names],
+            )
+        else:
+            conn.executemany("DELETE FROM ignored_tournaments WHERE tournament = ?", [(name,) for name in names])
+    with _get_conn() as conn, _with_archives(conn) as tables:
+        _rebuild_search_people(conn, tables, names)
+    _invalidate_ignore_list()
+    global _cached_matches
+    with _cache_lock:
+        _cached_matches = None
+    _invalidate_standings(names)
+    return len(names)
+
+def set_ignored_tournament_logos(logos):
+    """Fill in logos of ignored tournaments ({name: logo}); matches are untouched."""
+    updates = [(logo, name) for name, logo in (logos or {}).items() if name and logo]
+    if not updates:
+        return 0
     _ensure_db()
-    _ensure_ignored_db()
     with _get_conn() as conn:
-        conn.execute("ATTACH DATABASE ? AS ignored_db", (IGNORED_DB_PATH,))
-        # Move matches to main DB
-        conn.execute("""
-            INSERT OR REPLACE INTO main.matches
-            SELECT * FROM ignored_db.matches WHERE tournament = ?
-        """, (tournament_name,))
-        # Delete from ignored DB
-        conn.execute("DELETE FROM ignored_db.matches WHERE tournament = ?", (tournament_name,))
-        conn.commit()
-    with sqlite3.connect(IGNORED_DB_PATH, timeout=30) as conn:
-        conn.execute("VACUUM")
+        conn.executemany("UPDATE ignored_tournaments SET logo = ? WHERE tournament = ?", updates)
+    _invalidate_ignore_list()
+    return len(updates)
 
-def _migrate_ignored_tournaments_to_db():
-    ignore_names = _load_ignore_names()
-    if not ignore_names:
-        return
-    _ensure_ignored_db()
-    migrated = False
-    with _get_conn() as conn:
-        placeholders = ",".join("?" for _ in ignore_names)
-        cur = conn.execute(f"SELECT COUNT(*) AS count FROM matches WHERE tournament IN ({placeholders})", list(ignore_names))
-        row = cur.fetchone()
-        if row and row["count"] > 0:
-            print(f"Migrating {row['count']} matches of ignored tournaments to ignored DB...")
-            conn.execute("ATTACH DATABASE ? AS ignored_db", (IGNORED_DB_PATH,))
-            conn.execute(f"""
-                INSERT OR REPLACE INTO ignored_db.matches
-                SELECT * FROM main.matches WHERE tournament IN ({placeholders})
-            """, list(ignore_names))
-            conn.execute(f"DELETE FROM main.matches WHERE tournament IN ({placeholders})", list(ignore_names))
-            conn.commit()
-            migrated = True
-    if migrated:
+def get_ignore_list():
+    """Ignored tournaments as [{"name", "logo"}], oldest first."""
+    global _ignore_list_cache
+    with _ignore_list_lock:
+        if _ignore_list_cache is None:
+            _ensure_db()
+            with _get_conn() as conn:
+                _ignore_list_cache = [
+                    {"name": row[0], "logo": row[1] or ""}
+                    for row in conn.execute("SELECT tournament, logo FROM ignored_tournaments ORDER BY rowid")
+                ]
+        return [dict(entry) for entry in _ignore_list_cache]
+
+def get_ignored_tournament_names():
+    return {entry["name"] for entry in get_ignore_list()}
+
+# UI settings, one row per top-level key with a JSON value, so a change to
+# one key is a single-row write and never overwrites keys saved by another
+# tab. settings.json is only read once, by migration 17.
+SETTINGS_JSON_PATH = os.path.join(BASE_DIR, "settings.json")
+DEFAULT_SETTINGS = {"unchecked_tournaments": []}
+_settings_cache = None
+_settings_lock = threading.Lock()
+
+def get_settings():
+    """All settings as a dict (served from memory after the first read)."""
+    global _settings_cache
+    with _settings_lock:
+        if _settings_cache is None:
+            _ensure_db()
+            with _get_conn() as conn:
+                rows = conn.execute("SELECT key, value FROM settings").fetchall()
+            settings = copy.deepcopy(DEFAULT_SETTINGS)
+            settings.update((row[0], _json_loads(row[1], None)) for row in rows)
+            _settings_cache = settings
+        return copy.deepcopy(_settings_cache)
+
+def _write_settings(conn, values):
+    now = int(time.time())
+    for key, value in values.items():
+        if value is None:
+            conn.execute("DELETE FROM settings WHERE key = ?", (str(key),))
+        else:
+            conn.execute(
+                """
+                INSERT INTO settings (key, value, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET value=excluded.value, updated_at=excluded.updated_at
+                """,
+                (str(key), json.dumps(value, ensure_ascii=False), now),
+            )
+
+def update_settings(changes):
+    """Set individual keys in one transaction (a None value deletes the key).
+
+    Keys not in `changes` are left alone. Returns the updated settings.
+    """
+    if not isinstance(changes, dict):
+        raise ValueError("settings changes must be an object")
+    global _settings_cache
+    _ensure_db()
+    with _settings_lock:
         with _get_conn() as conn:
-            conn.execute("VACUUM")
+            _write_settings(conn, changes)
+        _settings_cache = None
+    return get_settings()
+
+def replace_settings(settings):
+    """Replace every key with `settings` in one transaction."""
+    if not isinstance(settings, dict):
+        raise ValueError("settings must be an object")
+    global _settings_cache
+    _ensure_db()
+    with _settings_lock:
+        with _get_conn() as conn:
+            conn.execute("DELETE FROM settings")
+            _write_settings(conn, settings)
+        _settings_cache = None
+    return get_settings()
+
+def _migrate_settings_store(conn):
+    """Create settings, give ignored_tournaments a logo, import the JSON files.
+
+    settings.json and ignorelist.json are left on disk untouched.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            updated_at INTEGER
+        )
+        """
+    )
+    _ensure_columns(conn, "ignored_tournaments", (("logo", "TEXT NOT NULL DEFAULT ''"),))
+    if os.path.exists(SETTINGS_JSON_PATH):
+        try:
+            with open(SETTINGS_JSON_PATH, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except Exception as e:
+            print(f"Could not import {os.path.basename(SETTINGS_JSON_PATH)}: {e}")
+            legacy = {}
+        if isinstance(legacy, dict):
+            _write_settings(conn, {k: v for k, v in legacy.items() if v is not None})
+    if os.path.exists(IGNORELIST_PATH):
+        try:
+            with open(IGNORELIST_PATH, "r", encoding="utf-8") as f:
+                entries = [t for t in json.load(f) if isinstance(t, dict) and t.get("name")]
+        except Exception:
+            entries = []
+        now = int(time.time())
+        conn.executemany(
+            """
+            INSERT INTO ignored_tournaments (tournament, ignored_at, logo) VALUES (?, ?, ?)
+            ON CONFLICT(tournament) DO UPDATE SET logo=excluded.logo
+            """,
+            [(t["name"], now, t.get("logo") or "") for t in entries],
+        )
+
+def _migrate_ignore_state(conn):
+    """Create ignored_tournaments and fold ignored_matches.db back into matches.db.
+
+    Seeds the state from ignorelist.json. Every tournament found in the old
+    ignored database was ignored by definition. Its rows are copied with
+    the columns `matches` had at version 11 (a copy already in matches.db
+    wins), then get team ids and normalized stats like any other write. The
+    old file is left on disk untouched.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ignored_tournaments (
+            tournament TEXT PRIMARY KEY,
+            ignored_at INTEGER
+        )
+        """
+    )
+    names = set(_load_ignore_names())
+    rows = []
+    if os.path.exists(IGNORED_DB_PATH):
+        source = sqlite3.connect(IGNORED_DB_PATH, timeout=30)
+        source.row_factory = sqlite3.Row
+        try:
+            if source.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'matches'").fetchone():
+                for stored in source.execute("SELECT * FROM matches"):
+                    stored = dict(stored)
+                    maps = _decode_payload(stored.get("maps_json"), [])
+                    players = _decode_payload(stored.get("players_json"), {})
+                    row = {name: stored.get(name) for name in _MATCH_COLUMNS_V11}
+                    row["maps_json"], row["players_json"] = _encode_payload(maps), _encode_payload(players)
+                    row["stats_state"], row["details_state"], row["payload_format_version"] = _payload_state(
+                        maps, players
+                    )
+                    rows.append(row)
+        finally:
+            source.close()
+    if rows:
+        print(f"Importing {len(rows)} matches from {os.path.basename(IGNORED_DB_PATH)} (no longer used after this)...")
+        names.update(row["tournament"] for row in rows if row["tournament"])
+        _insert_match_rows(conn, _MATCH_COLUMNS_V11, rows)
+        _backfill_team_ids(conn)
+        _refresh_match_stats(conn, rebuild_ids=[row["id"] for row in rows if _has_payload(row)])
+    now = int(time.time())
+    conn.executemany(
+        "INSERT OR IGNORE INTO ignored_tournaments (tournament, ignored_at) VALUES (?, ?)",
+        [(name, now) for name in sorted(names)],
+    )
+
+def _migrate_listing_hash(conn):
+    """Add matches.listing_hash.
+
+    Existing rows start without a hash (their stored team names and logo
+    paths no longer match the raw listing), so each is rewritten once by
+    the next sync and skipped while unchanged after that.
+    """
+    _ensure_columns(conn, "matches", LISTING_HASH_COLUMNS)
+
+def _migrate_query_indexes(conn):
+    """Replace single-column match indexes with ones shaped like the queries.
+
+    Status is always compared through LOWER(status), so the plain status
+    indexes were never usable; plain tournament lookups are served by the
+    tournament prefix of the composite indexes.
+    """
+    conn.execute("DROP INDEX IF EXISTS idx_matches_status")
+    conn.execute("DROP INDEX IF EXISTS idx_matches_stats_state")
+    conn.execute("DROP INDEX IF EXISTS idx_matches_tournament")
+    # Per-tournament reads by status (standings), in time order.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_matches_tournament_status "
+        "ON matches(tournament, LOWER(status), unix_timestamp)"
+    )
+    # Missing-stats scan: LOWER(status) = 'completed' AND stats_state < N,
+    # and LOWER(status) = 'live'.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_matches_status_key ON matches(LOWER(status), stats_state)"
+    )
+    # Only rows that still need a header repair, oldest first.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_matches_needs_metadata "
+        f"ON matches(last_updated) WHERE {NEEDS_METADATA_SQL}"
+    )
+
+def _migrate_archived_tournaments(conn):
+    """Create archived_tournaments (which archive file holds a tournament)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS archived_tournaments (
+            tournament TEXT PRIMARY KEY,
+            year INTEGER NOT NULL,
+            match_count INTEGER NOT NULL,
+            archived_at INTEGER
+        )
+        """
+    )
+
+def _migrate_archived_matches(conn):
+    """Create archived_matches (which archive file holds a match id).
+
+    Writers check it before every upsert, so it replaces opening each
+    archive file per write. Ids already archived are read from the archives
+    through their own read-only connections: ATTACH cannot run inside the
+    migration's transaction.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS archived_matches (
+            id TEXT PRIMARY KEY,
+            year INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    for year, path in _archive_paths().items():
+        archive = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30)
+        try:
+            ids = [row[0] for row in archive.execute("SELECT id FROM matches")]
+        finally:
+            archive.close()
+        conn.executemany(
+            "INSERT OR REPLACE INTO archived_matches (id, year) VALUES (?, ?)", [(mid, year) for mid in ids]
+        )
+
+def _migrate_missing_stats_index(conn):
+    """Serve the missing-stats scan from a partial index.
+
+    A full (LOWER(status), stats_state) index also matched team history and
+    standings filters and could be picked over their narrower team and
+    tournament indexes; a partial index is only used by the query it fits.
+    """
+    conn.execute("DROP INDEX IF EXISTS idx_matches_status_key")
+    conn.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_matches_missing_stats ON matches(id) WHERE {MISSING_STATS_SQL}"
+    )
+
+def _migrate_stats_retry(conn):
+    """Add the stats retry schedule columns and index it by due time.
 
+    idx_matches_stats_due replaces idx_matches_missing_stats: the same
+    partial predicate, keyed on next_attempt_at so the sweep reads only
+    due rows.
+    """
+    _ensure_columns(conn, "matches", STATS_RETRY_COLUMNS)
+    conn.execute("DROP INDEX IF EXISTS idx_matches_missing_stats")
+    conn.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_matches_stats_due ON matches(next_attempt_at) WHERE {MISSING_STATS_SQL}"
+    )
+
+def _migrate_incremental_vacuum(conn):
+    """Switch matches.db to auto_vacuum=INCREMENTAL.
+
+    The mode of an existing file only changes with a full VACUUM, so this
+    step rebuilds the file once, blocking the first start after the
+    upgrade; afterwards run_db_maintenance reclaims free pages in small
+    incremental_vacuum steps instead. VACUUM cannot run inside a
+    transaction, so unlike every other step this one commits first.
+    """
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        return
+    conn.commit()
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
 
+def _migrate_json_to_sqlite(conn):
+    """Import the legacy matches.json into an empty database (one-time).
 
-def _migrate_json_to_sqlite():
+    The rows are written with the columns `matches` had at version 6. The
+    table was empty while steps 2-5 ran, so their team, logo and stats
+    backfills run again over the imported rows.
+    """
     if not os.path.exists(JSON_PATH):
         return
-    with _get_conn() as conn:
-        cur = conn.execute("SELECT COUNT(*) AS count FROM matches")
-        row = cur.fetchone()
-        if row and row["count"]:
-            return
-        try:
-            with open(JSON_PATH, "r", encoding="utf-8") as f:
-                raw = json.load(f)
-        except Exception as e:
-            print(f"Error migrating JSON to SQLite: {e}")
-            return
-        if not isinstance(raw, dict) or not raw:
-            return
-        rows = []
-        for mid, m in raw.items():
-            if not isinstance(m, dict):
-                continue
-            rows.append(_match_to_row_dict(m, fallback_id=mid))
-        if rows:
-            _bulk_upsert_rows(conn, rows)
-            print(f"Migrated {len(rows)} matches from JSON to SQLite.")
+    cur = conn.execute("SELECT COUNT(*) AS count FROM matches")
+    row = cur.fetchone()
+    if row and row["count"]:
+        return
+    try:
+        with open(JSON_PATH, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+    except Exception as e:
+        print(f"Error migrating JSON to SQLite: {e}")
+        return
+    if not isinstance(raw, dict) or not raw:
+        return
+    now = int(datetime.now().timestamp())
+    rows = []
+    for mid, m in raw.items():
+        if not isinstance(m, dict) or not (m.get("id") or mid):
+            continue
+        row = {name: m.get(name, "") for name in MATCH_COLUMNS}
+        row.update(
+            id=str(m.get("id") or mid),
+            unix_timestamp=int(m.get("unix_timestamp") or 0),
+            maps_json=_json_dumps(m.get("maps", [])),
+            players_json=_json_dumps(m.get("players", {})),
+            last_updated=int(m.get("last_updated") or now),
+            team1_id=None,
+            team2_id=None,
+        )
+        rows.append(row)
+    if rows:
+        _insert_match_rows(conn, _MATCH_COLUMNS_V6, rows)
+        _backfill_team_ids(conn)
+        _seed_team_logos(conn)
+        _migrate_players_json_to_stats(conn)
+        print(f"Migrated {len(rows)} matches from JSON to SQLite.")
 
 def _json_dumps(value):
     return json.dumps(value if value is not None else {}, ensure_ascii=False)
 
+def _has_payload(row):
+    """Whether a row dict carries a maps/players payload worth storing."""
+    return (
+        (row.get("maps_json") or "[]") != "[]"
+        or (row.get("players_json") or "{}") != "{}"
+    )
+
 def _json_loads(value, default):
     if not value:
         return default
@@ -253,6 +1093,88 @@ def _json_loads(value, default):
     except Exception:
         return default
 
+# maps_json / players_json are stored compressed: a one-byte codec marker
+# followed by a zlib stream primed with _PAYLOAD_ZDICT, as a BLOB. Empty
+# payloads stay as the plain '[]' / '{}' text the SQL merge rules compare
+# against, and rows written before compression are plain JSON text, so
+# _decode_payload reads all three. The dictionary is part of the format:
+# never edit it — add a new marker and dictionary instead.
+PAYLOAD_CODEC_ZLIB_V1 = 1
+_PAYLOAD_ZDICT = (
+    '{"name": "Ascent", "score1": "13", "score2": "11", "winner": 0}, '
+    '{"name": "Bind", "score1": "7", "score2": "13", "winner": 1}, '
+    '{"name": "Haven"}, {"name": "Split"}, {"name": "Lotus"}, {"name": "Sunset"}, '
+    '{"name": "Icebox"}, {"name": "Breeze"}, {"name": "Pearl"}, {"name": "Fracture"}, '
+    '{"name": "Abyss"}, {"name": "Corrode"}, '
+    '"agents": [{"name": "jett", "icon": "/static/images_cache/"}, {"name": "raze"}, '
+    '{"name": "omen"}, {"name": "sova"}, {"name": "killjoy"}, {"name": "cypher"}, '
+    '{"name": "viper"}, {"name": "sage"}, {"name": "skye"}, {"name": "fade"}, '
+    '{"name": "kayo"}, {"name": "breach"}, {"name": "gekko"}, {"name": "astra"}, '
+    '{"name": "harbor"}, {"name": "clove"}, {"name": "neon"}, {"name": "yoru"}, '
+    '{"name": "tejo"}, {"name": "waylay"}, {"name": "iso"}, {"name": "deadlock"}, '
+    '{"name": "vyse"}, {"name": "chamber"}, {"name": "reyna"}, {"name": "phoenix"}, '
+    '{"all": {"team1": [{"name": "", "href": "/player/", "photo": "/static/images_cache/", '
+    '"agents": [{"name": "", "icon": "/static/images_cache/"}], "rating": "1.", "acs": "2", '
+    '"k": "1", "d": "1", "a": "", "kd_diff": "+", "kast": "7%", "adr": "1", "hs": "2%", '
+    '"fk": "", "fd": "", "fk_diff": "-"}], "team2": [{"name": "", "href": "/player/", '
+    '"photo": "/static/images_cache/", "agents": [{"name": "", "icon": "/static/images_cache/'
+).encode("utf-8")
+_EMPTY_PAYLOADS = ("[]", "{}", "null")
+
+def _encode_payload(value):
+    """Serialize a maps/players payload for storage (see PAYLOAD_CODEC_ZLIB_V1)."""
+    text = _json_dumps(value)
+    if text in _EMPTY_PAYLOADS:
+        return text
+    compressor = zlib.compressobj(6, zdict=_PAYLOAD_ZDICT)
+    data = compressor.compress(text.encode("utf-8")) + compressor.flush()
+    return bytes([PAYLOAD_CODEC_ZLIB_V1]) + data
+
+def _decode_payload(value, default):
+    """Read a stored maps/players payload written by any codec version."""
+    if not value:
+        return default
+    if isinstance(value, str):
+        return _json_loads(value, default)
+    try:
+        if value[0] == PAYLOAD_CODEC_ZLIB_V1:
+            decompressor = zlib.decompressobj(zdict=_PAYLOAD_ZDICT)
+            value = decompressor.decompress(value[1:]) + decompressor.flush()
+        return json.loads(value.decode("utf-8"))
+    except Exception as e:
+        print(f"Error decoding stored payload: {e}")
+        return default
+
+def _migrate_compress_payloads(conn):
+    """Re-encode plain-text maps/players payloads with the current codec."""
+    ids = [
+        row[0]
+        for row in conn.execute(
+            "SELECT id FROM matches WHERE "
+            "(typeof(maps_json) = 'text' AND maps_json NOT IN ('', '[]', '{}', 'null')) OR "
+            "(typeof(players_json) = 'text' AND players_json NOT IN ('', '[]', '{}', 'null'))"
+        )
+    ]
+    if ids:
+        print(f"Compressing stored payloads of {len(ids)} matches...")
+    for start in range(0, len(ids), 200):
+        chunk = ids[start:start + 200]
+        rows = conn.execute(
+            f"SELECT id, maps_json, players_json FROM matches WHERE id IN ({','.join('?' for _ in chunk)})",
+            chunk,
+        ).fetchall()
+        conn.executemany(
+            "UPDATE matches SET maps_json = ?, players_json = ? WHERE id = ?",
+            [
+                (
+                    _encode_payload(_decode_payload(row[1], [])),
+                    _encode_payload(_decode_payload(row[2], {})),
+                    row[0],
+                )
+                for row in rows
+            ],
+        )
+
 def has_complete_match_stats(match):
     """Return whether a match has map results and actual player stat rows.
 
@@ -294,6 +1216,82 @@ def has_complete_match_data(match):
                     return False
     return True
 
+# Payload completeness, computed once per write by _payload_state and stored
+# on the row so list views and the missing-stats scan never decode blobs.
+# The "live is never complete" rule depends on status and is applied by the
+# queries/callers, not stored here.
+STATS_NONE = 0       # no maps
+STATS_PARTIAL = 1    # maps, but player tables missing for "all" or some map
+STATS_COMPLETE = 2   # has_complete_match_stats() ignoring status
+# payload_format_version: 0 = no player payload, 1 = legacy flat
+# {team1, team2} tables, 2 = per-map tables predating kd_diff/fk_diff,
+# 3 = current per-map tables.
+PAYLOAD_FORMAT_VERSION = 3
+
+def _payload_state(maps, players):
+    """Return (stats_state, details_state, payload_format_version) for a payload."""
+    maps = maps if isinstance(maps, list) else []
+    players = players if isinstance(players, dict) else {}
+    if not players:
+        version = 0
+    elif ("team1" in players or "team2" in players) and "all" not in players and "0" not in players:
+        version = 1
+    elif any(
+        "kd_diff" not in p
+        for map_data in players.values() if isinstance(map_data, dict)
+        for team in ("team1", "team2")
+        for p in map_data.get(team, [])
+    ):
+        version = 2
+    else:
+        version = PAYLOAD_FORMAT_VERSION
+    payload = {"maps": maps, "players": players}
+    if not maps:
+        stats_state = STATS_NONE
+    elif has_complete_match_stats(payload):
+        stats_state = STATS_COMPLETE
+    else:
+        stats_state = STATS_PARTIAL
+    details_state = 1 if stats_state == STATS_COMPLETE and has_complete_match_data(payload) else 0
+    return stats_state, details_state, version
+
+def match_has_stats(match):
+    """has_complete_match_stats() from the stored state columns (no blob decode)."""
+    return (
+        int(match.get("stats_state") or 0) == STATS_COMPLETE
+        and str(match.get("status") or "").casefold() != "live"
+    )
+
+def match_needs_detail_refresh(match, include_photos=True):
+    """Whether a stored match should be re-fetched from its VLR detail page.
+
+    True when stats are incomplete (or live), when the player payload is in
+    an older format, or (with include_photos) when player photos are missing.
+    """
+    if not match_has_stats(match):
+        return True
+    if int(match.get("payload_format_version") or 0) < PAYLOAD_FORMAT_VERSION:
+        return True
+    return include_photos and not int(match.get("details_state") or 0)
+
+def _migrate_payload_state(conn):
+    """Add the payload state columns/indexes and fill them from stored blobs."""
+    _ensure_columns(conn, "matches", PAYLOAD_STATE_COLUMNS)
+    # Covers the sidebar overview (GROUP BY tournament) without touching rows.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_matches_overview "
+        "ON matches(tournament, status, stats_state, unix_timestamp, tournament_logo)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_stats_state ON matches(stats_state, status)")
+    updates = []
+    for row in conn.execute("SELECT id, maps_json, players_json FROM matches"):
+        state = _payload_state(_decode_payload(row[1], []), _decode_payload(row[2], {}))
+        updates.append(state + (row[0],))
+    conn.executemany(
+        "UPDATE matches SET stats_state = ?, details_state = ?, payload_format_version = ? WHERE id = ?",
+        updates,
+    )
+
 def _team_name_key(name):
     """Normalize a team name for matching logos across different matches."""
     value = " ".join(str(name or "").split()).strip().casefold()
@@ -315,66 +1313,338 @@ def _team_name_preference(name):
     value = " ".join(str(name or "").split()).strip()
     return (len(value), value.count(" "), value.casefold())
 
-def _canonical_team_names_by_logo(conn, rows=()):
-    """Build the preferred team name for each real VLR logo identity."""
-    canonical = {}
+def _team_id_from_href(href):
+    """Extract the VLR team id from a /team/<id>/<slug> link."""
+    match = re.search(r"/team/(\d+)", str(href or ""))
+    return match.group(1) if match else ""
 
-    def add(name, logo):
-        logo_key = _team_logo_key(logo)
-        name = " ".join(str(name or "").split()).strip()
-        if not logo_key or not _team_name_key(name):
-            return
-        current = canonical.get(logo_key)
-        if current is None or _team_name_preference(name) > _team_name_preference(current):
-            canonical[logo_key] = name
+def _merge_team(conn, old_id, new_id):
+    """Fold a provisional team into its real VLR id (matches, aliases, name)."""
+    old = conn.execute("SELECT name, logo, logo_key FROM teams WHERE id = ?", (old_id,)).fetchone()
+    if old is None or old_id == new_id:
+        return
+    conn.execute(
+        "INSERT OR IGNORE INTO teams (id, name, logo, logo_key, updated_at) VALUES (?, ?, ?, ?, ?)",
+        (new_id, old["name"], old["logo"], old["logo_key"], int(time.time())),
+    )
+    new = conn.execute("SELECT name FROM teams WHERE id = ?", (new_id,)).fetchone()
+    if _team_name_preference(old["name"]) > _team_name_preference(new["name"]):
+        conn.execute("UPDATE teams SET name = ? WHERE id = ?", (old["name"], new_id))
+    conn.execute("UPDATE matches SET team1_id = ? WHERE team1_id = ?", (new_id, old_id))
+    conn.execute("UPDATE matches SET team2_id = ? WHERE team2_id = ?", (new_id, old_id))
+    conn.execute("UPDATE team_aliases SET team_id = ? WHERE team_id = ?", (new_id, old_id))
+    conn.execute("DELETE FROM teams WHERE id = ?", (old_id,))
+
+def _resolve_team(conn, name, logo="", team_id=""):
+    """Return the canonical team id for one side of a match ("" if unknown).
+
+    Lookup order: explicit VLR id, then the team that owns this logo, then
+    a known alias of the name. A real logo with no known team starts a
+    provisional "logo:<file>" team. Learns the name as an alias and keeps
+    the longest (least abbreviated) alias as the team's display name.
+    """
+    name = " ".join(str(name or "").split())
+    name_key = _team_name_key(name)
+    if not name_key:
+        return ""
+    logo_key = _team_logo_key(logo)
+    tid = str(team_id or "")
+    if not tid and logo_key:
+        row = conn.execute(
+            "SELECT id FROM teams WHERE logo_key = ? ORDER BY id LIKE 'logo:%' LIMIT 1",
+            (logo_key,),
+        ).fetchone()
+        tid = row["id"] if row else ""
+    if not tid:
+        row = conn.execute("SELECT team_id FROM team_aliases WHERE name_key = ?", (name_key,)).fetchone()
+        tid = row["team_id"] if row else ""
+    if not tid and logo_key:
+        tid = f"logo:{logo_key}"
+    if not tid:
+        return ""
+    if not tid.startswith("logo:"):
+        if logo_key:
+            _merge_team(conn, f"logo:{logo_key}", tid)
+        alias = conn.execute("SELECT team_id FROM team_aliases WHERE name_key = ?", (name_key,)).fetchone()
+        if alias and alias["team_id"].startswith("logo:"):
+            _merge_team(conn, alias["team_id"], tid)
+
+    current = conn.execute("SELECT name, logo_key FROM teams WHERE id = ?", (tid,)).fetchone()
+    now = int(time.time())
+    if current is None:
+        conn.execute(
+            "INSERT INTO teams (id, name, logo, logo_key, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (tid, name, logo if logo_key else "", logo_key, now),
+        )
+    else:
+        if _team_name_preference(name) > _team_name_preference(current["name"]):
+            conn.execute("UPDATE teams SET name = ?, updated_at = ? WHERE id = ?", (name, now, tid))
+        if logo_key and not current["logo_key"]:
+            conn.execute(
+                "UPDATE teams SET logo = ?, logo_key = ?, updated_at = ? WHERE id = ?",
+                (logo, logo_key, now, tid),
+            )
+    conn.execute(
+        "INSERT INTO team_aliases (name_key, team_id, name) VALUES (?, ?, ?) ON CONFLICT(name_key) DO NOTHING",
+        (name_key, tid, name),
+    )
+    return tid
 
-    for row in conn.execute("SELECT team1, team1_logo, team2, team2_logo FROM matches"):
-        add(row["team1"], row["team1_logo"])
-        add(row["team2"], row["team2_logo"])
-    for row in rows:
-        add(row.get("team1"), row.get("team1_logo"))
-        add(row.get("team2"), row.get("team2_logo"))
-    return canonical
+def _resolve_teams(conn, rows):
+    """Attach team ids to incoming rows and rename them to canonical names.
 
-def _canonicalize_rows_by_logo(conn, rows):
-    """Replace imported abbreviations with the preferred name for their logo."""
-    canonical = _canonical_team_names_by_logo(conn, rows)
+    Returns {team_id: canonical_name} for every team touched, so the caller
+    can rename older rows of a team whose preferred name just changed.
+    """
     for row in rows:
-        for team_key, logo_key in (("team1", "team1_logo"), ("team2", "team2_logo")):
-            preferred = canonical.get(_team_logo_key(row.get(logo_key)))
-            if preferred:
-                row[team_key] = preferred
-
-def backfill_team_name_aliases():
-    """Repair existing rows where one logo was stored under multiple names."""
+        for side in ("team1", "team2"):
+            row[f"{side}_id"] = _resolve_team(
+                conn, row.get(side), row.get(f"{side}_logo"), row.get(f"{side}_id")
+            ) or None
+    team_ids = {row[f"{side}_id"] for row in rows for side in ("team1", "team2") if row[f"{side}_id"]}
+    names = {}
+    for tid in team_ids:
+        found = conn.execute("SELECT name FROM teams WHERE id = ?", (tid,)).fetchone()
+        if found:
+            names[tid] = found["name"]
+    for row in rows:
+        for side in ("team1", "team2"):
+            if row[f"{side}_id"] in names:
+                row[side] = names[row[f"{side}_id"]]
+    return names
+
+def _apply_team_names(conn, names):
+    """Rename stored matches whose team's canonical name changed; return their ids."""
+    renamed = set()
+    for tid, name in names.items():
+        for side in ("team1", "team2"):
+            ids = [
+                row["id"]
+                for row in conn.execute(
+                    f"SELECT id FROM matches WHERE {side}_id = ? AND {side} != ?", (tid, name)
+                )
+            ]
+            if ids:
+                conn.execute(f"UPDATE matches SET {side} = ? WHERE {side}_id = ?", (name, tid))
+                renamed.update(ids)
+    return renamed
+
+def backfill_team_name_aliases():
+    """Assign team ids to rows stored before the teams table existed.
+
+    One pass over the rows without ids: logo-bearing sides first so their
+    names become aliases, then the rest. Every stored name is then set to
+    its team's canonical name. After this, new writes resolve teams through
+    the teams/team_aliases indexes and no full-table scan is needed.
+    """
     _ensure_db()
-    updates = []
     with _get_conn() as conn:
-        rows = conn.execute(
-            "SELECT id, team1, team1_logo, team2, team2_logo FROM matches"
-        ).fetchall()
-        canonical = _canonical_team_names_by_logo(conn)
-        for row in rows:
-            team1 = canonical.get(_team_logo_key(row["team1_logo"]), row["team1"] or "")
-            team2 = canonical.get(_team_logo_key(row["team2_logo"]), row["team2"] or "")
-            if team1 != (row["team1"] or "") or team2 != (row["team2"] or ""):
-                updates.append((team1, team2, row["id"]))
-        if updates:
-            conn.executemany(
-                "UPDATE matches SET team1 = ?, team2 = ? WHERE id = ?",
-                updates,
-            )
-            conn.commit()
-    if updates:
+        renamed = _backfill_team_ids(conn)
+        conn.commit()
+    if renamed:
         global _cached_matches
         with _cache_lock:
             _cached_matches = None
-    return len(updates)
+        _invalidate_standings()
+    return len(renamed)
+
+def _backfill_team_ids(conn):
+    rows = conn.execute(
+        "SELECT id, team1, team1_logo, team1_id, team2, team2_logo, team2_id FROM matches "
+        "WHERE team1_id IS NULL OR team2_id IS NULL"
+    ).fetchall()
+    if not rows:
+        return set()
+    sides = []
+    for row in rows:
+        for side in ("team1", "team2"):
+            if not row[f"{side}_id"]:
+                sides.append((row["id"], side, row[side], row[f"{side}_logo"]))
+    sides.sort(key=lambda item: not _team_logo_key(item[3]))
+    updates = {"team1": [], "team2": []}
+    for mid, side, name, logo in sides:
+        tid = _resolve_team(conn, name, logo)
+        if tid:
+            updates[side].append((tid, mid))
+    for side, values in updates.items():
+        conn.executemany(f"UPDATE matches SET {side}_id = ? WHERE id = ?", values)
+    names = {row["id"]: row["name"] for row in conn.execute("SELECT id, name FROM teams")}
+    renamed = _apply_team_names(conn, names)
+    if renamed:
+        _refresh_match_stats(conn, touch_ids=renamed)
+    return renamed
+
+def _event_id_from_href(href):
+    """Extract the VLR event id from an /event/<id>/<slug> link (None if absent)."""
+    match = re.search(r"/event/(?:[a-z]+/)?(\d+)", str(href or ""))
+    return int(match.group(1)) if match else None
+
+def _event_id(value):
+    try:
+        return int(value) or None
+    except (TypeError, ValueError):
+        return None
+
+def _event_name_key(name):
+    return " ".join(str(name or "").split()).casefold()
+
+def _resolve_event(conn, name, event_id=None, href="", logo=""):
+    """Return the event id for a tournament name (None if unknown).
+
+    An explicit VLR id wins; otherwise the name is looked up among the known
+    aliases. The first name stored for an event stays its display name, so
+    rows already in the sidebar are never renamed by a differently spelled
+    listing; every other spelling is learned as an alias.
+    """
+    name = " ".join(str(name or "").split())
+    key = _event_name_key(name)
+    event_id = _event_id(event_id)
+    if not event_id and key:
+        row = conn.execute("SELECT event_id FROM event_aliases WHERE name_key = ?", (key,)).fetchone()
+        event_id = row["event_id"] if row else None
+    if not event_id:
+        return None
+    current = conn.execute("SELECT href, logo FROM events WHERE event_id = ?", (event_id,)).fetchone()
+    now = int(time.time())
+    if current is None:
+        conn.execute(
+            "INSERT INTO events (event_id, name, href, logo, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (event_id, name or f"Event {event_id}", href or "", logo or "", now),
+        )
+    elif (href and not current["href"]) or (logo and not current["logo"]):
+        conn.execute(
+            "UPDATE events SET href = CASE WHEN href = '' THEN ? ELSE href END, "
+            "logo = CASE WHEN logo = '' THEN ? ELSE logo END, updated_at = ? WHERE event_id = ?",
+            (href or "", logo or "", now, event_id),
+        )
+    if key:
+        conn.execute(
+            "INSERT INTO event_aliases (name_key, event_id, name) VALUES (?, ?, ?) ON CONFLICT(name_key) DO NOTHING",
+            (key, event_id, name),
+        )
+    return event_id
+
+def _resolve_events(conn, rows):
+    """Attach event ids to incoming rows and store them under the event's name.
+
+    A row without an id keeps the one already stored for its match, so a
+    listing that spells the event differently no longer moves the match to
+    another tournament. Returns {(scraped name, event_id)} for _link_event_rows.
+    """
+    learned = set()
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'events'").fetchone():
+        return learned  # legacy imports before migration 18, which links them
+    names = {}
+    for row in rows:
+        event_id = _event_id(row.get("event_id"))
+        if not event_id and row.get("id"):
+            stored = conn.execute("SELECT event_id FROM matches WHERE id = ?", (row["id"],)).fetchone()
+            event_id = stored["event_id"] if stored else None
+        event_id = _resolve_event(conn, row.get("tournament"), event_id)
+        row["event_id"] = event_id
+        if not event_id:
+            continue
+        if row.get("tournament"):
+            learned.add((row["tournament"], event_id))
+        if event_id not in names:
+            names[event_id] = conn.execute("SELECT name FROM events WHERE event_id = ?", (event_id,)).fetchone()["name"]
+        row["tournament"] = names[event_id]
+    return learned
+
+def _link_event_rows(conn, pairs):
+    """Give rows stored under an event's other spelling its id and name.
+
+    `pairs` is {(tournament name, event_id)}. A renamed tournament that was
+    ignored stays ignored under the event's name. Returns the renamed
+    tournament names and match ids (for standings and stat rows).
+    """
+    renamed = set()
+    renamed_ids = []
+    for name, event_id in pairs:
+        event = conn.execute("SELECT name FROM events WHERE event_id = ?", (event_id,)).fetchone()
+        if event is None:
+            continue
+        ids = [
+            row["id"]
+            for row in conn.execute("SELECT id FROM matches WHERE tournament = ? AND event_id IS NULL", (name,))
+        ]
+        if not ids:
+            continue
+        if name != event["name"]:
+            renamed.update((name, event["name"]))
+            renamed_ids.extend(ids)
+            # Before the rename, so the search triggers already see the
+            # new name as ignored.
+            conn.execute(
+                "INSERT OR IGNORE INTO ignored_tournaments (tournament, ignored_at, logo) "
+                "SELECT ?, ignored_at, logo FROM ignored_tournaments WHERE tournament = ?",
+                (event["name"], name),
+            )
+        conn.execute(
+            "UPDATE matches SET event_id = ?, tournament = ? WHERE tournament = ? AND event_id IS NULL",
+            (event_id, event["name"], name),
+        )
+    if renamed:
+        _invalidate_ignore_list()
+    return renamed, renamed_ids
+
+def _migrate_events(conn):
+    """Create events/event_aliases and matches.event_id.
+
+    Tournaments whose stored name equals an event in the cached /events list
+    are linked here; the rest are linked by backfill_event_ids() or by the
+    next add/detail fetch that carries an event id.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS events (
+            event_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            href TEXT NOT NULL DEFAULT '',
+            logo TEXT NOT NULL DEFAULT '',
+            updated_at INTEGER
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS event_aliases (
+            name_key TEXT PRIMARY KEY,
+            event_id INTEGER NOT NULL,
+            name TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_events_name ON events(name)")
+    _ensure_columns(conn, "matches", EVENT_ID_COLUMNS)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_event_id ON matches(event_id)")
+    # Tournaments still waiting for an event id (backfill_event_ids).
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_matches_missing_event ON matches(tournament) WHERE event_id IS NULL"
+    )
+    try:
+        with open(TOURNAMENTS_CACHE_PATH, "r", encoding="utf-8") as f:
+            cached = json.load(f).get("tournaments") or []
+    except Exception:
+        cached = []
+    stored = {row[0] for row in conn.execute("SELECT tournament FROM tournament_summary")}
+    pairs = set()
+    for t in cached:
+        event_id = _event_id(t.get("id")) or _event_id_from_href(t.get("href"))
+        if event_id and t.get("name") in stored:
+            _resolve_event(conn, t["name"], event_id, t.get("href", ""), t.get("logo", ""))
+            pairs.add((t["name"], event_id))
+    _, renamed_ids = _link_event_rows(conn, pairs)
+    if renamed_ids:
+        _refresh_match_stats(conn, touch_ids=renamed_ids)
 
 def _match_to_row_dict(match, fallback_id=None):
     mid = str(match.get("id") or fallback_id or "")
     if not mid:
         return None
+    stats_state, details_state, payload_format_version = _payload_state(
+        match.get("maps", []), match.get("players", {})
+    )
     return {
         "id": mid,
         "href": match.get("href", ""),
@@ -391,115 +1661,683 @@ def _match_to_row_dict(match, fallback_id=None):
         "status": match.get("status", ""),
         "team1_logo": match.get("team1_logo", ""),
         "team2_logo": match.get("team2_logo", ""),
+        "team1_id": match.get("team1_id") or None,
+        "team2_id": match.get("team2_id") or None,
         "unix_timestamp": int(match.get("unix_timestamp") or 0),
         "bst_time": match.get("bst_time", ""),
-        "maps_json": _json_dumps(match.get("maps", [])),
-        "players_json": _json_dumps(match.get("players", {})),
+        "maps_json": _encode_payload(match.get("maps", [])),
+        "players_json": _encode_payload(match.get("players", {})),
         "last_updated": int(match.get("last_updated") or int(datetime.now().timestamp())),
+        "stats_state": stats_state,
+        "details_state": details_state,
+        "payload_format_version": payload_format_version,
+        "listing_hash": match.get("listing_hash") or None,
+        "event_id": _event_id(match.get("event_id")),
     }
 
 def _row_to_match(row):
     match = dict(row)
     match["unix_timestamp"] = int(match.get("unix_timestamp") or 0)
     match["last_updated"] = int(match.get("last_updated") or 0)
-    match["maps"] = _json_loads(match.pop("maps_json", ""), [])
-    match["players"] = _json_loads(match.pop("players_json", ""), {})
+    match["maps"] = _decode_payload(match.pop("maps_json", ""), [])
+    match["players"] = _decode_payload(match.pop("players_json", ""), {})
     return match
 
-def _bulk_upsert_rows(conn, rows):
-    if not rows:
-        return 0
-    # Reuse logos already learned for the same team on other matches.  Sync
-    # pages intentionally do not fetch match detail pages, so without this
-    # cache every newly discovered match would render team initials again.
-    logo_by_team = {}
-    for row in conn.execute(
-        "SELECT team1, team1_logo, team2, team2_logo FROM matches "
-        "WHERE (team1_logo IS NOT NULL AND team1_logo != '') "
-        "   OR (team2_logo IS NOT NULL AND team2_logo != '')"
-    ):
-        for name_key, logo in (
-            (_team_name_key(row["team1"]), row["team1_logo"]),
-            (_team_name_key(row["team2"]), row["team2_logo"]),
+def _stat_number(value, cast=float):
+    """Parse a scraped stat cell ("1.12", "74%", "+5", "") into a number or None."""
+    text = str(value or "").strip().replace("%", "").replace("+", "")
+    if not text:
+        return None
+    try:
+        return cast(float(text)) if cast is int else cast(text)
+    except (TypeError, ValueError):
+        return None
+
+def _match_stats_rows(match_id, team1, team2, tournament, unix_timestamp, maps, players):
+    """Flatten a match's maps/players payload into match_maps / player_map_stats rows."""
+    map_rows = []
+    for index, mp in enumerate(maps if isinstance(maps, list) else []):
+        if not isinstance(mp, dict):
+            continue
+        winner = mp.get("winner")
+        map_rows.append((
+            match_id, index, mp.get("name", ""),
+            _stat_number(mp.get("score1"), int), _stat_number(mp.get("score2"), int),
+            winner if winner in (0, 1) else None,
+            tournament, unix_timestamp,
+        ))
+
+    player_rows = []
+    for map_key, map_data in (players.items() if isinstance(players, dict) else ()):
+        if not isinstance(map_data, dict):
+            continue
+        for side, team_key, team_name in ((1, "team1", team1), (2, "team2", team2)):
+            team_players = map_data.get(team_key)
+            if not isinstance(team_players, list):
+                continue
+            for slot, p in enumerate(team_players):
+                if not isinstance(p, dict) or not p.get("name"):
+                    continue
+                player_rows.append((
+                    match_id, str(map_key), side, slot, team_name,
+                    p.get("name", ""), p.get("href", ""), p.get("photo", ""),
+                    json.dumps(p.get("agents") or [], ensure_ascii=False),
+                    _stat_number(p.get("rating")), _stat_number(p.get("acs")),
+                    _stat_number(p.get("k"), int), _stat_number(p.get("d"), int),
+                    _stat_number(p.get("a"), int), _stat_number(p.get("kd_diff"), int),
+                    _stat_number(p.get("kast")), _stat_number(p.get("adr")),
+                    _stat_number(p.get("hs")), _stat_number(p.get("fk"), int),
+                    _stat_number(p.get("fd"), int), _stat_number(p.get("fk_diff"), int),
+                    tournament, unix_timestamp,
+                ))
+    return map_rows, player_rows
+
+def _refresh_match_stats(conn, rebuild_ids=(), touch_ids=()):
+    """Keep match_maps / player_map_stats in step with the matches table.
+
+    `rebuild_ids` had a new maps/players payload written: their normalized
+    rows are rebuilt from the stored (merged) blobs. `touch_ids` only had
+    listing fields written, so only the denormalized team/tournament/time
+    columns of their existing stat rows are refreshed.
+    """
+    rebuild_ids = list(dict.fromkeys(str(i) for i in rebuild_ids if i))
+    rebuilt = set(rebuild_ids)
+    touch_ids = [mid for mid in dict.fromkeys(str(i) for i in touch_ids if i) if mid not in rebuilt]
+
+    affected_tournaments = set()
+    week_pairs = set()
+    for start in range(0, len(rebuild_ids), 500):
+        chunk = rebuild_ids[start:start + 500]
+        placeholders = ",".join("?" for _ in chunk)
+        affected_tournaments.update(_stats_tournaments(conn, chunk))
+        week_pairs.update(_stats_weeks(conn, chunk))
+        conn.execute(f"DELETE FROM match_maps WHERE match_id IN ({placeholders})", chunk)
+        conn.execute(f"DELETE FROM player_map_stats WHERE match_id IN ({placeholders})", chunk)
+        map_rows = []
+        player_rows = []
+        for row in conn.execute(
+            "SELECT id, team1, team2, tournament, unix_timestamp, maps_json, players_json "
+            f"FROM matches WHERE id IN ({placeholders})",
+            chunk,
         ):
-            if name_key and not _is_placeholder_team_logo(logo) and name_key not in logo_by_team:
-                logo_by_team[name_key] = logo
+            maps, players = _match_stats_rows(
+                row["id"], row["team1"] or "", row["team2"] or "", row["tournament"] or "",
+                int(row["unix_timestamp"] or 0),
+                _decode_payload(row["maps_json"], []), _decode_payload(row["players_json"], {}),
+            )
+            map_rows.extend(maps)
+            player_rows.extend(players)
+        if map_rows:
+            conn.executemany("INSERT INTO match_maps VALUES (?, ?, ?, ?, ?, ?, ?, ?)", map_rows)
+        if player_rows:
+            conn.executemany(
+                "INSERT INTO player_map_stats VALUES ("
+                + ", ".join("?" for _ in range(23)) + ")",
+                player_rows,
+            )
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'players'").fetchone():
+                _remember_players(conn, [(r[6], r[5], r[7], r[22]) for r in player_rows if r[1] == "all"])
+        affected_tournaments.update(_stats_tournaments(conn, chunk))
+        week_pairs.update(_stats_weeks(conn, chunk))
+
+    if touch_ids:
+        # Listing writes only matter to the aggregates when they move a
+        # match's stats to another tournament or team name.
+        before = _stats_identity(conn, touch_ids)
+        conn.executemany(
+            """
+            UPDATE player_map_stats SET
+                team = (SELECT CASE player_map_stats.side WHEN 1 THEN m.team1 ELSE m.team2 END
+                        FROM matches m WHERE m.id = player_map_stats.match_id),
+                tournament = (SELECT m.tournament FROM matches m WHERE m.id = player_map_stats.match_id),
+                unix_timestamp = (SELECT m.unix_timestamp FROM matches m WHERE m.id = player_map_stats.match_id)
+            WHERE match_id = ?
+            """,
+            [(mid,) for mid in touch_ids],
+        )
+        conn.executemany(
+            """
+            UPDATE match_maps SET
+                tournament = (SELECT m.tournament FROM matches m WHERE m.id = match_maps.match_id),
+                unix_timestamp = (SELECT m.unix_timestamp FROM matches m WHERE m.id = match_maps.match_id)
+            WHERE match_id = ?
+            """,
+            [(mid,) for mid in touch_ids],
+        )
+        after = _stats_identity(conn, touch_ids)
+        for key in set(before) | set(after):
+            old, new = before.get(key), after.get(key)
+            if old == new:
+                continue
+            week_pairs.update((ident[1], ident[2]) for ident in (old, new) if ident and ident[2] is not None)
+            if (old or ())[:2] != (new or ())[:2]:
+                affected_tournaments.update(ident[1] for ident in (old, new) if ident)
 
-    # Include logos arriving in this same batch before filling its blank sides.
-    for row in rows:
-        for name_key, logo in (
-            (_team_name_key(row.get("team1")), row.get("team1_logo")),
-            (_team_name_key(row.get("team2")), row.get("team2_logo")),
+    if affected_tournaments:
+        _refresh_player_aggregates(conn, affected_tournaments)
+    _refresh_week_stats(conn, week_pairs)
+
+def _stats_tournaments(conn, match_ids):
+    placeholders = ",".join("?" for _ in match_ids)
+    return {
+        row[0] or ""
+        for row in conn.execute(
+            f"SELECT DISTINCT tournament FROM player_map_stats WHERE match_id IN ({placeholders})",
+            list(match_ids),
+        )
+    }
+
+def _stats_identity(conn, match_ids):
+    """Map (match_id, side) -> (team, tournament, week) for existing "all" stat rows."""
+    identity = {}
+    for start in range(0, len(match_ids), 500):
+        chunk = match_ids[start:start + 500]
+        placeholders = ",".join("?" for _ in chunk)
+        for row in conn.execute(
+            "SELECT match_id, side, team, tournament, unix_timestamp FROM player_map_stats "
+            f"WHERE map_key = 'all' AND slot = 0 AND match_id IN ({placeholders})",
+            chunk,
         ):
-            if name_key and not _is_placeholder_team_logo(logo):
-                logo_by_team[name_key] = logo
+            ts = int(row["unix_timestamp"] or 0)
+            identity[(row["match_id"], row["side"])] = (
+                row["team"] or "", row["tournament"] or "", _week_start(ts) if ts > 0 else None
+            )
+    return identity
 
-    for row in rows:
-        if _is_placeholder_team_logo(row.get("team1_logo")):
-            row["team1_logo"] = ""
-        if _is_placeholder_team_logo(row.get("team2_logo")):
-            row["team2_logo"] = ""
-        if not row.get("team1_logo"):
-            row["team1_logo"] = logo_by_team.get(_team_name_key(row.get("team1")), "")
-        if not row.get("team2_logo"):
-            row["team2_logo"] = logo_by_team.get(_team_name_key(row.get("team2")), "")
+def _refresh_player_aggregates(conn, tournaments):
+    """Recompute player_aggregates rows for the given tournaments.
 
-    # A team can be abbreviated on one event phase and written in full on
-    # another (for example FNC/FNATIC).  VLR's real logo is the stable key,
-    # so use the longest known non-placeholder name before saving the rows.
-    _canonicalize_rows_by_logo(conn, rows)
+    Mirrors the old in-browser calculatePlayerAggregates: one "match played"
+    per appearance in a match's "all" table, rating/ACS/KAST/ADR/HS averaged
+    per match, counting stats summed.
+    """
+    for tournament in tournaments:
+        conn.execute("DELETE FROM player_aggregates WHERE tournament = ?", (tournament,))
+        totals = {}
+        for row in conn.execute(
+            """
+            SELECT s.player, s.team, s.side, s.photo, s.agents_json, s.rating, s.acs,
+                   s.kills, s.deaths, s.assists, s.kast, s.adr, s.hs, s.fk, s.fd,
+                   m.team1_logo, m.team2_logo
+            FROM player_map_stats s
+            LEFT JOIN matches m ON m.id = s.match_id
+            WHERE s.tournament = ? AND s.map_key = 'all'
+            """,
+            (tournament,),
+        ):
+            key = (row["player"] or "", row["team"] or "")
+            agg = totals.get(key)
+            if agg is None:
+                agg = totals[key] = {
+                    "matches_played": 0, "rating_sum": 0.0, "rating_n": 0,
+                    "acs_sum": 0.0, "acs_n": 0, "kills": 0, "deaths": 0, "assists": 0,
+                    "kast_sum": 0.0, "kast_n": 0, "adr_sum": 0.0, "adr_n": 0,
+                    "hs_sum": 0.0, "hs_n": 0, "fk": 0, "fd": 0,
+                    "photo": "", "team_logo": "", "agents": {},
+                }
+            agg["matches_played"] += 1
+            for column in ("rating", "acs", "kast", "adr", "hs"):
+                if row[column] is not None:
+                    agg[f"{column}_sum"] += row[column]
+                    agg[f"{column}_n"] += 1
+            for column in ("kills", "deaths", "assists", "fk", "fd"):
+                agg[column] += row[column] or 0
+            if not agg["photo"] and row["photo"]:
+                agg["photo"] = row["photo"]
+            team_logo = row["team1_logo"] if row["side"] == 1 else row["team2_logo"]
+            if not agg["team_logo"] and team_logo:
+                agg["team_logo"] = team_logo
+            for agent in _json_loads(row["agents_json"], []):
+                if isinstance(agent, dict) and agent.get("name"):
+                    entry = agg["agents"].setdefault(agent["name"], {"icon": agent.get("icon", ""), "count": 0})
+                    entry["count"] += 1
+        if totals:
+            conn.executemany(
+                """
+                INSERT INTO player_aggregates (
+                    tournament, player, team, matches_played, rating_sum, rating_n,
+                    acs_sum, acs_n, kills, deaths, assists, kast_sum, kast_n,
+                    adr_sum, adr_n, hs_sum, hs_n, fk, fd, photo, team_logo, agents_json
+                ) VALUES (
+                    :tournament, :player, :team, :matches_played, :rating_sum, :rating_n,
+                    :acs_sum, :acs_n, :kills, :deaths, :assists, :kast_sum, :kast_n,
+                    :adr_sum, :adr_n, :hs_sum, :hs_n, :fk, :fd, :photo, :team_logo, :agents_json
+                )
+                """,
+                [
+                    dict(agg, tournament=tournament, player=player, team=team,
+                         agents_json=json.dumps(agg["agents"], ensure_ascii=False))
+                    for (player, team), agg in totals.items()
+                ],
+            )
 
-    conn.executemany(
+# Weekly buckets (Monday 00:00 UTC) per player and per team, summed from
+# the per-map stat rows, so a date window sums a few buckets per player
+# instead of reading every match. Rates are stored multiplied by rounds
+# (acs_rounds / acs_weight is the round-weighted ACS); weights only count
+# rounds where the stat was published.
+WEEK_SECONDS = 7 * 86400
+# Unix time 0 was a Thursday; the week containing it began on Monday 1969-12-29.
+_WEEK_SHIFT = 3 * 86400
+_WEEK_SQL = f"(unix_timestamp - ((unix_timestamp + {_WEEK_SHIFT}) % {WEEK_SECONDS}))"
+
+def _week_start(ts):
+    ts = int(ts or 0)
+    return ts - (ts + _WEEK_SHIFT) % WEEK_SECONDS
+
+def _stats_weeks(conn, match_ids):
+    """(tournament, week) of every stat row of the given matches."""
+    found = set()
+    for start in range(0, len(match_ids), 500):
+        chunk = list(match_ids[start:start + 500])
+        placeholders = ",".join("?" for _ in chunk)
+        found.update(
+            (row[0] or "", row[1])
+            for row in conn.execute(
+                f"SELECT DISTINCT tournament, {_WEEK_SQL} FROM player_map_stats "
+                f"WHERE match_id IN ({placeholders}) AND unix_timestamp > 0",
+                chunk,
+            )
+        )
+    return found
+
+def _refresh_week_stats(conn, pairs, schema="main"):
+    """Recompute the player/team week buckets of each (tournament, week)."""
+    if not pairs or not conn.execute(
+        f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = 'player_week_stats'"
+    ).fetchone():
+        return
+    # One row per player per played map, with that map's round count.
+    maps_sql = f"""
+        SELECT s.player, COALESCE(s.team, '') AS team, s.side, s.match_id, s.map_key,
+               s.kills, s.deaths, s.assists, s.fk, s.fd, s.acs, s.rating, mm.winner,
+               COALESCE(mm.score1, 0) + COALESCE(mm.score2, 0) AS rounds,
+               CASE s.side WHEN 1 THEN COALESCE(mm.score1, 0) ELSE COALESCE(mm.score2, 0) END AS rounds_won
+        FROM {schema}.player_map_stats s
+        JOIN {schema}.match_maps mm ON mm.match_id = s.match_id AND mm.map_index = CAST(s.map_key AS INTEGER)
+        WHERE s.tournament = ? AND s.map_key != 'all' AND s.unix_timestamp >= ? AND s.unix_timestamp < ?
+            AND COALESCE(mm.score1, 0) + COALESCE(mm.score2, 0) > 0
+    """
+    for tournament, week in sorted(pairs):
+        params = (tournament, week, week + WEEK_SECONDS)
+        conn.execute(f"DELETE FROM {schema}.player_week_stats WHERE week = ? AND tournament = ?", (week, tournament))
+        conn.execute(f"DELETE FROM {schema}.team_week_stats WHERE week = ? AND tournament = ?", (week, tournament))
+        conn.execute(
+            f"""
+            INSERT INTO {schema}.player_week_stats (
+                week, tournament, player, team, maps, rounds, kills, deaths, assists, fk, fd,
+                acs_rounds, acs_weight, rating_rounds, rating_weight
+            )
+            SELECT ?, ?, player, team, COUNT(*), SUM(rounds),
+                   TOTAL(kills), TOTAL(deaths), TOTAL(assists), TOTAL(fk), TOTAL(fd),
+                   TOTAL(acs * rounds), TOTAL(CASE WHEN acs IS NOT NULL THEN rounds END),
+                   TOTAL(rating * rounds), TOTAL(CASE WHEN rating IS NOT NULL THEN rounds END)
+            FROM ({maps_sql})
+            GROUP BY player, team
+            """,
+            (week, tournament, *params),
+        )
+        conn.execute(
+            f"""
+            INSERT INTO {schema}.team_week_stats (
+                week, tournament, team, maps, maps_won, rounds, rounds_won, kills, deaths,
+                acs_rounds, acs_weight, rating_rounds, rating_weight
+            )
+            SELECT ?, ?, team, COUNT(*), SUM(won), SUM(rounds), SUM(rounds_won), TOTAL(kills), TOTAL(deaths),
+                   TOTAL(acs_rounds), TOTAL(acs_weight), TOTAL(rating_rounds), TOTAL(rating_weight)
+            FROM (
+                SELECT team, MAX(winner IS NOT NULL AND winner = side - 1) AS won,
+                       MAX(rounds) AS rounds, MAX(rounds_won) AS rounds_won,
+                       TOTAL(kills) AS kills, TOTAL(deaths) AS deaths,
+                       TOTAL(acs * rounds) AS acs_rounds, TOTAL(CASE WHEN acs IS NOT NULL THEN rounds END) AS acs_weight,
+                       TOTAL(rating * rounds) AS rating_rounds,
+                       TOTAL(CASE WHEN rating IS NOT NULL THEN rounds END) AS rating_weight
+                FROM ({maps_sql})
+                GROUP BY match_id, map_key, side
+            )
+            GROUP BY team
+            """,
+            (week, tournament, *params),
+        )
+
+# Every (tournament, week) with per-map stat rows in `schema`.
+_WEEK_PAIRS_SQL = (
+    f"SELECT DISTINCT tournament, {_WEEK_SQL} FROM {{schema}}.player_map_stats "
+    "WHERE map_key != 'all' AND unix_timestamp > 0"
+)
+
+def _migrate_week_stats(conn):
+    """Create the weekly player/team buckets and fill them in matches.db
+    (step 27 fills the archives)."""
+    conn.execute(
         """
-        INSERT INTO matches (
-            id, href, date, time, team1, team2, score1, score2, tournament, series,
-            tournament_logo, eta, status, team1_logo, team2_logo, unix_timestamp,
-            bst_time, maps_json, players_json, last_updated
-        ) VALUES (
-            :id, :href, :date, :time, :team1, :team2, :score1, :score2, :tournament, :series,
-            :tournament_logo, :eta, :status, :team1_logo, :team2_logo, :unix_timestamp,
-            :bst_time, :maps_json, :players_json, :last_updated
+        CREATE TABLE IF NOT EXISTS player_week_stats (
+            week INTEGER NOT NULL,
+            tournament TEXT NOT NULL,
+            player TEXT NOT NULL,
+            team TEXT NOT NULL,
+            maps INTEGER NOT NULL DEFAULT 0,
+            rounds INTEGER NOT NULL DEFAULT 0,
+            kills INTEGER NOT NULL DEFAULT 0,
+            deaths INTEGER NOT NULL DEFAULT 0,
+            assists INTEGER NOT NULL DEFAULT 0,
+            fk INTEGER NOT NULL DEFAULT 0,
+            fd INTEGER NOT NULL DEFAULT 0,
+            acs_rounds REAL NOT NULL DEFAULT 0,
+            acs_weight INTEGER NOT NULL DEFAULT 0,
+            rating_rounds REAL NOT NULL DEFAULT 0,
+            rating_weight INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (week, tournament, player, team)
         )
-        ON CONFLICT(id) DO UPDATE SET
-            href=excluded.href,
-            date=excluded.date,
-            time=excluded.time,
-            team1=excluded.team1,
-            team2=excluded.team2,
-            score1=excluded.score1,
-            score2=excluded.score2,
-            tournament=excluded.tournament,
-            series=excluded.series,
-            tournament_logo=CASE WHEN COALESCE(excluded.tournament_logo, '') != '' THEN excluded.tournament_logo ELSE matches.tournament_logo END,
-            eta=excluded.eta,
-            status=excluded.status,
-            team1_logo=CASE WHEN COALESCE(excluded.team1_logo, '') != '' THEN excluded.team1_logo WHEN LOWER(COALESCE(matches.team1_logo, '')) LIKE '%/vlr.png' THEN '' ELSE matches.team1_logo END,
-            team2_logo=CASE WHEN COALESCE(excluded.team2_logo, '') != '' THEN excluded.team2_logo WHEN LOWER(COALESCE(matches.team2_logo, '')) LIKE '%/vlr.png' THEN '' ELSE matches.team2_logo END,
-            unix_timestamp=CASE WHEN excluded.unix_timestamp != 0 THEN excluded.unix_timestamp ELSE matches.unix_timestamp END,
-            bst_time=CASE WHEN COALESCE(excluded.bst_time, '') != '' THEN excluded.bst_time ELSE matches.bst_time END,
-            maps_json=CASE WHEN COALESCE(excluded.maps_json, '[]') != '[]' AND COALESCE(excluded.maps_json, '') != '' THEN excluded.maps_json ELSE matches.maps_json END,
-            players_json=CASE WHEN COALESCE(excluded.players_json, '{}') != '{}' AND COALESCE(excluded.players_json, '') != '' THEN excluded.players_json ELSE matches.players_json END,
-            last_updated=excluded.last_updated
-        """,
-        rows,
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS team_week_stats (
+            week INTEGER NOT NULL,
+            tournament TEXT NOT NULL,
+            team TEXT NOT NULL,
+            maps INTEGER NOT NULL DEFAULT 0,
+            maps_won INTEGER NOT NULL DEFAULT 0,
+            rounds INTEGER NOT NULL DEFAULT 0,
+            rounds_won INTEGER NOT NULL DEFAULT 0,
+            kills INTEGER NOT NULL DEFAULT 0,
+            deaths INTEGER NOT NULL DEFAULT 0,
+            acs_rounds REAL NOT NULL DEFAULT 0,
+            acs_weight INTEGER NOT NULL DEFAULT 0,
+            rating_rounds REAL NOT NULL DEFAULT 0,
+            rating_weight INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (week, tournament, team)
+        )
+        """
     )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_player_week_player ON player_week_stats(player, week)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_team_week_team ON team_week_stats(team, week)")
+    # Archiving moves a tournament's buckets.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_player_week_tournament ON player_week_stats(tournament, week)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_team_week_tournament ON team_week_stats(tournament, week)")
+    _refresh_week_stats(conn, {(r[0] or "", r[1]) for r in conn.execute(_WEEK_PAIRS_SQL.format(schema="main"))})
+
+def _migrate_week_stats_archives(conn):
+    """Fill the week buckets of every archive (archived tournaments keep
+    their buckets next to their stat rows)."""
+    paths = _archive_paths()
+    with ExitStack() as stack:
+        # Attach them all before the first write.
+        for year, path in paths.items():
+            stack.enter_context(_attached(conn, path, f"archive_{year}"))
+        for year in paths:
+            alias = f"archive_{year}"
+            _ensure_archive_schema(conn, alias)
+            pairs = {(r[0] or "", r[1]) for r in conn.execute(_WEEK_PAIRS_SQL.format(schema=alias))}
+            _refresh_week_stats(conn, pairs, schema=alias)
+
+def _migrate_players_json_to_stats(conn):
+    """Populate the normalized stat tables once from existing players_json blobs."""
+    if conn.execute("SELECT 1 FROM player_map_stats LIMIT 1").fetchone():
+        return
+    ids = [
+        row["id"]
+        for row in conn.execute(
+            "SELECT id FROM matches WHERE COALESCE(players_json, '') NOT IN ('', '{}')"
+        )
+    ]
+    if ids:
+        print(f"Migrating player stats of {len(ids)} matches into player_map_stats...")
+        _refresh_match_stats(conn, rebuild_ids=ids)
+
+def _migrate_player_aggregates(conn):
+    """Seed player_aggregates once for databases that predate the table."""
+    if conn.execute("SELECT 1 FROM player_aggregates LIMIT 1").fetchone():
+        return
+    tournaments = [
+        row[0] for row in conn.execute("SELECT DISTINCT tournament FROM player_map_stats WHERE map_key = 'all'")
+    ]
+    if tournaments:
+        _refresh_player_aggregates(conn, tournaments)
+
+def _lookup_team_logos(conn, name_keys):
+    """Return {name_key: logo} for the given normalized team names."""
+    keys = sorted(key for key in name_keys if key)
+    found = {}
+    for start in range(0, len(keys), 500):
+        chunk = keys[start:start + 500]
+        found.update(
+            (row[0], row[1])
+            for row in conn.execute(
+                f"SELECT name_key, logo FROM team_logos WHERE name_key IN ({','.join('?' for _ in chunk)})",
+                chunk,
+            )
+        )
+    return found
 
-    # Also repair older blank matches immediately when a logo is learned.
-    logo_updates = []
-    for row in conn.execute("SELECT id, team1, team1_logo, team2, team2_logo FROM matches"):
-        team1_logo = row["team1_logo"] or logo_by_team.get(_team_name_key(row["team1"]), "")
-        team2_logo = row["team2_logo"] or logo_by_team.get(_team_name_key(row["team2"]), "")
-        if team1_logo != (row["team1_logo"] or "") or team2_logo != (row["team2_logo"] or ""):
-            logo_updates.append((team1_logo, team2_logo, row["id"]))
-    if logo_updates:
+def _store_team_logos(conn, logos):
+    """Upsert {name_key: logo}; return the keys whose logo is new or changed."""
+    if not logos:
+        return set()
+    known = _lookup_team_logos(conn, logos)
+    changed = {key for key, logo in logos.items() if logo and known.get(key) != logo}
+    conn.executemany(
+        "INSERT INTO team_logos (name_key, logo) VALUES (?, ?) "
+        "ON CONFLICT(name_key) DO UPDATE SET logo = excluded.logo",
+        [(key, logos[key]) for key in sorted(changed)],
+    )
+    return changed
+
+def _seed_team_logos(conn):
+    """Build team_logos from stored matches once, then fill blank sides from it."""
+    if conn.execute("SELECT 1 FROM team_logos LIMIT 1").fetchone():
+        return
+    logos = {}
+    for team, logo in conn.execute(
+        "SELECT team1, team1_logo FROM matches WHERE COALESCE(team1_logo, '') != '' "
+        "UNION ALL SELECT team2, team2_logo FROM matches WHERE COALESCE(team2_logo, '') != ''"
+    ):
+        key = _team_name_key(team)
+        if key and key not in logos and not _is_placeholder_team_logo(logo):
+            logos[key] = logo
+    if not logos:
+        return
+    _store_team_logos(conn, logos)
+    for side in ("team1", "team2"):
+        blanks = conn.execute(
+            f"SELECT id, {side} FROM matches WHERE COALESCE({side}_logo, '') = ''"
+        ).fetchall()
         conn.executemany(
-            "UPDATE matches SET team1_logo = ?, team2_logo = ? WHERE id = ?",
-            logo_updates,
+            f"UPDATE matches SET {side}_logo = ? WHERE id = ?",
+            [(logos[_team_name_key(team)], mid) for mid, team in blanks if _team_name_key(team) in logos],
+        )
+
+# ON CONFLICT assignments of the match upsert, per column. The payload
+# state columns follow whichever payload the upsert keeps: the incoming one
+# when it has player tables, otherwise the stored one (a maps-only payload
+# can only raise a player-less row to STATS_PARTIAL, hence MAX).
+_MATCH_UPSERT_ASSIGNMENTS = (
+    ("href", "excluded.href"),
+    ("date", "excluded.date"),
+    ("time", "excluded.time"),
+    ("team1", "excluded.team1"),
+    ("team2", "excluded.team2"),
+    ("score1", "excluded.score1"),
+    ("score2", "excluded.score2"),
+    ("tournament", "excluded.tournament"),
+    ("series", "excluded.series"),
+    ("tournament_logo", "CASE WHEN COALESCE(excluded.tournament_logo, '') != '' THEN excluded.tournament_logo ELSE matches.tournament_logo END"),
+    ("eta", "excluded.eta"),
+    ("status", "excluded.status"),
+    ("team1_logo", "CASE WHEN COALESCE(excluded.team1_logo, '') != '' THEN excluded.team1_logo WHEN LOWER(COALESCE(matches.team1_logo, '')) LIKE '%/vlr.png' THEN '' ELSE matches.team1_logo END"),
+    ("team2_logo", "CASE WHEN COALESCE(excluded.team2_logo, '') != '' THEN excluded.team2_logo WHEN LOWER(COALESCE(matches.team2_logo, '')) LIKE '%/vlr.png' THEN '' ELSE matches.team2_logo END"),
+    ("unix_timestamp", "CASE WHEN excluded.unix_timestamp != 0 THEN excluded.unix_timestamp ELSE matches.unix_timestamp END"),
+    ("bst_time", "CASE WHEN COALESCE(excluded.bst_time, '') != '' THEN excluded.bst_time ELSE matches.bst_time END"),
+    ("maps_json", "CASE WHEN COALESCE(excluded.maps_json, '[]') != '[]' AND COALESCE(excluded.maps_json, '') != '' THEN excluded.maps_json ELSE matches.maps_json END"),
+    ("players_json", "CASE WHEN COALESCE(excluded.players_json, '{}') != '{}' AND COALESCE(excluded.players_json, '') != '' THEN excluded.players_json ELSE matches.players_json END"),
+    ("last_updated", "excluded.last_updated"),
+    ("team1_id", "CASE WHEN excluded.team1_id IS NOT NULL THEN excluded.team1_id WHEN excluded.team1 = matches.team1 THEN matches.team1_id ELSE NULL END"),
+    ("team2_id", "CASE WHEN excluded.team2_id IS NOT NULL THEN excluded.team2_id WHEN excluded.team2 = matches.team2 THEN matches.team2_id ELSE NULL END"),
+    ("listing_hash", "COALESCE(excluded.listing_hash, matches.listing_hash)"),
+    ("event_id", "COALESCE(excluded.event_id, matches.event_id)"),
+    ("attempt_count", "CASE WHEN LOWER(excluded.status) = LOWER(matches.status) THEN matches.attempt_count ELSE 0 END"),
+    ("next_attempt_at", "CASE WHEN LOWER(excluded.status) = LOWER(matches.status) THEN matches.next_attempt_at ELSE 0 END"),
+    ("last_error", "CASE WHEN LOWER(excluded.status) = LOWER(matches.status) THEN matches.last_error ELSE NULL END"),
+) + tuple(
+    (name,
+     f"CASE WHEN COALESCE(excluded.players_json, '{{}}') NOT IN ('{{}}', '') THEN excluded.{name} "
+     f"WHEN COALESCE(matches.players_json, '{{}}') IN ('{{}}', '') THEN MAX(excluded.{name}, matches.{name}) "
+     f"ELSE matches.{name} END")
+    for name in ("stats_state", "details_state", "payload_format_version")
+)
+# Columns written by the upsert; the retry schedule is only ever reset.
+_MATCH_UPSERT_COLUMNS = tuple(MATCH_COLUMNS) + (
+    "team1_id", "team2_id", "stats_state", "details_state", "payload_format_version", "listing_hash", "event_id",
+)
+_MATCH_UPSERT_SQL = (
+    f"INSERT INTO matches ({', '.join(_MATCH_UPSERT_COLUMNS)}) "
+    f"VALUES ({', '.join(':' + name for name in _MATCH_UPSERT_COLUMNS)}) "
+    f"ON CONFLICT(id) DO UPDATE SET {', '.join(f'{name}={expr}' for name, expr in _MATCH_UPSERT_ASSIGNMENTS)}"
+)
+
+def _archived_match_ids(conn, rows):
+    """Ids of `rows` whose match lives in an archive file.
+
+    A row is archived when its id is listed in archived_matches or its
+    tournament was archived. Archived seasons are read-only: writing such a
+    row to matches.db would list the match twice in team history and bring
+    its tournament back to the sidebar.
+    """
+    if not conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'archived_matches'"
+    ).fetchone():
+        return set()
+    tournaments = sorted({row.get("tournament") or "" for row in rows})
+    archived_names = set()
+    for start in range(0, len(tournaments), 500):
+        chunk = tournaments[start:start + 500]
+        archived_names.update(
+            r[0]
+            for r in conn.execute(
+                f"SELECT tournament FROM archived_tournaments WHERE tournament IN ({','.join('?' for _ in chunk)})",
+                chunk,
+            )
+        )
+    found = {row["id"] for row in rows if (row.get("tournament") or "") in archived_names}
+    # A match can also be re-scraped under another tournament spelling.
+    ids = [row["id"] for row in rows if row["id"] not in found]
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        found.update(
+            r[0]
+            for r in conn.execute(f"SELECT id FROM archived_matches WHERE id IN ({','.join('?' for _ in chunk)})", chunk)
         )
+    return found
+
+def find_duplicate_match_ids():
+    """Match ids stored more than once across matches.db and the archives.
+
+    Archiving moves a match out of matches.db, so every id must appear in
+    all_matches exactly once; anything returned here is counted twice by
+    team history and the leaderboards.
+    """
+    _ensure_db()
+    flush_match_writes()
+    with _get_conn() as conn, _with_archives(conn) as tables:
+        if tables["matches"] == "matches":
+            return []
+        return [
+            row[0]
+            for row in conn.execute(f"SELECT id FROM {tables['matches']} GROUP BY id HAVING COUNT(*) > 1 ORDER BY id")
+        ]
+
+def _bulk_upsert_rows(conn, rows):
+    if not rows:
+        return 0
+    archived = _archived_match_ids(conn, rows)
+    if archived:
+        print(f"Skipped {len(archived)} writes to archived matches")
+        rows = [row for row in rows if row["id"] not in archived]
+        if not rows:
+            return 0
+    # Standings of both the old and the new tournament of every written row
+    # are stale after this write.
+    touched_tournaments = {row.get("tournament") or "" for row in rows}
+    ids = [row["id"] for row in rows]
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        touched_tournaments.update(
+            r[0] or ""
+            for r in conn.execute(
+                f"SELECT DISTINCT tournament FROM matches WHERE id IN ({','.join('?' for _ in chunk)})",
+                chunk,
+            )
+        )
+    _invalidate_standings(touched_tournaments)
+    # Reuse logos already learned for the same team on other matches.  Sync
+    # pages intentionally do not fetch match detail pages, so without this
+    # lookup every newly discovered match would render team initials again.
+    own_logos = []
+    blank_keys = set()
+    for row in rows:
+        for side in ("team1", "team2"):
+            if _is_placeholder_team_logo(row.get(f"{side}_logo")):
+                row[f"{side}_logo"] = ""
+                blank_keys.add(_team_name_key(row.get(side)))
+            else:
+                own_logos.append((row, side, row.get(side)))
+    logo_by_team = _lookup_team_logos(conn, blank_keys)
+    # Logos arriving in this same batch win over older ones.
+    logo_by_team.update(
+        (_team_name_key(name), row[f"{side}_logo"]) for row, side, name in own_logos if _team_name_key(name)
+    )
+    for row in rows:
+        for side in ("team1", "team2"):
+            if not row.get(f"{side}_logo"):
+                row[f"{side}_logo"] = logo_by_team.get(_team_name_key(row.get(side)), "")
+
+    # A team can be abbreviated on one event phase and written in full on
+    # another (for example FNC/FNATIC).  Resolve every side to its canonical
+    # team (VLR id, logo or known alias) and store the preferred name.
+    team_names = _resolve_teams(conn, rows)
+    event_pairs = _resolve_events(conn, rows)
+
+    conn.executemany(_MATCH_UPSERT_SQL, rows)
+
+    # Older rows of a team whose preferred name just changed follow it.
+    renamed = _apply_team_names(conn, team_names)
+    if renamed:
+        _invalidate_standings()
+    # So do rows still stored under another spelling of a resolved event.
+    renamed_events, event_renamed_ids = _link_event_rows(conn, event_pairs)
+    if renamed_events:
+        _invalidate_standings(renamed_events)
+
+    _refresh_match_stats(
+        conn,
+        rebuild_ids=[row["id"] for row in rows if _has_payload(row)],
+        touch_ids=[row["id"] for row in rows] + sorted(renamed) + event_renamed_ids,
+    )
+
+    # Remember the logos this batch brought (under the scraped and the
+    # canonical name) and fill older blank rows of just those teams.
+    learned = {}
+    for row, side, name in own_logos:
+        for team_name in (name, row.get(side)):
+            if _team_name_key(team_name):
+                learned[_team_name_key(team_name)] = (team_name, row[f"{side}_logo"])
+    changed = _store_team_logos(conn, {key: logo for key, (_, logo) in learned.items()})
+    logo_updates = {(learned[key][0], learned[key][1]) for key in changed}
+    for row, side, name in own_logos:
+        if _team_name_key(name) in changed:
+            logo_updates.add((row.get(side), row[f"{side}_logo"]))
+    for name, logo in sorted(logo_updates):
+        for side in ("team1", "team2"):
+            conn.execute(
+                f"UPDATE matches SET {side}_logo = ? WHERE {side} = ? AND COALESCE({side}_logo, '') = ''",
+                (logo, name),
+            )
     return len(rows)
 
 def load_json_matches(force_reload=False):
     global _cached_matches
+    flush_match_writes()
     if _cached_matches is not None and not force_reload:
         return _cached_matches
         
@@ -508,8 +2346,8 @@ def load_json_matches(force_reload=False):
             return _cached_matches
         try:
             _ensure_db()
-            with _get_conn() as conn:
-                rows = conn.execute("SELECT * FROM matches").fetchall()
+            with _get_conn() as conn, _with_archives(conn) as tables:
+                rows = conn.execute(f"SELECT * FROM {tables['matches']}").fetchall()
                 _cached_matches = {row["id"]: _row_to_match(row) for row in rows}
         except Exception as e:
             print(f"Error loading matches DB: {e}")
@@ -521,6 +2359,8 @@ def save_json_matches(matches):
     global _cached_matches
     try:
         _ensure_db()
+        # Queued single-match writes are older than this one; store them first.
+        flush_match_writes()
         if isinstance(matches, dict) and ("id" in matches or "href" in matches):
             rows = [_match_to_row_dict(matches)]
         elif isinstance(matches, dict):
@@ -542,18 +2382,177 @@ def save_json_matches(matches):
     except Exception as e:
         print(f"Error saving matches DB: {e}")
 
+# Write-behind buffer for single-match writes (detail modal, background
+# details, metadata repair, missing-stats loads). Rows are coalesced by id
+# and written in one transaction, with one logo/alias pass, when the buffer
+# reaches WRITE_BUFFER_MAX_ROWS or WRITE_BUFFER_MAX_DELAY seconds after the
+# first queued write. Readers call flush_match_writes() first, so every read
+# sees all earlier writes; load_match only flushes when its own id is queued.
+WRITE_BUFFER_MAX_ROWS = 50
+WRITE_BUFFER_MAX_DELAY = 2.0
+_write_buffer = {}
+_write_buffer_lock = threading.Lock()
+_write_flush_lock = threading.Lock()
+_write_flush_timer = None
+# Errors of dropped rows by match id, reported by the next
+# flush_match_writes(match_id) for that match.
+_write_errors = {}
+
+def _coalesce_rows(old, new):
+    """Merge two queued rows for one match the way the upsert's ON CONFLICT would."""
+    merged = dict(new)
+    for key in ("tournament_logo", "team1_logo", "team2_logo", "bst_time", "listing_hash", "event_id"):
+        if not new.get(key):
+            merged[key] = old.get(key)
+    if not new.get("unix_timestamp"):
+        merged["unix_timestamp"] = old.get("unix_timestamp")
+    for side in ("team1", "team2"):
+        if not new.get(f"{side}_id") and new.get(side) == old.get(side):
+            merged[f"{side}_id"] = old.get(f"{side}_id")
+    if (new.get("maps_json") or "[]") == "[]":
+        merged["maps_json"] = old.get("maps_json")
+    state_columns = ("stats_state", "details_state", "payload_format_version")
+    if (new.get("players_json") or "{}") == "{}":
+        merged["players_json"] = old.get("players_json")
+        for key in state_columns:
+            if (old.get("players_json") or "{}") != "{}":
+                merged[key] = old.get(key)
+            else:
+                merged[key] = max(old.get(key) or 0, new.get(key) or 0)
+    return merged
+
+def _arm_write_flush_timer():
+    """Schedule the delayed flush unless one is pending (hold _write_buffer_lock)."""
+    global _write_flush_timer
+    if _write_flush_timer is None:
+        _write_flush_timer = threading.Timer(WRITE_BUFFER_MAX_DELAY, _flush_match_writes_in_background)
+        _write_flush_timer.daemon = True
+        _write_flush_timer.start()
+
 def upsert_match(match):
-    save_json_matches(match)
+    """Queue one match write; it is stored by the next flush."""
+    row = _match_to_row_dict(match)
+    if not row:
+        return
+    with _write_buffer_lock:
+        queued = _write_buffer.get(row["id"])
+        _write_buffer[row["id"]] = _coalesce_rows(queued, row) if queued else row
+        full = len(_write_buffer) >= WRITE_BUFFER_MAX_ROWS
+        if not full:
+            _arm_write_flush_timer()
+    if full:
+        _flush_match_writes_in_background()
+
+def _requeue_rows(rows):
+    """Put rows that failed to write back underneath anything queued since."""
+    with _write_buffer_lock:
+        for row in rows:
+            newer = _write_buffer.get(row["id"])
+            _write_buffer[row["id"]] = _coalesce_rows(row, newer) if newer else row
+        _arm_write_flush_timer()
+
+def flush_match_writes(match_id=None):
+    """Write all queued match rows now (read-your-writes barrier).
+
+    With match_id, only flush if that match has a queued write. Returns the
+    number of rows written. If the batch fails, its rows are retried one by
+    one so a bad row cannot hold up the rest: rows that hit a database error
+    (locked, I/O) are queued again for the next timed flush, and rows
+    rejected for their own data are dropped. Only a flush for one match
+    raises, and only that match's own error (including a drop by an earlier
+    flush); a full flush logs the failures so one bad row cannot break
+    readers of other matches.
+    """
+    global _write_flush_timer, _cached_matches
+    mid = None if match_id is None else str(match_id)
+    if mid is not None:
+        with _write_buffer_lock:
+            if mid not in _write_buffer:
+                error = _write_errors.pop(mid, None)
+                if error is not None:
+                    raise error
+                return 0
+    with _write_flush_lock:
+        with _write_buffer_lock:
+            rows = list(_write_buffer.values())
+            _write_buffer.clear()
+            if _write_flush_timer is not None:
+                _write_flush_timer.cancel()
+                _write_flush_timer = None
+        if not rows:
+            return 0
+        try:
+            _ensure_db()
+        except Exception:
+            _requeue_rows(rows)
+            raise
+        failed = {}
+        try:
+            with _get_conn() as conn:
+                written = _bulk_upsert_rows(conn, rows)
+        except Exception as e:
+            print(f"Error flushing {len(rows)} queued match writes: {e}; retrying one by one")
+            written = 0
+            retry = []
+            for row in rows:
+                try:
+                    with _get_conn() as conn:
+                        written += _bulk_upsert_rows(conn, [row])
+                except sqlite3.OperationalError as row_error:
+                    failed[row["id"]] = row_error
+                    retry.append(row)
+                except Exception as row_error:
+                    failed[row["id"]] = row_error
+                    print(f"Dropped queued write for match {row['id']}: {row_error}")
+            if retry:
+                print(f"Queued {len(retry)} match writes again")
+                _requeue_rows(retry)
+        with _write_buffer_lock:
+            for row in rows:
+                error = failed.get(row["id"])
+                if error is None or isinstance(error, sqlite3.OperationalError):
+                    _write_errors.pop(row["id"], None)
+                else:
+                    _write_errors[row["id"]] = error
+            error = _write_errors.pop(mid, None) if mid is not None else None
+        if written:
+            with _cache_lock:
+                _cached_matches = None
+        if mid in failed:
+            raise failed[mid]
+        if error is not None:
+            raise error
+        return written
+
+def _flush_match_writes_in_background():
+    """Timer/atexit flush: nobody waits on it, so failures are only logged."""
+    try:
+        flush_match_writes()
+    except Exception as e:
+        print(f"Background flush of queued match writes failed: {e}")
+
+atexit.register(_flush_match_writes_in_background)
 
 def load_match(match_id):
     _ensure_db()
+    flush_match_writes(match_id)
     with _get_conn() as conn:
         row = conn.execute("SELECT * FROM matches WHERE id = ?", (str(match_id),)).fetchone()
+        if row is None and _archive_paths():
+            # Archived matches are still opened from team history.
+            with _with_archives(conn) as tables:
+                row = conn.execute(f"SELECT * FROM {tables['matches']} WHERE id = ?", (str(match_id),)).fetchone()
         return _row_to_match(row) if row else None
 
-def load_matches(tournament_names=None, exclude_tournaments=None):
+def load_matches(tournament_names=None, exclude_tournaments=None, include_payload=True):
+    """Load matches of non-ignored tournaments, optionally without the blobs.
+
+    Without the payload, rows come back with empty maps/players and the
+    stored stats_state/details_state columns describe what they would hold.
+    """
     _ensure_db()
-    clauses = []
+    flush_match_writes()
+    clauses = [NOT_IGNORED_SQL]
     params = []
     if tournament_names is not None:
         names = [str(t) for t in tournament_names if t]
@@ -570,14 +2569,113 @@ def load_matches(tournament_names=None, exclude_tournaments=None):
             clauses.append(f"tournament NOT IN ({placeholders})")
             params.extend(names)
     where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
-    query = f"SELECT * FROM matches {where_sql}"
+    columns = "*" if include_payload else ", ".join(
+        [c for c in MATCH_COLUMNS if c not in ("maps_json", "players_json")]
+        + [name for name, _ in MATCH_EXTRA_COLUMNS]
+    )
+    query = f"SELECT {columns} FROM matches {where_sql}"
     with _get_conn() as conn:
         rows = conn.execute(query, params).fetchall()
     return [_row_to_match(row) for row in rows]
 
+# Per-tournament sidebar summary, recomputed for the affected tournament(s)
+# by triggers on every insert/delete and on updates of the columns it reads.
+# Each recompute reads one tournament through the covering
+# idx_matches_overview, so the overview no longer scans all matches.
+# "Upcoming but already due" depends on the clock, so the summary stores the
+# earliest dated upcoming match (next_due_ts) and the read compares it to now.
+_TOURNAMENT_SUMMARY_SELECT = f"""
+    SELECT
+        tournament,
+        MAX(tournament_logo),
+        MIN(unix_timestamp),
+        COUNT(*),
+        SUM(LOWER(status) = 'completed'),
+        SUM(LOWER(status) = 'live'),
+        SUM(CASE
+            -- Completed matches without maps or complete player tables
+            WHEN LOWER(status) = 'completed' AND stats_state < {STATS_COMPLETE} THEN 1
+            -- A live match is never final, even if its current maps have stats.
+            WHEN LOWER(status) = 'live' THEN 1
+            -- Upcoming matches with no timestamp at all need a scan
+            WHEN LOWER(status) = 'upcoming' AND (unix_timestamp IS NULL OR unix_timestamp = 0) THEN 1
+            ELSE 0
+        END),
+        MIN(CASE WHEN LOWER(status) = 'upcoming' AND unix_timestamp > 0 THEN unix_timestamp END)
+    FROM matches
+"""
+
+def _tournament_summary_refresh_sql(ref):
+    return f"""
+        DELETE FROM tournament_summary WHERE tournament = {ref}.tournament;
+        INSERT INTO tournament_summary (
+            tournament, tournament_logo, first_match, match_count, completed_count,
+            live_count, missing_count, next_due_ts
+        )
+        {_TOURNAMENT_SUMMARY_SELECT} WHERE tournament = {ref}.tournament GROUP BY tournament;
+    """
+
+def _migrate_tournament_summary(conn):
+    """Create tournament_summary, its maintenance triggers, and fill it."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tournament_summary (
+            tournament TEXT PRIMARY KEY,
+            tournament_logo TEXT,
+            first_match INTEGER,
+            match_count INTEGER NOT NULL,
+            completed_count INTEGER NOT NULL,
+            live_count INTEGER NOT NULL,
+            missing_count INTEGER NOT NULL,
+            next_due_ts INTEGER
+        )
+        """
+    )
+    triggers = {
+        "trg_matches_summary_insert": ("AFTER INSERT", ("NEW",)),
+        "trg_matches_summary_delete": ("AFTER DELETE", ("OLD",)),
+        "trg_matches_summary_update": (
+            "AFTER UPDATE OF tournament, status, stats_state, unix_timestamp, tournament_logo",
+            ("OLD", "NEW"),
+        ),
+    }
+    for name, (event, refs) in triggers.items():
+        body = "".join(_tournament_summary_refresh_sql(ref) for ref in refs)
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} ON matches BEGIN {body} END")
+    conn.execute("DELETE FROM tournament_summary")
+    conn.execute(
+        "INSERT INTO tournament_summary (tournament, tournament_logo, first_match, match_count, "
+        "completed_count, live_count, missing_count, next_due_ts) "
+        f"{_TOURNAMENT_SUMMARY_SELECT} GROUP BY tournament"
+    )
+
+def _migrate_summary_trigger_guard(conn):
+    """Refresh the tournament summary only when a row's summary columns change.
+
+    The match upsert assigns every column the summary reads, so the update
+    trigger of step 10 recomputed the old and the new tournament even for
+    rows written back unchanged. The rebuilt trigger compares the values,
+    and the old tournament is recomputed only when a match moved out of it.
+    """
+    changed = " OR ".join(
+        f"OLD.{name} IS NOT NEW.{name}"
+        for name in ("tournament", "status", "stats_state", "unix_timestamp", "tournament_logo")
+    )
+    conn.execute("DROP TRIGGER IF EXISTS trg_matches_summary_update")
+    conn.execute(
+        "CREATE TRIGGER trg_matches_summary_update "
+        "AFTER UPDATE OF tournament, status, stats_state, unix_timestamp, tournament_logo ON matches "
+        f"WHEN {changed} BEGIN {_tournament_summary_refresh_sql('NEW')} END"
+    )
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS trg_matches_summary_move AFTER UPDATE OF tournament ON matches "
+        f"WHEN OLD.tournament IS NOT NEW.tournament BEGIN {_tournament_summary_refresh_sql('OLD')} END"
+    )
+
 def load_tournament_overview(exclude_tournaments=None):
     _ensure_db()
-    clauses = []
+    flush_match_writes()
+    clauses = ["tournament != ''", NOT_IGNORED_SQL]
     params = []
     if exclude_tournaments:
         names = [str(t) for t in exclude_tournaments if t]
@@ -585,46 +2683,952 @@ def load_tournament_overview(exclude_tournaments=None):
             placeholders = ",".join("?" for _ in names)
             clauses.append(f"tournament NOT IN ({placeholders})")
             params.extend(names)
-    where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
-    import time as _time
-    now_ts = int(_time.time())
     query = f"""
-        SELECT
-            tournament,
-            MAX(tournament_logo) AS tournament_logo,
-            MIN(unix_timestamp) AS first_match,
-            SUM(CASE
-                -- Completed matches with no map data are missing stats
-                WHEN LOWER(status) = 'completed' AND (maps_json IS NULL OR maps_json = '[]') THEN 1
-                -- Completed matches with maps but no player stats (players_json has no "all" key data)
-                WHEN LOWER(status) = 'completed' AND maps_json IS NOT NULL AND maps_json != '[]'
-                     AND (players_json IS NULL OR players_json = '{{}}' OR players_json NOT LIKE '%"all"%') THEN 1
-                -- A live match is never final, even if its current maps have stats.
-                WHEN LOWER(status) = 'live' THEN 1
-                -- Non-completed matches whose scheduled time has already passed need a re-scan
-                WHEN LOWER(status) = 'upcoming' AND unix_timestamp IS NOT NULL AND unix_timestamp > 0 AND unix_timestamp <= ? THEN 1
-                -- Non-completed matches with no timestamp at all need a scan too
-                WHEN LOWER(status) = 'upcoming' AND (unix_timestamp IS NULL OR unix_timestamp = 0) THEN 1
-                ELSE 0
-            END) AS missing_stats
-        FROM matches
-        {where_sql}
-        GROUP BY tournament
+        SELECT tournament, tournament_logo, first_match, missing_count, next_due_ts
+        FROM tournament_summary
+        WHERE {' AND '.join(clauses)}
         ORDER BY tournament
     """
-    params_with_ts = [now_ts] + params
+    now_ts = int(time.time())
+    with _get_conn() as conn:
+        rows = conn.execute(query, params).fetchall()
+    return [
+        {
+            "tournament": row["tournament"],
+            "tournament_logo": row["tournament_logo"] or "",
+            "first_match": int(row["first_match"] or 0),
+            # Upcoming matches whose scheduled time has passed need a re-scan.
+            "fully_loaded": int(row["missing_count"] or 0) == 0
+            and (row["next_due_ts"] is None or row["next_due_ts"] > now_ts),
+        }
+        for row in rows
+        if row["tournament"]
+    ]
+
+LEADERBOARD_SORTS = {
+    "rating": "rating",
+    "acs": "acs",
+    "kills": "k",
+    "kd_diff": "kd_diff",
+    "kast": "kast",
+    "adr": "adr",
+    "hs": "hs",
+    "fk_diff": "fk_diff",
+    "matches": "matches_played",
+}
+
+def get_player_leaderboard(tournament_names=None, split_by_team=False, limit=100, sort="rating", query=""):
+    """Return the top `limit` players over the given tournaments.
+
+    Served from player_aggregates, so the cost depends on the number of
+    players in the selected tournaments, not on how many matches (or how much
+    stat JSON) the database holds. Rows use the same keys the leaderboard
+    table renders (rating/acs/kast/... already formatted).
+    """
+    _ensure_db()
+    flush_match_writes()
+    names = [str(t) for t in (tournament_names or []) if t]
+    if tournament_names is not None and not names:
+        return []
+    clauses = [NOT_IGNORED_SQL]
+    params = []
+    if names:
+        clauses.append(f"tournament IN ({','.join('?' for _ in names)})")
+        params.extend(names)
+    if query:
+        clauses.append("player LIKE ? ESCAPE '\\'")
+        escaped = str(query).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params.append(f"%{escaped}%")
+    where_sql = f"WHERE {' AND '.join(clauses)}"
+    group_sql = "player, team" if split_by_team else "player"
+    order_column = LEADERBOARD_SORTS.get(sort, "rating")
+    try:
+        limit = max(1, min(int(limit), 1000))
+    except (TypeError, ValueError):
+        limit = 100
+    # Archived tournaments still count towards the leaderboard.
+    with _get_conn() as conn, _with_archives(conn) as tables:
+        sql = f"""
+            SELECT
+                player,
+                {"team" if split_by_team else "''"} AS team,
+                MAX(photo) AS photo,
+                {"MAX(team_logo)" if split_by_team else "''"} AS team_logo,
+                GROUP_CONCAT(agents_json, char(31)) AS agents_blob,
+                SUM(matches_played) AS matches_played,
+                SUM(rating_sum) / NULLIF(SUM(rating_n), 0) AS rating,
+                SUM(acs_sum) / NULLIF(SUM(acs_n), 0) AS acs,
+                SUM(kills) AS k,
+                SUM(deaths) AS d,
+                SUM(assists) AS a,
+                SUM(kills) - SUM(deaths) AS kd_diff,
+                SUM(kast_sum) / NULLIF(SUM(kast_n), 0) AS kast,
+                SUM(adr_sum) / NULLIF(SUM(adr_n), 0) AS adr,
+                SUM(hs_sum) / NULLIF(SUM(hs_n), 0) AS hs,
+                SUM(fk) AS fk,
+                SUM(fd) AS fd,
+                SUM(fk) - SUM(fd) AS fk_diff
+            FROM {tables['player_aggregates']}
+            {where_sql}
+            GROUP BY {group_sql}
+            ORDER BY ({order_column} IS NULL), {order_column} DESC, player
+            LIMIT ?
+        """
+        rows = conn.execute(sql, params + [limit]).fetchall()
+
+    def avg_text(value, suffix="", digits=None):
+        if not value:
+            return "N/A"
+        return (f"{value:.{digits}f}" if digits is not None else str(round(value))) + suffix
+
+    leaderboard = []
+    for row in rows:
+        agents = {}
+        for blob in (row["agents_blob"] or "").split(chr(31)):
+            for name, data in _json_loads(blob, {}).items():
+                entry = agents.setdefault(name, {"icon": data.get("icon", ""), "count": 0})
+                entry["count"] += int(data.get("count") or 0)
+        leaderboard.append({
+            "name": row["player"],
+            "photo": row["photo"] or "",
+            "teamLogo": row["team_logo"] or "",
+            "teamName": row["team"] or "",
+            "agents": [
+                {"name": name, "icon": data["icon"]}
+                for name, data in sorted(agents.items(), key=lambda item: -item[1]["count"])
+            ],
+            "matchesPlayed": row["matches_played"] or 0,
+            "rating": avg_text(row["rating"], digits=2),
+            "acs": round(row["acs"]) if row["acs"] else "N/A",
+            "k": row["k"] or 0,
+            "d": row["d"] or 0,
+            "a": row["a"] or 0,
+            "kd_diff": row["kd_diff"] or 0,
+            "kast": avg_text(row["kast"], "%"),
+            "adr": round(row["adr"]) if row["adr"] else "N/A",
+            "hs": avg_text(row["hs"], "%"),
+            "fk": row["fk"] or 0,
+            "fd": row["fd"] or 0,
+            "fk_diff": row["fk_diff"] or 0,
+        })
+    return leaderboard
+
+PLAYER_FORM_SORTS = {
+    "rating": "rating",
+    "acs": "acs",
+    "kills": "k",
+    "kd_diff": "kd_diff",
+    "kpr": "kpr",
+    "maps": "maps",
+    "rounds": "rounds",
+}
+TEAM_FORM_SORTS = {
+    "map_winrate": "map_winrate",
+    "round_winrate": "round_winrate",
+    "rating": "rating",
+    "acs": "acs",
+    "kills": "k",
+    "kd_diff": "kd_diff",
+    "maps": "maps",
+}
+
+def form_window(since, until=None):
+    """Whole weeks covering [since, until): (first week start, end bound)."""
+    until = int(until) if until else int(time.time())
+    return _week_start(max(0, int(since or 0))), until
+
+def _form_filters(names, column, clauses, params):
+    names = [str(n) for n in (names or []) if n]
+    if names:
+        clauses.append(f"{column} IN ({','.join('?' for _ in names)})")
+        params.extend(names)
+
+def get_player_form(since, until=None, players=None, tournament_names=None, split_by_team=False,
+                    limit=100, sort="rating", min_maps=1):
+    """Player stats over a date window, summed from the weekly buckets.
+
+    The window is widened to whole weeks (Monday 00:00 UTC): every week
+    starting before `until` whose end is after `since` counts. Cost grows
+    with weeks x players in the window, not with the number of matches.
+    Rating and ACS are round-weighted over the maps played.
+    """
+    _ensure_db()
+    flush_match_writes()
+    start, end = form_window(since, until)
+    clauses = ["week >= ?", "week < ?", NOT_IGNORED_SQL]
+    params = [start, end]
+    _form_filters(players, "player", clauses, params)
+    _form_filters(tournament_names, "tournament", clauses, params)
+    group_sql = "player, team" if split_by_team else "player"
+    order_column = PLAYER_FORM_SORTS.get(sort, "rating")
+    limit = max(1, min(int(limit or 100), 1000))
+    with _get_conn() as conn, _with_archives(conn) as tables:
+        rows = conn.execute(
+            f"""
+            SELECT player, {"team" if split_by_team else "MAX(team)"} AS team,
+                   SUM(maps) AS maps, SUM(rounds) AS rounds,
+                   SUM(kills) AS k, SUM(deaths) AS d, SUM(assists) AS a,
+                   SUM(kills) - SUM(deaths) AS kd_diff, SUM(fk) AS fk, SUM(fd) AS fd,
+                   SUM(kills) * 1.0 / NULLIF(SUM(rounds), 0) AS kpr,
+                   SUM(acs_rounds) / NULLIF(SUM(acs_weight), 0) AS acs,
+                   SUM(rating_rounds) / NULLIF(SUM(rating_weight), 0) AS rating
+            FROM {tables['player_week_stats']}
+            WHERE {' AND '.join(clauses)}
+            GROUP BY {group_sql}
+            HAVING SUM(maps) >= ?
+            ORDER BY ({order_column} IS NULL), {order_column} DESC, player
+            LIMIT ?
+            """,
+            params + [max(1, int(min_maps or 1)), limit],
+        ).fetchall()
+    return [
+        {
+            "name": row["player"],
+            "teamName": row["team"] or "",
+            "maps": row["maps"],
+            "rounds": row["rounds"],
+            "rating": round(row["rating"], 2) if row["rating"] is not None else None,
+            "acs": round(row["acs"]) if row["acs"] is not None else None,
+            "kpr": round(row["kpr"], 2) if row["kpr"] is not None else None,
+            "k": row["k"],
+            "d": row["d"],
+            "a": row["a"],
+            "kd_diff": row["kd_diff"],
+            "fk": row["fk"],
+            "fd": row["fd"],
+            "fk_diff": row["fk"] - row["fd"],
+        }
+        for row in rows
+    ]
+
+def get_team_form(since, until=None, teams=None, tournament_names=None, limit=100, sort="map_winrate", min_maps=1):
+    """Team map/round records and round-weighted player averages over a date
+    window, summed from the weekly buckets (same week rounding as
+    get_player_form)."""
+    _ensure_db()
+    flush_match_writes()
+    start, end = form_window(since, until)
+    clauses = ["week >= ?", "week < ?", NOT_IGNORED_SQL]
+    params = [start, end]
+    _form_filters(teams, "team", clauses, params)
+    _form_filters(tournament_names, "tournament", clauses, params)
+    order_column = TEAM_FORM_SORTS.get(sort, "map_winrate")
+    limit = max(1, min(int(limit or 100), 1000))
+    with _get_conn() as conn, _with_archives(conn) as tables:
+        rows = conn.execute(
+            f"""
+            SELECT team, SUM(maps) AS maps, SUM(maps_won) AS maps_won,
+                   SUM(rounds) AS rounds, SUM(rounds_won) AS rounds_won,
+                   SUM(maps_won) * 1.0 / NULLIF(SUM(maps), 0) AS map_winrate,
+                   SUM(rounds_won) * 1.0 / NULLIF(SUM(rounds), 0) AS round_winrate,
+                   SUM(kills) AS k, SUM(deaths) AS d, SUM(kills) - SUM(deaths) AS kd_diff,
+                   SUM(acs_rounds) / NULLIF(SUM(acs_weight), 0) AS acs,
+                   SUM(rating_rounds) / NULLIF(SUM(rating_weight), 0) AS rating
+            FROM {tables['team_week_stats']}
+            WHERE {' AND '.join(clauses)}
+            GROUP BY team
+            HAVING SUM(maps) >= ?
+            ORDER BY ({order_column} IS NULL), {order_column} DESC, team
+            LIMIT ?
+            """,
+            params + [max(1, int(min_maps or 1)), limit],
+        ).fetchall()
+    return [
+        {
+            "team": row["team"],
+            "maps": row["maps"],
+            "maps_won": row["maps_won"],
+            "rounds": row["rounds"],
+            "rounds_won": row["rounds_won"],
+            "map_winrate": round(row["map_winrate"], 3) if row["map_winrate"] is not None else None,
+            "round_winrate": round(row["round_winrate"], 3) if row["round_winrate"] is not None else None,
+            "k": row["k"],
+            "d": row["d"],
+            "kd_diff": row["kd_diff"],
+            "acs": round(row["acs"]) if row["acs"] is not None else None,
+            "rating": round(row["rating"], 2) if row["rating"] is not None else None,
+        }
+        for row in rows
+    ]
+
+def _invalidate_standings(tournaments=None):
+    """Drop cached standings for `tournaments` (or all of them when None)."""
+    global _standings_generation
+    with _standings_cache_lock:
+        _standings_generation += 1
+        if tournaments is None:
+            _standings_cache.clear()
+        else:
+            for name in tournaments:
+                _standings_cache.pop(name or "", None)
+
+def _series_group(series):
+    """Group/bracket a series line belongs to ("Group A: Round 2" -> "Group A")."""
+    value = " ".join(str(series or "").split())
+    return value.split(":", 1)[0].strip() if value else ""
+
+def _compute_standings(conn, tournament):
+    matches = conn.execute(
+        """
+        SELECT id, team1, team2, team1_logo, team2_logo, score1, score2, series, tournament_logo
+        FROM matches
+        WHERE tournament = ? AND LOWER(status) = 'completed'
+        """,
+        (tournament,),
+    ).fetchall()
+    maps_by_match = {}
+    for row in conn.execute(
+        "SELECT match_id, score1, score2, winner FROM match_maps WHERE tournament = ? ORDER BY match_id, map_index",
+        (tournament,),
+    ):
+        maps_by_match.setdefault(row["match_id"], []).append(row)
+
+    tournament_logo = ""
+    team_logos = {}
+    overall = {}
+    groups = {}
+    matches_count = 0
+
+    def entry(table, name):
+        if name not in table:
+            table[name] = {"name": name, "w": 0, "l": 0, "mapW": 0, "mapL": 0, "roundW": 0, "roundL": 0}
+        return table[name]
+
+    for m in matches:
+        s1 = _stat_number(m["score1"], int)
+        s2 = _stat_number(m["score2"], int)
+        if s1 is None or s2 is None:
+            continue
+        matches_count += 1
+        tournament_logo = tournament_logo or (m["tournament_logo"] or "")
+        t1 = m["team1"] or "TBD"
+        t2 = m["team2"] or "TBD"
+        if m["team1_logo"] and t1 not in team_logos:
+            team_logos[t1] = m["team1_logo"]
+        if m["team2_logo"] and t2 not in team_logos:
+            team_logos[t2] = m["team2_logo"]
+
+        # Map wins per side (winner flag first, round score as fallback) and
+        # round totals. Without map rows, the series score stands in for maps.
+        maps_1 = maps_2 = rounds_1 = rounds_2 = 0
+        map_rows = maps_by_match.get(m["id"], [])
+        for mp in map_rows:
+            ms1 = mp["score1"] or 0
+            ms2 = mp["score2"] or 0
+            rounds_1 += ms1
+            rounds_2 += ms2
+            if mp["winner"] == 0 or (mp["winner"] is None and ms1 > ms2):
+                maps_1 += 1
+            elif mp["winner"] == 1 or (mp["winner"] is None and ms2 > ms1):
+                maps_2 += 1
+        if not map_rows:
+            maps_1, maps_2 = s1, s2
+
+        for table in (overall, groups.setdefault(_series_group(m["series"]), {})):
+            a = entry(table, t1)
+            b = entry(table, t2)
+            if s1 > s2:
+                a["w"] += 1
+                b["l"] += 1
+            elif s2 > s1:
+                b["w"] += 1
+                a["l"] += 1
+            a["mapW"] += maps_1
+            a["mapL"] += maps_2
+            b["mapW"] += maps_2
+            b["mapL"] += maps_1
+            a["roundW"] += rounds_1
+            a["roundL"] += rounds_2
+            b["roundW"] += rounds_2
+            b["roundL"] += rounds_1
+
+    def ranked(table):
+        teams = []
+        for team in table.values():
+            team["mapDiff"] = team["mapW"] - team["mapL"]
+            team["roundDiff"] = team["roundW"] - team["roundL"]
+            team["logo"] = team_logos.get(team["name"], "")
+            teams.append(team)
+        # Wins desc, series losses asc, map diff desc, round diff desc
+        teams.sort(key=lambda t: (-t["w"], t["l"], -t["mapDiff"], -t["roundDiff"], t["name"].casefold()))
+        return teams
+
+    return {
+        "tournament": tournament,
+        "tournament_logo": tournament_logo,
+        "matches_count": matches_count,
+        "teams": ranked(overall),
+        "groups": [
+            {"name": name, "teams": ranked(table)}
+            for name, table in sorted(groups.items())
+            if name
+        ],
+    }
+
+def get_tournament_standings(tournament_names):
+    """Standings (series W/L, map and round differential) per tournament.
+
+    Results are cached per tournament and recomputed only after a match of
+    that tournament is written, so repeated opens are dictionary lookups.
+    Tournaments without completed, scored matches are omitted.
+    """
+    _ensure_db()
+    flush_match_writes()
+    names = list(dict.fromkeys(str(t) for t in (tournament_names or []) if t))
+    results = {}
+    missing = []
+    with _standings_cache_lock:
+        generation = _standings_generation
+        for name in names:
+            if name in _standings_cache:
+                results[name] = _standings_cache[name]
+            else:
+                missing.append(name)
+    if missing:
+        with _get_conn() as conn:
+            computed = {name: _compute_standings(conn, name) for name in missing}
+        with _standings_cache_lock:
+            # Don't cache results that a concurrent write already made stale.
+            if generation == _standings_generation:
+                _standings_cache.update(computed)
+        results.update(computed)
+    return [results[name] for name in names if results[name]["matches_count"]]
+
+TEAM_HISTORY_COLUMNS = (
+    "id, href, date, time, team1, team2, score1, score2, tournament, series, "
+    "tournament_logo, eta, status, team1_logo, team2_logo, unix_timestamp, bst_time"
+)
+
+def _parse_history_cursor(cursor):
+    """Decode a "<unix_timestamp>:<match_id>" keyset cursor."""
+    ts, _, mid = str(cursor or "").partition(":")
+    if not mid or not ts.lstrip("-").isdigit():
+        return None
+    return int(ts), mid
+
+def get_team_history(team, statuses=None, since=None, until=None, tournament_names=None, cursor=None, limit=50):
+    """Return one page of a team's matches, newest first.
+
+    Each side of the match is read through its (teamN, unix_timestamp) index
+    and the two are merged, so only the requested page is ever materialized.
+    `cursor` is the `next_cursor` of the previous page (keyset pagination on
+    unix_timestamp, id). The first page also carries W/L/D totals over every
+    completed match that passes the same filters.
+    """
+    _ensure_db()
+    flush_match_writes()
+    team = " ".join(str(team or "").split())
+    if not team:
+        return {"team": "", "logo": "", "matches": [], "next_cursor": None, "summary": None}
+    try:
+        limit = max(1, min(int(limit), 200))
+    except (TypeError, ValueError):
+        limit = 50
+
+    filters = []
+    params = []
+    statuses = [str(st).casefold() for st in (statuses or []) if st]
+    if statuses:
+        filters.append(f"LOWER(status) IN ({','.join('?' for _ in statuses)})")
+        params.extend(statuses)
+    if since:
+        filters.append("unix_timestamp >= ?")
+        params.append(int(since))
+    if until:
+        filters.append("unix_timestamp <= ?")
+        params.append(int(until))
+    names = [str(t) for t in (tournament_names or []) if t]
+    if names:
+        filters.append(f"tournament IN ({','.join('?' for _ in names)})")
+        params.extend(names)
+    filters.append(NOT_IGNORED_SQL)
+    filter_sql = "".join(f" AND {f}" for f in filters)
+
+    page_filters = filter_sql
+    page_params = list(params)
+    position = _parse_history_cursor(cursor)
+    if position:
+        page_filters += " AND (unix_timestamp < ? OR (unix_timestamp = ? AND id < ?))"
+        page_params.extend([position[0], position[0], position[1]])
+
+    def sides(source, extra_sql, extra_params):
+        # Second branch skips team-vs-itself rows so nothing is listed twice.
+        sql = (
+            f"SELECT {TEAM_HISTORY_COLUMNS} FROM {source} WHERE team1 = ?{extra_sql} "
+            f"UNION ALL SELECT {TEAM_HISTORY_COLUMNS} FROM {source} WHERE team2 = ? AND team1 != ?{extra_sql}"
+        )
+        return sql, [team] + extra_params + [team, team] + extra_params
+
+    # History reaches archived seasons through the all_matches view.
+    with _get_conn() as conn, _with_archives(conn) as tables:
+        page_sql, page_args = sides(tables["matches"], page_filters, page_params)
+        rows = conn.execute(
+            f"SELECT * FROM ({page_sql}) ORDER BY unix_timestamp DESC, id DESC LIMIT ?",
+            page_args + [limit + 1],
+        ).fetchall()
+        summary = None
+        logo = ""
+        if not position:
+            all_sql, all_args = sides(tables["matches"], filter_sql, params)
+            totals = conn.execute(
+                f"""
+                SELECT
+                    SUM(CASE WHEN mine > theirs THEN 1 ELSE 0 END) AS wins,
+                    SUM(CASE WHEN mine < theirs THEN 1 ELSE 0 END) AS losses,
+                    SUM(CASE WHEN mine = theirs THEN 1 ELSE 0 END) AS draws
+                FROM (
+                    SELECT
+                        CAST(CASE WHEN team1 = ? THEN score1 ELSE score2 END AS INTEGER) AS mine,
+                        CAST(CASE WHEN team1 = ? THEN score2 ELSE score1 END AS INTEGER) AS theirs
+                    FROM ({all_sql})
+                    WHERE LOWER(status) = 'completed'
+                )
+                """,
+                [team, team] + all_args,
+            ).fetchone()
+            summary = {
+                "wins": int(totals["wins"] or 0),
+                "losses": int(totals["losses"] or 0),
+                "draws": int(totals["draws"] or 0),
+            }
+            # Teams whose every match is archived still have a logo.
+            logo_row = conn.execute(
+                f"SELECT team1_logo AS logo FROM {tables['matches']} WHERE team1 = ? AND COALESCE(team1_logo, '') != '' "
+                f"UNION ALL SELECT team2_logo FROM {tables['matches']} WHERE team2 = ? AND COALESCE(team2_logo, '') != '' "
+                "LIMIT 1",
+                (team, team),
+            ).fetchone()
+            logo = logo_row["logo"] if logo_row else ""
+
+    matches = [dict(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit and matches:
+        last = matches[-1]
+        next_cursor = f"{int(last['unix_timestamp'] or 0)}:{last['id']}"
+    return {"team": team, "logo": logo, "matches": matches, "next_cursor": next_cursor, "summary": summary}
+
+# Search: one search_entities row per team (by team id), tournament, series
+# (per tournament) and player (by profile link), indexed by the
+# external-content FTS5 table search_fts. Triggers on matches and
+# player_map_stats keep the entities current; rows moved to an archive
+# stay searchable because deletes do not remove entities.
+SEARCH_KINDS = ("team", "tournament", "series", "player")
+SEARCH_LIMIT = 20
+
+def _search_team_key(ref, side):
+    """Teams are keyed by team id; names no id was resolved for key on the name."""
+    return f"COALESCE({ref}.{side}_id, 'name:' || LOWER({ref}.{side}))"
+
+def _search_not_ignored(ref):
+    # Teams and players take their detail and recency only from rows of
+    # tournaments that are not ignored.
+    return f"COALESCE({ref}.tournament, '') NOT IN (SELECT tournament FROM ignored_tournaments)"
+
+def _search_upsert_sql(kind, ref, source=None):
+    """INSERT .. ON CONFLICT for one entity kind, reading `ref`'s columns.
+
+    Used by the triggers (ref NEW) and, with `source`, by the backfill
+    (every row of source in time order, so the newest row wins).
+    """
+    if kind == "player":
+        values = (
+            f"COALESCE(NULLIF({ref}.player_href, ''), 'name:' || LOWER({ref}.player)), {ref}.player, '', "
+            f"COALESCE({ref}.team, '')"
+        )
+        where = f"{ref}.map_key = 'all' AND COALESCE({ref}.player, '') != '' AND {_search_not_ignored(ref)}"
+    elif kind == "tournament":
+        values = (
+            f"{ref}.tournament, {ref}.tournament, "
+            f"COALESCE((SELECT group_concat(name, ' ') FROM event_aliases WHERE event_id = {ref}.event_id "
+            f"AND name != {ref}.tournament), ''), ''"
+        )
+        where = f"COALESCE({ref}.tournament, '') != ''"
+    elif kind == "series":
+        values = f"{ref}.tournament || char(31) || {ref}.series, {ref}.series, {ref}.tournament, {ref}.tournament"
+        where = f"COALESCE({ref}.series, '') != '' AND COALESCE({ref}.tournament, '') != ''"
+    else:
+        side = kind  # "team1" / "team2"
+        kind = "team"
+        values = (
+            f"{_search_team_key(ref, side)}, COALESCE((SELECT name FROM teams WHERE id = {ref}.{side}_id), {ref}.{side}), "
+            f"COALESCE((SELECT group_concat(name, ' ') FROM team_aliases WHERE team_id = {ref}.{side}_id), ''), "
+            f"COALESCE({ref}.tournament, '')"
+        )
+        where = f"COALESCE({ref}.{side}, '') != '' AND {_search_not_ignored(ref)}"
+    # Players keep their newest spelling; the other names are canonical.
+    name = (
+        "CASE WHEN excluded.last_ts >= search_entities.last_ts THEN excluded.name ELSE search_entities.name END"
+        if kind == "player" else "excluded.name"
+    )
+    return f"""
+        INSERT INTO search_entities (kind, key, name, aliases, detail, last_ts)
+        SELECT '{kind}', {values}, COALESCE({ref}.unix_timestamp, 0)
+        {f"FROM {source} AS {ref}" if source else ""}
+        WHERE {where}
+        {f"ORDER BY {ref}.unix_timestamp" if source else ""}
+        ON CONFLICT(kind, key) DO UPDATE SET
+            name={name},
+            aliases=excluded.aliases,
+            detail=CASE WHEN excluded.last_ts >= search_entities.last_ts THEN excluded.detail ELSE search_entities.detail END,
+            last_ts=MAX(search_entities.last_ts, excluded.last_ts);
+    """
+
+# Entities a renamed or re-identified match row leaves behind.
+_SEARCH_CLEANUP_SQL = "".join(
+    f"""
+    DELETE FROM search_entities WHERE kind = 'team' AND key = {_search_team_key("OLD", side)}
+        AND (OLD.{side}_id IS NOT NEW.{side}_id OR OLD.{side} IS NOT NEW.{side})
+        AND NOT EXISTS (SELECT 1 FROM matches WHERE team1_id = OLD.{side}_id)
+        AND NOT EXISTS (SELECT 1 FROM matches WHERE team2_id = OLD.{side}_id)
+        AND NOT EXISTS (SELECT 1 FROM matches WHERE OLD.{side}_id IS NULL AND team1 = OLD.{side} AND team1_id IS NULL)
+        AND NOT EXISTS (SELECT 1 FROM matches WHERE OLD.{side}_id IS NULL AND team2 = OLD.{side} AND team2_id IS NULL);"""
+    for side in ("team1", "team2")
+) + """
+    DELETE FROM search_entities WHERE kind = 'tournament' AND key = OLD.tournament
+        AND OLD.tournament IS NOT NEW.tournament
+        AND NOT EXISTS (SELECT 1 FROM matches WHERE tournament = OLD.tournament);
+    DELETE FROM search_entities WHERE kind = 'series' AND key = OLD.tournament || char(31) || OLD.series
+        AND (OLD.tournament IS NOT NEW.tournament OR OLD.series IS NOT NEW.series)
+        AND NOT EXISTS (SELECT 1 FROM matches WHERE tournament = OLD.tournament AND series = OLD.series);
+"""
+
+_SEARCH_MATCH_COLUMNS = ("team1", "team2", "team1_id", "team2_id", "tournament", "series", "event_id")
+
+def _search_triggers():
+    """{name: (event, body)} of the triggers that keep search_entities current."""
+    return {
+        "trg_search_entities_insert": (
+            "AFTER INSERT ON search_entities",
+            "INSERT INTO search_fts (rowid, name, aliases) VALUES (NEW.id, NEW.name, NEW.aliases);",
+        ),
+        "trg_search_entities_delete": (
+            "AFTER DELETE ON search_entities",
+            "INSERT INTO search_fts (search_fts, rowid, name, aliases) VALUES ('delete', OLD.id, OLD.name, OLD.aliases);",
+        ),
+        "trg_search_entities_update": (
+            "AFTER UPDATE OF name, aliases ON search_entities "
+            "WHEN NEW.name IS NOT OLD.name OR NEW.aliases IS NOT OLD.aliases",
+            "INSERT INTO search_fts (search_fts, rowid, name, aliases) VALUES ('delete', OLD.id, OLD.name, OLD.aliases);"
+            "INSERT INTO search_fts (rowid, name, aliases) VALUES (NEW.id, NEW.name, NEW.aliases);",
+        ),
+        "trg_matches_search_insert": (
+            "AFTER INSERT ON matches",
+            "".join(_search_upsert_sql(kind, "NEW") for kind in ("team1", "team2", "tournament", "series")),
+        ),
+        "trg_matches_search_update": (
+            f"AFTER UPDATE OF {', '.join(_SEARCH_MATCH_COLUMNS)} ON matches WHEN "
+            + " OR ".join(f"NEW.{c} IS NOT OLD.{c}" for c in _SEARCH_MATCH_COLUMNS),
+            _SEARCH_CLEANUP_SQL
+            + "".join(_search_upsert_sql(kind, "NEW") for kind in ("team1", "team2", "tournament", "series")),
+        ),
+        "trg_player_stats_search_insert": (
+            "AFTER INSERT ON player_map_stats",
+            _search_upsert_sql("player", "NEW"),
+        ),
+    }
+
+def _migrate_search_index(conn):
+    """Create search_entities + search_fts, their triggers, and fill them
+    from matches.db (step 26 adds the archives)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS search_entities (
+            id INTEGER PRIMARY KEY,
+            kind TEXT NOT NULL,
+            key TEXT NOT NULL,
+            name TEXT NOT NULL,
+            aliases TEXT NOT NULL DEFAULT '',
+            detail TEXT NOT NULL DEFAULT '',
+            last_ts INTEGER NOT NULL DEFAULT 0,
+            UNIQUE (kind, key)
+        )
+        """
+    )
+    conn.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5("
+        "name, aliases, content='search_entities', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='1 2 3')"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_event_aliases_event ON event_aliases(event_id)")
+    for name, (event, body) in _search_triggers().items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+    for kind in ("team1", "team2", "tournament", "series"):
+        conn.execute(_search_upsert_sql(kind, "m", "matches"))
+    conn.execute(_search_upsert_sql("player", "m", "player_map_stats"))
+
+def _migrate_search_index_archives(conn):
+    """Add the teams, tournaments, series and players of every archive to
+    the search index.
+
+    Replays the backfill over matches.db and the archives in time order, so
+    the newest row of an entity still wins.
+    """
+    if not _archive_paths():
+        return
+    with _with_archives(conn) as tables:
+        for kind in ("team1", "team2", "tournament", "series"):
+            conn.execute(_search_upsert_sql(kind, "m", tables["matches"]))
+        conn.execute(_search_upsert_sql("player", "m", tables["player_map_stats"]))
+
+def _rebuild_search_people(conn, tables, tournaments):
+    """Recompute the team and player entities seen in `tournaments`.
+
+    Run after they were ignored or un-ignored: each such entity is dropped
+    and rebuilt from all its rows in `tables` (see _with_archives), so it
+    keeps only detail and recency of tournaments that are not ignored, and
+    disappears when it was only seen in ignored ones.
+    """
+    names = sorted(set(tournaments))
+    if not names:
+        return
+    in_names = ",".join("?" for _ in names)
+    team_keys, team_ids, team_names = set(), set(), set()
+    for side in ("team1", "team2"):
+        for key, team_id, team in conn.execute(
+            f"SELECT DISTINCT {_search_team_key('m', side)}, m.{side}_id, m.{side} FROM {tables['matches']} AS m "
+            f"WHERE m.tournament IN ({in_names}) AND COALESCE(m.{side}, '') != ''",
+            names,
+        ):
+            team_keys.add(key)
+            if team_id:
+                team_ids.add(team_id)
+            else:
+                team_names.add(team)
+    players = sorted({
+        row[0]
+        for row in conn.execute(
+            f"SELECT DISTINCT player FROM {tables['player_map_stats']} "
+            f"WHERE tournament IN ({in_names}) AND map_key = 'all' AND COALESCE(player, '') != ''",
+            names,
+        )
+    })
+    if team_keys:
+        keys = sorted(team_keys)
+        conn.execute(f"DELETE FROM search_entities WHERE kind = 'team' AND key IN ({','.join('?' for _ in keys)})", keys)
+    for side in ("team1", "team2"):
+        for where, params in (
+            (f"{side}_id IN ({','.join('?' for _ in team_ids)})", sorted(team_ids)),
+            (f"{side}_id IS NULL AND {side} IN ({','.join('?' for _ in team_names)})", sorted(team_names)),
+        ):
+            if params:
+                conn.execute(_search_upsert_sql(side, "m", f"(SELECT * FROM {tables['matches']} WHERE {where})"), params)
+    if players:
+        source = f"(SELECT * FROM {tables['player_map_stats']} WHERE player IN ({','.join('?' for _ in players)}))"
+        conn.execute(
+            "DELETE FROM search_entities WHERE kind = 'player' AND key IN ("
+            f"SELECT COALESCE(NULLIF(m.player_href, ''), 'name:' || LOWER(m.player)) FROM {source} AS m)",
+            players,
+        )
+        conn.execute(_search_upsert_sql("player", "m", source), players)
+
+def _migrate_search_ignored_people(conn):
+    """Keep teams and players of ignored tournaments out of the search index.
+
+    Rebuilds the match and player stat triggers, whose team and player
+    upserts now skip rows of ignored tournaments, and recomputes the team
+    and player entities already taken from such rows.
+    """
+    names = [row[0] for row in conn.execute("SELECT tournament FROM ignored_tournaments")]
+    with _with_archives(conn) as tables:
+        triggers = _search_triggers()
+        for name in ("trg_matches_search_insert", "trg_matches_search_update", "trg_player_stats_search_insert"):
+            event, body = triggers[name]
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+            conn.execute(f"CREATE TRIGGER {name} {event} BEGIN {body} END")
+        _rebuild_search_people(conn, tables, names)
+
+def search_entities(query, kinds=None, limit=SEARCH_LIMIT):
+    """Prefix search over teams (and their aliases), tournaments, series and players.
+
+    Every word of `query` must prefix-match the name or the aliases. Exact
+    names rank first, then FTS5 bm25 (name weighted over aliases), then the
+    most recently played. Ignored tournaments and their series are left out,
+    and teams and players only count matches of other tournaments. Returns [{"kind", "key", "name", "detail", "last_ts"}].
+    """
+    terms = re.findall(r"\w+", str(query or "").casefold())[:8]
+    if not terms:
+        return []
+    kinds = [k for k in (kinds or SEARCH_KINDS) if k in SEARCH_KINDS] or list(SEARCH_KINDS)
+    limit = max(1, min(int(limit or SEARCH_LIMIT), 100))
+    _ensure_db()
+    flush_match_writes()
+    with _get_conn() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT e.kind, e.key, e.name, e.detail, e.last_ts
+            FROM search_fts JOIN search_entities e ON e.id = search_fts.rowid
+            WHERE search_fts MATCH ? AND e.kind IN ({','.join('?' for _ in kinds)})
+                AND NOT EXISTS (
+                    SELECT 1 FROM ignored_tournaments i
+                    WHERE i.tournament = CASE e.kind WHEN 'tournament' THEN e.key WHEN 'series' THEN e.detail END
+                )
+            ORDER BY e.name = ? COLLATE NOCASE DESC, bm25(search_fts, 4.0, 1.0), e.last_ts DESC
+            LIMIT ?
+            """,
+            [" ".join(f'"{term}"*' for term in terms), *kinds, " ".join(str(query).split()), limit],
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+# Players: one row per VLR player id with the latest name, earlier names
+# and the locally cached profile photo. Match detail fetches fill photos
+# from here and only request profiles whose photo is missing or older than
+# PLAYER_PHOTO_TTL (a profile without a photo is remembered as '').
+PLAYER_PHOTO_TTL = 30 * 86400
+
+def _player_id(href):
+    match = re.search(r"/player/(\d+)", str(href or ""))
+    return int(match.group(1)) if match else None
+
+def _local_photo(photo):
+    """True when `photo` is a file in the local image cache."""
+    photo = str(photo or "")
+    return photo.startswith("/static/images_cache/") and os.path.exists(
+        os.path.join(IMAGE_CACHE_DIR, photo.rsplit("/", 1)[-1])
+    )
+
+def _remember_players(conn, entries):
+    """Upsert (href, name, photo, unix_timestamp) sightings into players.
+
+    The newest sighting's name wins; earlier names become aliases. A local
+    photo found in a match payload is kept when the player has none.
+    """
+    latest = {}
+    for href, name, photo, ts in entries:
+        player_id = _player_id(href)
+        name = " ".join(str(name or "").split())
+        if not player_id or not name:
+            continue
+        seen = latest.setdefault(player_id, {"href": href, "names": {}, "photo": "", "ts": -1})
+        ts = int(ts or 0)
+        seen["names"][name] = max(seen["names"].get(name, -1), ts)
+        if ts >= seen["ts"]:
+            seen["ts"], seen["href"] = ts, href
+        if not seen["photo"] and str(photo or "").startswith("/static/images_cache/"):
+            seen["photo"] = photo
+    if not latest:
+        return
+    ids = list(latest)
+    stored = {}
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        for row in conn.execute(
+            f"SELECT * FROM players WHERE player_id IN ({','.join('?' for _ in chunk)})", chunk
+        ):
+            stored[row["player_id"]] = row
+    rows = []
+    for player_id, seen in latest.items():
+        old = stored.get(player_id)
+        names = dict(seen["names"])
+        if old:
+            names.setdefault(old["name"], old["last_seen"] or 0)
+            for alias in _json_loads(old["aliases"], []):
+                names.setdefault(alias, -1)
+        name = max(names, key=lambda n: names[n])
+        newest = old is None or seen["ts"] >= (old["last_seen"] or 0)
+        rows.append((
+            player_id,
+            seen["href"] if newest else old["href"],
+            name,
+            json.dumps(sorted(n for n in names if n != name), ensure_ascii=False),
+            (old["photo"] if old and old["photo"] else seen["photo"]),
+            max(seen["ts"], (old["last_seen"] or 0) if old else 0),
+        ))
+    conn.executemany(
+        """
+        INSERT INTO players (player_id, href, name, aliases, photo, last_seen) VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(player_id) DO UPDATE SET
+            href=excluded.href, name=excluded.name, aliases=excluded.aliases,
+            photo=excluded.photo, last_seen=excluded.last_seen
+        """,
+        rows,
+    )
+
+def _migrate_players(conn):
+    """Create players and fill it from every stat row in matches.db (step 28
+    adds the archives).
+
+    Photos already stored with match stats count as fetched now, so the TTL
+    starts with this migration instead of refetching every profile.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS players (
+            player_id INTEGER PRIMARY KEY,
+            href TEXT NOT NULL,
+            name TEXT NOT NULL,
+            aliases TEXT NOT NULL DEFAULT '[]',
+            photo TEXT NOT NULL DEFAULT '',
+            photo_fetched_at INTEGER,
+            last_seen INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_players_name ON players(name)")
+    _seed_players(conn, "player_map_stats")
+
+def _migrate_players_archives(conn):
+    """Add the players of every archive to players."""
+    if not _archive_paths():
+        return
+    with _with_archives(conn) as tables:
+        _seed_players(conn, tables["player_map_stats"])
+
+def _seed_players(conn, source):
+    entries = conn.execute(
+        f"SELECT player_href, player, photo, unix_timestamp FROM {source} "
+        "WHERE map_key = 'all' AND COALESCE(player_href, '') != ''"
+    ).fetchall()
+    _remember_players(conn, [tuple(row) for row in entries])
+    conn.execute(
+        "UPDATE players SET photo_fetched_at = ? WHERE photo != '' AND photo_fetched_at IS NULL",
+        (int(time.time()),),
+    )
+
+def get_cached_player_photos(hrefs, max_age=PLAYER_PHOTO_TTL):
+    """{href: photo} for players whose photo was fetched within `max_age`
+    seconds ('' = the profile has no photo) and whose file is still cached."""
+    by_id = {}
+    for href in hrefs:
+        player_id = _player_id(href)
+        if player_id:
+            by_id.setdefault(player_id, []).append(href)
+    if not by_id:
+        return {}
+    _ensure_db()
+    cutoff = int(time.time()) - int(max_age)
+    found = {}
+    ids = list(by_id)
+    with _get_conn() as conn:
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            for row in conn.execute(
+                f"SELECT player_id, photo FROM players WHERE player_id IN ({','.join('?' for _ in chunk)}) "
+                "AND photo_fetched_at >= ?",
+                [*chunk, cutoff],
+            ):
+                if row["photo"] == "" or _local_photo(row["photo"]):
+                    for href in by_id[row["player_id"]]:
+                        found[href] = row["photo"]
+    return found
+
+def record_player_photos(photos, names=None):
+    """Store freshly fetched profile photos ({href: local photo or ''}).
+
+    `names` ({href: name}) adds players not stored yet; a None photo (the
+    profile could not be fetched) is skipped so it is retried next time.
+    """
+    now = int(time.time())
+    rows = []
+    for href, photo in photos.items():
+        player_id = _player_id(href)
+        if player_id and photo is not None:
+            rows.append((photo, now, player_id))
+    if not rows:
+        return
+    _ensure_db()
     with _get_conn() as conn:
-        rows = conn.execute(query, params_with_ts).fetchall()
-    return [
-        {
-            "tournament": row["tournament"],
-            "tournament_logo": row["tournament_logo"] or "",
-            "first_match": int(row["first_match"] or 0),
-            "fully_loaded": int(row["missing_stats"] or 0) == 0,
-        }
-        for row in rows
-        if row["tournament"]
-    ]
+        _remember_players(conn, [(href, (names or {}).get(href), "", 0) for href in photos])
+        conn.executemany("UPDATE players SET photo = ?, photo_fetched_at = ? WHERE player_id = ?", rows)
 
 def download_image(url):
     if not url:
@@ -693,8 +3697,10 @@ def fetch_match_metadata_page(href):
             return None
 
         logos = []
+        team_ids = []
         for class_name in ("mod-1", "mod-2"):
             link = header.find("a", class_=class_name)
+            team_ids.append(_team_id_from_href(link.get("href")) if link else "")
             img = link.find("img") if link else None
             logo = (img.get("src") or img.get("data-src") or "") if img else ""
             if logo.startswith("//"):
@@ -708,11 +3714,15 @@ def fetch_match_metadata_page(href):
 
         moment = header.find(class_="moment-tz-convert") or soup.find(class_="moment-tz-convert")
         unix_timestamp, bst_time = _parse_vlr_timestamp(moment.get("data-utc-ts") if moment else "")
+        event_link = soup.find("a", class_="match-header-event")
         return {
             "team1_logo": logos[0] if len(logos) > 0 else "",
             "team2_logo": logos[1] if len(logos) > 1 else "",
+            "team1_id": team_ids[0],
+            "team2_id": team_ids[1],
             "unix_timestamp": unix_timestamp,
             "bst_time": bst_time,
+            "event_id": _event_id_from_href(event_link.get("href")) if event_link else None,
         }
     except Exception as e:
         print(f"Error fetching match metadata {url}: {e}")
@@ -731,10 +3741,17 @@ def fetch_match_detail_page(href, include_player_photos=True):
         
         team1_logo = ""
         team2_logo = ""
+        team1_id = ""
+        team2_id = ""
+        event_link = soup.find("a", class_="match-header-event")
+        event_id = _event_id_from_href(event_link.get("href")) if event_link else None
         
         match_header = soup.find("div", class_="match-header")
         if match_header:
             t1_link = match_header.find("a", class_="mod-1")
+            t2_link = match_header.find("a", class_="mod-2")
+            team1_id = _team_id_from_href(t1_link.get("href")) if t1_link else ""
+            team2_id = _team_id_from_href(t2_link.get("href")) if t2_link else ""
             if t1_link:
                 img = t1_link.find("img")
                 if img:
@@ -742,7 +3759,6 @@ def fetch_match_detail_page(href, include_player_photos=True):
                     if team1_logo.startswith("//"):
                         team1_logo = "https:" + team1_logo
                         
-            t2_link = match_header.find("a", class_="mod-2")
             if t2_link:
                 img = t2_link.find("img")
                 if img:
@@ -794,13 +3810,19 @@ def fetch_match_detail_page(href, include_player_photos=True):
         map_index = 0
 
         def fetch_player_photo(player_href):
-            """Fetch and cache a player's profile photo. Returns local URL or ''."""
+            """Fetch and cache a player's profile photo.
+
+            Returns the local URL, '' when the profile has no photo, or None
+            when the profile or image could not be fetched.
+            """
             if not player_href:
                 return ""
             try:
                 r = requests.get(f"https://www.vlr.gg{player_href}", headers=HEADERS, timeout=8)
-                if r.status_code != 200:
+                if r.status_code == 404:
                     return ""
+                if r.status_code != 200:
+                    return None
                 ps = BeautifulSoup(r.text, "html.parser")
                 avatar = ps.find("div", class_="wf-avatar")
                 if not avatar:
@@ -811,9 +3833,12 @@ def fetch_match_detail_page(href, include_player_photos=True):
                 src = img.get("src", "")
                 if src.startswith("//"): src = "https:" + src
                 elif src.startswith("/"): src = "https://www.vlr.gg" + src
-                return download_image(src) if src else ""
+                if not src:
+                    return ""
+                local = download_image(src)
+                return local if local.startswith("/static/images_cache/") else None
             except Exception:
-                return ""
+                return None
 
         def parse_player_tables(game_div):
             result = {"team1": [], "team2": []}
@@ -1015,19 +4040,40 @@ def fetch_match_detail_page(href, include_player_photos=True):
                     if p["href"] and not p.get("photo"):
                         unique_players.setdefault(p["href"], []).append(p)
 
+        # Known players get their stored photo; only missing or expired ones
+        # are fetched from their profile page
+        cached_photos = {}
+        if unique_players:
+            try:
+                cached_photos = get_cached_player_photos(unique_players)
+            except Exception as e:
+                print(f"Could not read cached player photos: {e}")
+            for href, photo in cached_photos.items():
+                for p in unique_players[href]:
+                    p["photo"] = photo
+        missing = [href for href in unique_players if href not in cached_photos]
+
         # Fetch photos in parallel (max 2 workers to avoid hammering vlr.gg)
-        if unique_players and include_player_photos:
+        if missing and include_player_photos:
+            fetched_photos = {}
             with ThreadPoolExecutor(max_workers=2) as executor:
                 future_to_href = {executor.submit(fetch_player_photo, href): href
-                                  for href in unique_players}
+                                  for href in missing}
                 for future in as_completed(future_to_href):
                     href = future_to_href[future]
                     try:
                         photo = future.result()
+                        fetched_photos[href] = photo
                         for p in unique_players[href]:
-                            p["photo"] = photo
+                            p["photo"] = photo or ""
                     except Exception:
                         pass
+            try:
+                record_player_photos(
+                    fetched_photos, names={href: unique_players[href][0].get("name") for href in fetched_photos}
+                )
+            except Exception as e:
+                print(f"Could not store player photos: {e}")
 
         # Parse overall scores from match header
         overall_score1 = ""
@@ -1077,6 +4123,9 @@ def fetch_match_detail_page(href, include_player_photos=True):
         return {
             "team1_logo": local_team1_logo,
             "team2_logo": local_team2_logo,
+            "team1_id": team1_id,
+            "team2_id": team2_id,
+            "event_id": event_id,
             "unix_timestamp": unix_timestamp,
             "bst_time": bst_time_str,
             "maps": maps,
@@ -1117,22 +4166,7 @@ def fetch_details_in_background(scraped_matches):
             
             has_details = t1_logo and t2_logo and unix_ts
             files_exist = file_exists(t1_logo) and file_exists(t2_logo)
-            existing_players = current.get("players", {})
-            old_format = isinstance(existing_players, dict) and ("team1" in existing_players or "team2" in existing_players) and "all" not in existing_players and "0" not in existing_players
-            missing_all = isinstance(existing_players, dict) and "all" not in existing_players
-            missing_photos = any(
-                not p.get("photo")
-                for map_data in existing_players.values() if isinstance(map_data, dict)
-                for team in ("team1", "team2")
-                for p in map_data.get(team, [])
-            )
-            missing_new_stats = any(
-                "kd_diff" not in p
-                for map_data in existing_players.values() if isinstance(map_data, dict)
-                for team in ("team1", "team2")
-                for p in map_data.get(team, [])
-            )
-            has_stats = has_complete_match_stats(current) and not old_format and not missing_all and not missing_new_stats
+            has_stats = not match_needs_detail_refresh(current, include_photos=False)
 
             if not has_details or not files_exist or not has_stats:
                 pending_ids.append((mid, m["href"]))
@@ -1161,6 +4195,7 @@ def fetch_details_in_background(scraped_matches):
                     current["id"] = mid
                     current["last_updated"] = int(datetime.now().timestamp())
                     upsert_match(current)
+                flush_match_writes()
         print("Background details thread finished.")
     finally:
         details_lock.release()
@@ -1296,64 +4331,80 @@ def _fetch_page(url, timeout=10):
         return None
 
 
-def _upsert_matches_to_db(scraped_matches):
-    """Insert or update scraped matches into SQLite."""
-    
-    # Download tournament logos locally
-    for m in scraped_matches:
-        if m["tournament_logo"]:
-            m["tournament_logo"] = download_image(m["tournament_logo"])
+# Listing fields as scraped from /matches, /matches/results and event pages
+# (the last ones can also carry header metadata). Their hash is stored per
+# row so a sync only rewrites matches whose listing changed.
+LISTING_HASH_FIELDS = (
+    "href", "date", "time", "team1", "team2", "score1", "score2",
+    "tournament", "series", "tournament_logo", "eta", "status",
+    "team1_logo", "team2_logo", "team1_id", "team2_id", "unix_timestamp", "bst_time",
+)
 
-    # Load ignore list
-    ignore_names = _load_ignore_names()
+def _listing_hash(match):
+    values = [str(match.get(field) or "") for field in LISTING_HASH_FIELDS]
+    return hashlib.sha1("\x1f".join(values).encode("utf-8")).hexdigest()
 
-    main_rows = []
-    ignored_rows = []
-    now_ts = int(datetime.now().timestamp())
+def _upsert_matches_to_db(scraped_matches):
+    """Insert or update scraped matches into SQLite.
+
+    Matches whose listing hash equals the stored one are skipped entirely
+    (no write, no last_updated bump) unless they bring a new event id; so
+    are archived matches. Returns a dict with the inserted, changed,
+    unchanged and archived counts.
+    """
+    # The same match can appear on two pages; the last copy wins.
+    by_id = {}
     for m in scraped_matches:
-        row = {
-            "id": m["id"],
-            "href": m["href"],
-            "date": m.get("date", ""),
-            "time": m.get("time", ""),
-            "team1": m.get("team1", ""),
-            "team2": m.get("team2", ""),
-            "score1": m.get("score1", ""),
-            "score2": m.get("score2", ""),
-            "tournament": m.get("tournament", ""),
-            "series": m.get("series", ""),
-            "tournament_logo": m.get("tournament_logo", ""),
-            "eta": m.get("eta", ""),
-            "status": m.get("status", ""),
-            "team1_logo": m.get("team1_logo", ""),
-            "team2_logo": m.get("team2_logo", ""),
-            "unix_timestamp": int(m.get("unix_timestamp") or 0),
-            "bst_time": m.get("bst_time", ""),
-            "maps_json": _json_dumps([]),
-            "players_json": _json_dumps({}),
-            "last_updated": now_ts,
-        }
-        if m.get("tournament") in ignore_names:
-            ignored_rows.append(row)
-        else:
-            main_rows.append(row)
+        if m.get("id"):
+            by_id[str(m["id"])] = dict(m, listing_hash=_listing_hash(m))
 
     _ensure_db()
-    if main_rows:
-        with _get_conn() as conn:
-            _bulk_upsert_rows(conn, main_rows)
-            conn.commit()
+    flush_match_writes()
+    stored = {}
+    ids = list(by_id)
+    with _get_conn() as conn:
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            stored.update(
+                (row[0], (row[1], row[2]))
+                for row in conn.execute(
+                    f"SELECT id, listing_hash, event_id FROM matches WHERE id IN ({','.join('?' for _ in chunk)})",
+                    chunk,
+                )
+            )
+        archived = _archived_match_ids(conn, [dict(m, id=mid) for mid, m in by_id.items()])
+    counts = {"inserted": 0, "changed": 0, "unchanged": 0, "archived": len(archived)}
+    pending = []
+    for mid, m in by_id.items():
+        if mid in archived:
+            continue
+        if mid not in stored:
+            counts["inserted"] += 1
+        elif stored[mid][0] != m["listing_hash"] or _event_id(m.get("event_id")) not in (None, stored[mid][1]):
+            counts["changed"] += 1
+        else:
+            counts["unchanged"] += 1
+            continue
+        pending.append(m)
 
-    if ignored_rows:
-        _ensure_ignored_db()
-        with sqlite3.connect(IGNORED_DB_PATH, timeout=30) as conn:
-            # _bulk_upsert_rows reads existing rows by column name. Keep the
-            # ignored database connection consistent with _get_conn().
-            conn.row_factory = sqlite3.Row
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")
-            _bulk_upsert_rows(conn, ignored_rows)
+    # Download tournament logos locally (only for rows that are written)
+    for m in pending:
+        if m.get("tournament_logo"):
+            m["tournament_logo"] = download_image(m["tournament_logo"])
+
+    # Matches of ignored tournaments are stored like any other; readers hide
+    # them through ignored_tournaments.
+    now_ts = int(datetime.now().timestamp())
+    rows = [_match_to_row_dict(dict(m, last_updated=now_ts)) for m in pending]
+    if rows:
+        with _get_conn() as conn:
+            _bulk_upsert_rows(conn, rows)
             conn.commit()
+    print(
+        f"Listing sync: {counts['inserted']} inserted, {counts['changed']} changed, "
+        f"{counts['unchanged']} unchanged" + (f", {counts['archived']} archived" if counts["archived"] else "")
+    )
+    return counts
 
 
 RESULTS_PAGES = 5  # Default number of result pages to fetch (each page ~20 matches)
@@ -1409,11 +4460,13 @@ def fetch_and_update_matches(pages=None, start_page=1, end_page=None):
         sync_lock.release()
 
 def get_matches_for_display(tournament_names=None, exclude_tournaments=None, include_stats=False):
-    # Older imports may already contain both an abbreviation and full name.
-    # Repair them before any UI payload is built so Team History, standings,
-    # and all other consumers see one identity.
-    backfill_team_name_aliases()
-    matches_list = load_matches(tournament_names=tournament_names, exclude_tournaments=exclude_tournaments)
+    # Team names are canonicalized at write time (teams / team_aliases), so
+    # Team History, standings and other consumers already see one identity.
+    matches_list = load_matches(
+        tournament_names=tournament_names,
+        exclude_tournaments=exclude_tournaments,
+        include_payload=include_stats,
+    )
     
     # Sort: Live matches first, then Upcoming matches (by unix_timestamp asc), then Completed matches (by unix_timestamp desc).
     def sort_key(m):
@@ -1447,21 +4500,163 @@ def get_matches_for_display(tournament_names=None, exclude_tournaments=None, inc
 
         # List responses don't need the heavy per-map player stats (they can be
         # several MB across all matches) — the detail modal and on-demand panels
-        # (leaderboard / standings / team history) fetch them separately. Replace
-        # them with a cheap has_stats flag so the "stats loaded" badges still
-        # work. Matches the load_tournament_overview / load_missing_stats
-        # definition: stats exist when maps + an "all" key do.
+        # (leaderboard / standings / team history) fetch them separately. They
+        # are not even read from the DB; the stored state columns give the
+        # "stats loaded" badges the same answer as has_complete_match_stats.
         if not include_stats:
-            m["has_stats"] = has_complete_match_stats(m)
-            m["has_details"] = has_complete_match_data(m)
+            m["has_stats"] = match_has_stats(m)
+            m["has_details"] = m["has_stats"] and bool(m.get("details_state"))
             m.pop("maps", None)
             m.pop("players", None)
 
     return matches_list
 
 
-def load_missing_stats(delay=1.5):
-    """Find completed/live matches that are missing stats, and load details.
+# Same predicate as has_complete_match_stats, read from the stored
+# stats_state (an "all" key alone is not enough: VLR can return an empty
+# player table while scores/maps are already live). Live matches are never
+# complete.
+# The partial index idx_matches_stats_due is declared with
+# MISSING_STATS_SQL verbatim.
+MISSING_STATS_SQL = f"(LOWER(status) = 'live' OR (LOWER(status) = 'completed' AND stats_state < {STATS_COMPLETE}))"
+# Due matches only, live first, then the least-tried and most recent.
+MISSING_STATS_QUERY = (
+    f"SELECT id, href FROM matches WHERE {MISSING_STATS_SQL} AND next_attempt_at <= ? AND {NOT_IGNORED_SQL} "
+    "ORDER BY LOWER(status) = 'live' DESC, attempt_count, unix_timestamp DESC LIMIT ?"
+)
+
+# Retry schedule for matches whose stats are not published yet. Each
+# unsuccessful fetch of a completed match doubles the wait (from
+# STATS_RETRY_BASE_DELAY up to STATS_RETRY_MAX_DELAY); after
+# STATS_RETRY_MAX_ATTEMPTS the match is given up (forfeits, matches VLR never
+# publishes stats for) until its status changes or it is refreshed by hand.
+# Live matches are retried every STATS_RETRY_LIVE_DELAY without counting.
+STATS_RETRY_BASE_DELAY = 10 * 60
+STATS_RETRY_MAX_DELAY = 24 * 60 * 60
+STATS_RETRY_MAX_ATTEMPTS = 8
+STATS_RETRY_LIVE_DELAY = 5 * 60
+STATS_RETRY_NEVER = 253402300799  # 9999-12-31: given up
+STATS_SWEEP_LIMIT = 30
+
+def record_stats_attempt(match, fetched=True):
+    """Update a match's retry schedule after a detail fetch.
+
+    `match` is the match as stored after the fetch (status and stats).
+    Complete stats clear the schedule; a failed fetch or a page without
+    stats counts one attempt. Returns the next attempt time (0 when done).
+    """
+    status = str(match.get("status") or "").lower()
+    mid = str(match.get("id") or "")
+    if not mid or status not in ("completed", "live"):
+        return 0
+    now = int(time.time())
+    flush_match_writes(mid)
+    _ensure_db()
+    with _get_conn() as conn:
+        row = conn.execute("SELECT attempt_count FROM matches WHERE id = ?", (mid,)).fetchone()
+        if row is None:
+            return 0
+        attempts = row["attempt_count"] or 0
+        if status == "live":
+            error = None if fetched else "fetch failed"
+            next_at = now + STATS_RETRY_LIVE_DELAY
+        elif fetched and has_complete_match_stats(match):
+            error, attempts, next_at = None, 0, 0
+        else:
+            error = "no stats published" if fetched else "fetch failed"
+            attempts += 1
+            if attempts >= STATS_RETRY_MAX_ATTEMPTS:
+                next_at = STATS_RETRY_NEVER
+            else:
+                next_at = now + min(STATS_RETRY_BASE_DELAY * 2 ** (attempts - 1), STATS_RETRY_MAX_DELAY)
+        conn.execute(
+            "UPDATE matches SET attempt_count = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+            (attempts, next_at, error, mid),
+        )
+    return next_at
+
+# Serializes archive_old_tournaments with backup_databases.
+_archive_lock = threading.Lock()
+
+def archive_old_tournaments(max_age_days=None):
+    """Move old completed tournaments from matches.db to per-year archives.
+
+    A tournament is archived once every match in it is completed and its
+    last match is older than max_age_days (ARCHIVE_AFTER_DAYS by default).
+    Its matches and stat rows go to archive/matches_<year>.db (the year of
+    its last match) in one transaction per year. Returns the archived
+    tournament names.
+    """
+    if max_age_days is None:
+        max_age_days = ARCHIVE_AFTER_DAYS
+    cutoff = int(time.time()) - int(max_age_days) * 86400
+    _ensure_db()
+    flush_match_writes()
+    # Held for the whole move so a backup never copies matches.db and the
+    # archives on either side of it.
+    with _archive_lock:
+        with _get_conn() as conn:
+            rows = conn.execute(
+                """
+                SELECT s.tournament, s.match_count,
+                    (SELECT MAX(m.unix_timestamp) FROM matches m WHERE m.tournament = s.tournament) AS last_match
+                FROM tournament_summary s
+                WHERE s.tournament != '' AND s.completed_count = s.match_count
+                """
+            ).fetchall()
+        by_year = {}
+        for row in rows:
+            last_match = int(row["last_match"] or 0)
+            if 0 < last_match < cutoff:
+                year = datetime.fromtimestamp(last_match, tz=timezone.utc).year
+                by_year.setdefault(year, []).append((row["tournament"], row["match_count"]))
+        if not by_year:
+            return []
+
+        os.makedirs(ARCHIVE_DIR, exist_ok=True)
+        archived = []
+        now = int(time.time())
+        for year, entries in sorted(by_year.items()):
+            names = [name for name, _ in entries]
+            placeholders = ",".join("?" for _ in names)
+            alias = f"archive_{year}"
+            with _get_conn() as conn, _attached(conn, _archive_path(year), alias):
+                _ensure_archive_schema(conn, alias)
+                match_ids = f"SELECT id FROM main.matches WHERE tournament IN ({placeholders})"
+                conn.execute(f"INSERT OR REPLACE INTO archived_matches (id, year) SELECT id, ? FROM ({match_ids})", [year, *names])
+                for table, where in (
+                    ("match_maps", f"match_id IN ({match_ids})"),
+                    ("player_map_stats", f"match_id IN ({match_ids})"),
+                    ("player_aggregates", f"tournament IN ({placeholders})"),
+                    ("player_week_stats", f"tournament IN ({placeholders})"),
+                    ("team_week_stats", f"tournament IN ({placeholders})"),
+                    ("matches", f"tournament IN ({placeholders})"),
+                ):
+                    columns = ", ".join(_table_columns(conn, table))
+                    conn.execute(
+                        f"INSERT OR REPLACE INTO {alias}.{table} ({columns}) SELECT {columns} FROM main.{table} WHERE {where}",
+                        names,
+                    )
+                    conn.execute(f"DELETE FROM main.{table} WHERE {where}", names)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO archived_tournaments (tournament, year, match_count, archived_at) VALUES (?, ?, ?, ?)",
+                    [(name, year, count, now) for name, count in entries],
+                )
+            print(f"Archived {len(names)} tournaments to {os.path.basename(_archive_path(year))}")
+            archived.extend(names)
+
+    global _cached_matches
+    with _cache_lock:
+        _cached_matches = None
+    _invalidate_standings(archived)
+    return archived
+
+def load_missing_stats(delay=1.5, limit=None):
+    """Load details for the completed/live matches whose stats retry is due.
+
+    Takes at most `limit` (STATS_SWEEP_LIMIT) due matches in priority order
+    and records every attempt (see record_stats_attempt), so matches VLR has
+    not published stats for are retried with backoff instead of every run.
 
     Fetches ONE match at a time with a small delay between requests instead of
     fetching many in parallel. Fetching everything at once made vlr.gg rate-limit
@@ -1470,38 +4665,36 @@ def load_missing_stats(delay=1.5):
     it again later.
     """
     _ensure_db()
-    # Query completed matches and apply the same complete-stats predicate used
-    # by the API/UI. Checking only for an "all" JSON key is not enough because
-    # VLR can return an empty player table while scores/maps are already live.
-    query = "SELECT id, href, status, maps_json, players_json FROM matches WHERE LOWER(status) IN ('completed', 'live')"
+    flush_match_writes()
     with _get_conn() as conn:
-        rows = conn.execute(query).fetchall()
+        rows = conn.execute(
+            MISSING_STATS_QUERY, (int(time.time()), max(1, int(limit or STATS_SWEEP_LIMIT)))
+        ).fetchall()
 
-    pending = [
-        (row["id"], row["href"])
-        for row in rows
-        if row["href"] and not has_complete_match_stats({
-            "status": row["status"],
-            "maps": _json_loads(row["maps_json"], []),
-            "players": _json_loads(row["players_json"], {}),
-        })
-    ]
+    pending = [(row["id"], row["href"]) for row in rows if row["href"]]
 
     if not pending:
-        print("No completed/live matches missing stats.")
+        print("No completed/live matches due for a stats retry.")
         return
         
     print(f"Loading missing stats for {len(pending)} completed/live matches...")
-    results = {}
     consecutive_failures = 0
     for mid, href in pending:
         details = fetch_match_detail_page(href)
+        current = load_match(mid) or {"id": mid}
         if details:
-            results[mid] = details
-            print(f"Loaded missing stats for match {mid}")
+            current.update(details)
+            current["id"] = mid
+            current["last_updated"] = int(datetime.now().timestamp())
+            upsert_match(current)
+            if record_stats_attempt(current):
+                print(f"No stats yet for match {mid}; retry scheduled")
+            else:
+                print(f"Loaded missing stats for match {mid}")
             consecutive_failures = 0
             time.sleep(delay)
         else:
+            record_stats_attempt(current, fetched=False)
             consecutive_failures += 1
             print(f"Failed to load missing stats for match {mid} (consecutive failures: {consecutive_failures})")
             if consecutive_failures >= 3:
@@ -1509,21 +4702,7 @@ def load_missing_stats(delay=1.5):
                 break
             # Back off longer after a failure to give vlr.gg time to recover
             time.sleep(delay * 3)
-
-    if results:
-        with _get_conn() as conn:
-            for mid, details in results.items():
-                current = load_match(mid) or {"id": mid}
-                current.update(details)
-                current["id"] = mid
-                current["last_updated"] = int(datetime.now().timestamp())
-                row_dict = _match_to_row_dict(current)
-                if row_dict:
-                    _bulk_upsert_rows(conn, [row_dict])
-            conn.commit()
-        global _cached_matches
-        with _cache_lock:
-            _cached_matches = None
+    flush_match_writes()
 
 
 # ============================================================================
@@ -1686,76 +4865,252 @@ def _parse_tournament_items(soup):
     return tournaments
 
 
-def get_tournaments(refresh=False, pages=1):
-    """Return a dict with the VLR.gg tournament list and fetch metadata.
+TOURNAMENT_CATALOG_PAGE_SIZE = 50
+TOURNAMENT_CATALOG_MAX_PAGE_SIZE = 200
+
+_CATALOG_MONTHS = {m: i for i, m in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1
+)}
+
+
+def _catalog_dates(text, status="", now=None):
+    """Best-effort ("YYYY-MM-DD" | None, "YYYY-MM-DD" | None) from an /events date.
+
+    The listing prints "Mar 14—Apr 12" without a year, so a missing year
+    is taken from the status: completed events lie in the past, upcoming
+    ones in the future, ongoing ones around now. "TBD" ends stay None.
+    """
+    now = datetime.fromtimestamp(now or time.time())
+    found = []
+    for month, day, year in re.findall(r"\b([A-Za-z]{3})[a-z]*\.?\s+(\d{1,2})(?:,?\s+(\d{4}))?", str(text or "")):
+        if month.lower() in _CATALOG_MONTHS:
+            found.append((_CATALOG_MONTHS[month.lower()], int(day), int(year) if year else None))
+    dates = []
+    for month, day, year in found[:2]:
+        if year is None:
+            year = now.year
+            if dates:
+                # An end before its start wraps into the next year
+                year = dates[0].year + ((month, day) < (dates[0].month, dates[0].day))
+            else:
+                guess = datetime(year, month, 1)
+                state = str(status or "").lower()
+                if state == "completed" and guess > now:
+                    year -= 1
+                elif state == "upcoming" and (now - guess).days > 31:
+                    year += 1
+        try:
+            dates.append(datetime(year, month, day))
+        except ValueError:
+            break
+    start = dates[0].strftime("%Y-%m-%d") if dates else None
+    end = dates[1].strftime("%Y-%m-%d") if len(dates) > 1 else None
+    return start, end
+
+
+def _migrate_tournament_catalog(conn):
+    """Create tournament_catalog (+ FTS on name) and import tournaments_cache.json.
+
+    The JSON file is left on disk untouched.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tournament_catalog (
+            event_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            href TEXT NOT NULL DEFAULT '',
+            logo TEXT NOT NULL DEFAULT '',
+            region TEXT NOT NULL DEFAULT '',
+            description TEXT NOT NULL DEFAULT '',
+            status TEXT NOT NULL DEFAULT '',
+            dates TEXT NOT NULL DEFAULT '',
+            start_date TEXT,
+            end_date TEXT,
+            position INTEGER NOT NULL,
+            page INTEGER,
+            fetched_at INTEGER
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tournament_catalog_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            fetched_at INTEGER NOT NULL DEFAULT 0,
+            pages INTEGER NOT NULL DEFAULT 0,
+            total_pages INTEGER
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_catalog_position ON tournament_catalog(position)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_catalog_region ON tournament_catalog(region, position)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_catalog_status ON tournament_catalog(status, position)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_catalog_name ON tournament_catalog(name)")
+    conn.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS tournament_catalog_fts USING fts5("
+        "name, content='tournament_catalog', content_rowid='event_id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='1 2 3')"
+    )
+    triggers = {
+        "trg_catalog_fts_insert": (
+            "AFTER INSERT ON tournament_catalog",
+            "INSERT INTO tournament_catalog_fts (rowid, name) VALUES (NEW.event_id, NEW.name);",
+        ),
+        "trg_catalog_fts_delete": (
+            "AFTER DELETE ON tournament_catalog",
+            "INSERT INTO tournament_catalog_fts (tournament_catalog_fts, rowid, name) VALUES ('delete', OLD.event_id, OLD.name);",
+        ),
+        "trg_catalog_fts_update": (
+            "AFTER UPDATE OF name ON tournament_catalog WHEN NEW.name IS NOT OLD.name",
+            "INSERT INTO tournament_catalog_fts (tournament_catalog_fts, rowid, name) VALUES ('delete', OLD.event_id, OLD.name);"
+            "INSERT INTO tournament_catalog_fts (rowid, name) VALUES (NEW.event_id, NEW.name);",
+        ),
+    }
+    for name, (event, body) in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+    try:
+        with open(TOURNAMENTS_CACHE_PATH, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except Exception:
+        return
+    if not isinstance(cache, dict) or not cache.get("tournaments"):
+        return
+    fetched_at = int(cache.get("fetched_at") or 0)
+    _store_catalog_items(conn, cache["tournaments"], None, 0, fetched_at)
+    _save_catalog_state(
+        conn, fetched_at, int(cache.get("pages") or 1), int(cache["total_pages"]) if cache.get("total_pages") else None
+    )
+
+
+def _catalog_state(conn):
+    """(fetched_at, pages, total_pages) of the stored catalog; total_pages None = unknown."""
+    row = conn.execute("SELECT fetched_at, pages, total_pages FROM tournament_catalog_state WHERE id = 1").fetchone()
+    if not row:
+        return 0, 0, None
+    return int(row["fetched_at"] or 0), int(row["pages"] or 0), row["total_pages"]
 
-    The /events listing is paginated (~50 tournaments per page, ~59 pages
-    total). `pages` is how many pages should be available: a fresh cache that
-    already covers that many pages is returned untouched; otherwise only the
-    *missing* pages are fetched (page 1 is re-fetched only on refresh=True) and
-    merged into the cache. Fetching is sequential with a short pause between
-    pages so we never hammer vlr.gg.
 
-    Returns {"tournaments": [...], "fetched_at": int, "error": str|None,
-             "total_pages": int, "pages_fetched": int}. `error` is None on a
-    clean load; set to a short user-facing message when something failed
-    (partial load, fallback to cache, etc.) so the UI can explain it.
+def _save_catalog_state(conn, fetched_at, pages, total_pages):
+    conn.execute(
+        """
+        INSERT INTO tournament_catalog_state (id, fetched_at, pages, total_pages) VALUES (1, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            fetched_at=excluded.fetched_at, pages=excluded.pages, total_pages=excluded.total_pages
+        """,
+        (fetched_at, pages, total_pages),
+    )
+
+
+def _store_catalog_items(conn, items, page, position, now):
+    """Upsert parsed /events items in listing order starting at `position`.
+
+    Returns the event ids written.
+    """
+    rows = []
+    for t in items:
+        event_id = _event_id(t.get("id")) or _event_id_from_href(t.get("href"))
+        if not event_id or not t.get("name"):
+            continue
+        start, end = _catalog_dates(t.get("date"), t.get("status"), now)
+        rows.append((
+            event_id, t["name"], t.get("href") or "", t.get("logo") or "", t.get("region") or "",
+            t.get("desc") or "", t.get("status") or "", t.get("date") or "", start, end,
+            position + len(rows), page, now,
+        ))
+    conn.executemany(
+        """
+        INSERT INTO tournament_catalog (
+            event_id, name, href, logo, region, description, status, dates,
+            start_date, end_date, position, page, fetched_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(event_id) DO UPDATE SET
+            name=excluded.name, href=excluded.href, logo=excluded.logo, region=excluded.region,
+            description=excluded.description, status=excluded.status, dates=excluded.dates,
+            start_date=excluded.start_date, end_date=excluded.end_date, position=excluded.position,
+            page=excluded.page, fetched_at=excluded.fetched_at
+        """,
+        rows,
+    )
+    return [row[0] for row in rows]
+
+
+def _catalog_item(row):
+    """API shape of one catalog row (the keys the old JSON list used, plus dates)."""
+    return {
+        "id": str(row["event_id"]),
+        "name": row["name"],
+        "logo": row["logo"],
+        "href": row["href"],
+        "region": row["region"],
+        "desc": row["description"],
+        "status": row["status"],
+        "date": row["dates"],
+        "start_date": row["start_date"],
+        "end_date": row["end_date"],
+    }
+
+
+def load_tournament_catalog(refresh=False, pages=1):
+    """Make `pages` pages of the VLR.gg /events listing available in tournament_catalog.
+
+    The listing is paginated (~50 tournaments per page, ~59 pages total). A
+    fresh catalog that already covers that many pages is left untouched;
+    otherwise only the *missing* pages are fetched (page 1 is re-fetched
+    only on refresh=True, which re-fetches every requested page and drops
+    tournaments no longer listed). Each page is written as it arrives.
+    Fetching is sequential with a short pause between pages so we never
+    hammer vlr.gg.
+
+    Returns {"fetched_at": int, "error": str|None, "total_pages": int,
+             "pages_fetched": int}. `error` is None on a clean load; set to a
+    short user-facing message when something failed (partial load, fallback
+    to the stored list, etc.) so the UI can explain it.
     """
     try:
         pages = max(1, int(pages))
     except (TypeError, ValueError):
         pages = 1
 
+    _ensure_db()
     with tournaments_cache_lock:
-        cache = {}
-        if os.path.exists(TOURNAMENTS_CACHE_PATH):
-            try:
-                with open(TOURNAMENTS_CACHE_PATH, "r", encoding="utf-8") as f:
-                    cache = json.load(f)
-            except Exception:
-                cache = {}
-
-        fetched_at = int(cache.get("fetched_at") or 0)
-        cached_list = cache.get("tournaments") or []
-        cached_pages = int(cache.get("pages") or (1 if cached_list else 0))
-        cached_total = int(cache.get("total_pages") or 1)
+        with _get_conn() as conn:
+            fetched_at, cached_pages, cached_total = _catalog_state(conn)
+            has_rows = conn.execute("SELECT 1 FROM tournament_catalog LIMIT 1").fetchone() is not None
         now = int(time.time())
-        fresh = bool(cached_list) and (now - fetched_at) < TOURNAMENTS_CACHE_TTL
+        fresh = has_rows and (now - fetched_at) < TOURNAMENTS_CACHE_TTL
 
         if not refresh and fresh and cached_pages >= pages:
-            # Cache already covers the requested pages. If it was written before
-            # the total page count was known (old format), learn it from page 1
-            # once and store it so the UI can show "page X of Y".
-            if "total_pages" not in cache:
+            # The catalog already covers the requested pages. If it was imported
+            # before the total page count was known, learn it from page 1 once so
+            # the UI can show "page X of Y".
+            if not cached_total:
                 try:
                     soup, _ = _fetch_tournaments_page(1)
                     if soup is not None:
                         cached_total = max(_get_total_pages(soup), cached_pages)
-                        cache["total_pages"] = cached_total
-                        with open(TOURNAMENTS_CACHE_PATH, "w", encoding="utf-8") as f:
-                            json.dump(cache, f, ensure_ascii=False, indent=2)
+                        with _get_conn() as conn:
+                            _save_catalog_state(conn, fetched_at, cached_pages, cached_total)
                 except Exception as e:
                     print(f"Could not learn total tournament pages: {e}")
             return {
-                "tournaments": cached_list,
                 "fetched_at": fetched_at,
                 "error": None,
-                "total_pages": cached_total,
+                "total_pages": cached_total or 1,
                 "pages_fetched": cached_pages,
             }
 
         if not refresh and fresh:
-            # Normal "load more": keep the cached list, fetch only missing pages
-            all_tournaments = list(cached_list)
-            seen = {t.get("id") for t in all_tournaments}
+            # Normal "load more": keep the stored list, fetch only missing pages
+            with _get_conn() as conn:
+                seen = {row[0] for row in conn.execute("SELECT event_id FROM tournament_catalog")}
+                position = conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM tournament_catalog").fetchone()[0]
             start_page = cached_pages + 1
-            total_pages = cached_total
+            total_pages = cached_total or 1
         else:
-            all_tournaments = []
             seen = set()
+            position = 0
             start_page = 1
             total_pages = 1
-            fetched_at = now
 
         highest_ok = start_page - 1
         last_error = None
@@ -1782,17 +5137,17 @@ def get_tournaments(refresh=False, pages=1):
                 # page can report the (possibly grown) total — if VLR.gg adds a new
                 # page, the next "Load more" notices it without needing a refresh.
                 total_pages = max(total_pages, _get_total_pages(soup))
-                parsed = _parse_tournament_items(soup)
-                added = 0
-                for t in parsed:
-                    tid = t.get("id")
-                    if tid and tid not in seen:
-                        seen.add(tid)
-                        all_tournaments.append(t)
-                        added += 1
-                if added == 0 and page > 1:
+                parsed = []
+                for t in _parse_tournament_items(soup):
+                    event_id = _event_id(t.get("id"))
+                    if event_id and event_id not in seen:
+                        seen.add(event_id)
+                        parsed.append(t)
+                if not parsed and page > 1:
                     print(f"No new tournaments on page {page}; reached the end of the list.")
                     break
+                with _get_conn() as conn:
+                    position += len(_store_catalog_items(conn, parsed, page, position, now))
                 highest_ok = page
                 if page < pages:
                     time.sleep(1)  # gentle pacing between pages
@@ -1801,47 +5156,41 @@ def get_tournaments(refresh=False, pages=1):
                 with _refresh_progress_lock:
                     _refresh_progress.update({"active": False, "total": 0, "done": 0, "current": 0})
 
-        if all_tournaments:
+        if highest_ok >= start_page or (fresh and not refresh):
             pages_loaded = highest_ok if refresh else max(highest_ok, cached_pages)
-            cache_total = max(total_pages, pages_loaded)
+            catalog_total = max(total_pages, pages_loaded)
             # Only reset the freshness clock when something new was actually
-            # loaded (a no-op load-more retry shouldn't extend the 24h TTL)
-            saved_at = now if (refresh or pages_loaded > cached_pages) else fetched_at
-            try:
-                with open(TOURNAMENTS_CACHE_PATH, "w", encoding="utf-8") as f:
-                    json.dump({
-                        "fetched_at": saved_at,
-                        "pages": pages_loaded,
-                        "total_pages": cache_total,
-                        "tournaments": all_tournaments,
-                    }, f, ensure_ascii=False, indent=2)
-            except Exception as e:
-                print(f"Error saving tournaments cache: {e}")
-            if last_error:
-                msg = f"Loaded {pages_loaded} page(s); couldn't fetch more ({last_error})."
-            else:
-                msg = None
-            print(f"Loaded {len(all_tournaments)} tournaments ({pages_loaded} page(s)) from VLR.gg")
+            # loaded (a no-op load-more retry shouldn't extend the TTL)
+            saved_at = now if (refresh or not fresh or pages_loaded > cached_pages) else fetched_at
+            with _get_conn() as conn:
+                if refresh or not fresh:
+                    # Rebuilt from page 1: drop tournaments no longer listed
+                    stale = [
+                        row[0] for row in conn.execute("SELECT event_id FROM tournament_catalog")
+                        if row[0] not in seen
+                    ]
+                    conn.executemany("DELETE FROM tournament_catalog WHERE event_id = ?", [(e,) for e in stale])
+                _save_catalog_state(conn, saved_at, pages_loaded, catalog_total)
+                count = conn.execute("SELECT COUNT(*) FROM tournament_catalog").fetchone()[0]
+            msg = f"Loaded {pages_loaded} page(s); couldn't fetch more ({last_error})." if last_error else None
+            print(f"Loaded {count} tournaments ({pages_loaded} page(s)) from VLR.gg")
             return {
-                "tournaments": all_tournaments,
                 "fetched_at": saved_at,
                 "error": msg,
-                "total_pages": cache_total,
+                "total_pages": catalog_total,
                 "pages_fetched": pages_loaded,
             }
 
-        # Nothing fetched/parsed — fall back to any cached list, then give up
-        if cached_list:
-            print("Could not fetch tournaments; using cached list.")
+        # Nothing fetched/parsed — fall back to the stored list, then give up
+        if has_rows:
+            print("Could not fetch tournaments; using the stored list.")
             return {
-                "tournaments": cached_list,
                 "fetched_at": fetched_at,
                 "error": f"Couldn't reach VLR.gg ({last_error or 'unknown error'}) — showing the cached list.",
-                "total_pages": cached_total,
+                "total_pages": cached_total or 1,
                 "pages_fetched": cached_pages,
             }
         return {
-            "tournaments": [],
             "fetched_at": 0,
             "error": f"Couldn't reach VLR.gg ({last_error or 'unknown error'}).",
             "total_pages": total_pages,
@@ -1849,6 +5198,67 @@ def get_tournaments(refresh=False, pages=1):
         }
 
 
+def query_tournament_catalog(query="", region="", status="", page=1, per_page=TOURNAMENT_CATALOG_PAGE_SIZE):
+    """One page of the stored catalog in VLR.gg listing order.
+
+    `query` prefix-matches every word of the name (FTS), `region` and
+    `status` are exact (status case-insensitive). Returns
+    {"tournaments": [...], "total": matching rows, "page", "per_page",
+     "regions": [...], "statuses": [...]} — the last two list every value in
+    the catalog, for the filter menus.
+    """
+    page = max(1, int(page or 1))
+    per_page = max(1, min(int(per_page or TOURNAMENT_CATALOG_PAGE_SIZE), TOURNAMENT_CATALOG_MAX_PAGE_SIZE))
+    where, params = [], []
+    terms = re.findall(r"\w+", str(query or "").casefold())[:8]
+    if terms:
+        where.append("event_id IN (SELECT rowid FROM tournament_catalog_fts WHERE tournament_catalog_fts MATCH ?)")
+        params.append(" ".join(f'"{term}"*' for term in terms))
+    if region:
+        where.append("region = ?")
+        params.append(str(region))
+    if status:
+        where.append("status = ?")
+        params.append(str(status).strip().capitalize())
+    clause = f"WHERE {' AND '.join(where)}" if where else ""
+    _ensure_db()
+    with _get_conn() as conn:
+        total = conn.execute(f"SELECT COUNT(*) FROM tournament_catalog {clause}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT * FROM tournament_catalog {clause} ORDER BY position LIMIT ? OFFSET ?",
+            [*params, per_page, (page - 1) * per_page],
+        ).fetchall()
+        regions = [row[0] for row in conn.execute("SELECT DISTINCT region FROM tournament_catalog WHERE region != '' ORDER BY region")]
+        statuses = [row[0] for row in conn.execute("SELECT DISTINCT status FROM tournament_catalog WHERE status != '' ORDER BY status")]
+    return {
+        "tournaments": [_catalog_item(row) for row in rows],
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "regions": regions,
+        "statuses": statuses,
+    }
+
+
+def get_catalog_tournaments(event_ids=(), names=()):
+    """Stored catalog entries by event id or exact name: {"ids": {id: item}, "names": {name: item}}."""
+    event_ids = [e for e in {_event_id(e) for e in event_ids} if e]
+    names = [n for n in set(names) if n]
+    found = {"ids": {}, "names": {}}
+    if not event_ids and not names:
+        return found
+    _ensure_db()
+    with _get_conn() as conn:
+        for column, values, key in (("event_id", event_ids, "ids"), ("name", names, "names")):
+            for start in range(0, len(values), 500):
+                chunk = values[start:start + 500]
+                for row in conn.execute(
+                    f"SELECT * FROM tournament_catalog WHERE {column} IN ({','.join('?' for _ in chunk)})", chunk
+                ):
+                    found[key][row[column]] = _catalog_item(row)
+    return found
+
+
 def _fetch_with_retry(url, timeout=25, attempts=3):
     """Fetch a page with browser-like headers, retries and backoff.
 
@@ -1918,12 +5328,51 @@ def _get_total_pages(soup):
         return 1
 
 
+def get_known_events():
+    """{event_id: name} of the events whose matches are stored (matches.db or an archive)."""
+    _ensure_db()
+    with _get_conn() as conn:
+        rows = conn.execute(
+            "SELECT e.event_id, e.name FROM events e JOIN tournament_summary s ON s.tournament = e.name "
+            f"WHERE {NOT_IGNORED_SQL} "
+            "UNION SELECT e.event_id, e.name FROM events e JOIN archived_tournaments a ON a.tournament = e.name "
+            f"WHERE {NOT_IGNORED_SQL}"
+        ).fetchall()
+    return {row["event_id"]: row["name"] for row in rows}
+
+def get_ignored_event_ids():
+    """Ids of the events whose stored name is on the ignore list."""
+    _ensure_db()
+    with _get_conn() as conn:
+        return {
+            row[0]
+            for row in conn.execute(
+                "SELECT e.event_id FROM events e JOIN ignored_tournaments i ON i.tournament = e.name"
+            )
+        }
+
+def get_event_names(event_ids):
+    """{event_id: stored name} for the given ids (unknown ids are left out)."""
+    ids = sorted({_event_id(i) for i in event_ids or []} - {None})
+    if not ids:
+        return {}
+    _ensure_db()
+    with _get_conn() as conn:
+        return {
+            row["event_id"]: row["name"]
+            for row in conn.execute(
+                f"SELECT event_id, name FROM events WHERE event_id IN ({','.join('?' for _ in ids)})", ids
+            )
+        }
+
 def get_known_tournament_names():
-    """Set of tournament names that already exist in the main matches DB."""
+    """Set of tournament names already stored (in matches.db or an archive)."""
     _ensure_db()
     with _get_conn() as conn:
         rows = conn.execute(
-            "SELECT DISTINCT tournament FROM matches WHERE tournament IS NOT NULL AND tournament != ''"
+            "SELECT tournament FROM tournament_summary WHERE tournament IS NOT NULL AND tournament != '' "
+            f"AND {NOT_IGNORED_SQL} "
+            f"UNION SELECT tournament FROM archived_tournaments WHERE {NOT_IGNORED_SQL}"
         ).fetchall()
     return {row["tournament"] for row in rows}
 
@@ -2075,7 +5524,7 @@ def _parse_event_matches_from_soup(soup):
 def add_tournament(tournament, only_missing=False):
     """Fetch all matches of a tournament from its VLR.gg event page and upsert them.
 
-    `tournament` is one item from get_tournaments() (has href/name). Returns
+    `tournament` is one item from query_tournament_catalog() (has href/name). Returns
     (added_count, error_or_None). Uses the same lightweight listing parse as the
     sync button — player stats are NOT fetched here. When `only_missing` is
     true, existing match IDs are skipped so Sync can backfill old tournaments
@@ -2134,9 +5583,13 @@ def add_tournament(tournament, only_missing=False):
         print(f"No matches parsed from event page {url}")
         return 0, "No matches found on the tournament page."
     event_name = (tournament.get("name") or "").strip()
+    event_id = _event_id(tournament.get("id")) or _event_id_from_href(href)
     if event_name:
         for m in matches:
             m["tournament"] = event_name
+    # The upsert stores these under the event's existing name if it has one.
+    for m in matches:
+        m["event_id"] = event_id
     # Event logo: prefer the one from the /events list item; fall back to the
     # event page header so the sidebar shows a logo even for legacy callers
     # that don't send one.
@@ -2152,6 +5605,10 @@ def add_tournament(tournament, only_missing=False):
             logo = "https://www.vlr.gg" + logo
         for m in matches:
             m["tournament_logo"] = logo
+    if event_id:
+        _ensure_db()
+        with _get_conn() as conn:
+            _resolve_event(conn, event_name, event_id, base_event_path, logo)
 
     if only_missing:
         _ensure_db()
@@ -2189,39 +5646,41 @@ def sync_existing_tournament_phases():
     """Backfill missing phase matches for tournaments already in the main DB.
 
     The regular /matches sync cannot discover older group/play-in matches that
-    are no longer on VLR's recent-results pages. Use the cached /events list to
-    find each imported tournament's event URL, then let add_tournament fetch all
-    linked phases while skipping IDs already present in SQLite.
+    are no longer on VLR's recent-results pages. Each stored event's URL comes
+    from the events table (or the cached /events list, by id); add_tournament
+    then fetches all linked phases while skipping IDs already present in SQLite.
+    Tournaments without an event id yet are picked up once backfill_event_ids
+    has linked them.
     """
     if not sync_lock.acquire(blocking=False):
         print("Tournament phase sync already in progress. Skipping.")
         return 0
 
     try:
-        known_names = get_known_tournament_names()
-        if not known_names:
+        known = get_known_events()
+        if not known:
             return 0
 
-        result = get_tournaments(pages=1)
-        cached_tournaments = result.get("tournaments") or []
+        _ensure_db()
+        with _get_conn() as conn:
+            hrefs = {
+                row["event_id"]: row["href"]
+                for row in conn.execute("SELECT event_id, href FROM events WHERE href != ''")
+            }
+        load_tournament_catalog(pages=1)
+        cached = get_catalog_tournaments(event_ids=[e for e in known if e not in hrefs])["ids"]
         targets = []
-        for known_name in sorted(known_names):
-            hits = [
-                t for t in cached_tournaments
-                if _loose_name_match(known_name, t.get("name", "")) and t.get("href")
-            ]
-            if hits:
-                # Prefer the most specific cached event name when a generic
-                # imported name matches more than one cached tournament.
-                targets.append(max(hits, key=lambda t: len(t.get("name", ""))))
+        for event_id, name in sorted(known.items(), key=lambda item: item[1]):
+            href = hrefs.get(event_id) or (cached.get(event_id) or {}).get("href")
+            if href:
+                targets.append({"id": event_id, "name": name, "href": href})
 
         total_added = 0
         seen_targets = set()
         for index, tournament in enumerate(targets):
-            target_key = tournament.get("href") or tournament.get("name")
-            if target_key in seen_targets:
+            if tournament["id"] in seen_targets:
                 continue
-            seen_targets.add(target_key)
+            seen_targets.add(tournament["id"])
             added, error = add_tournament(tournament, only_missing=True)
             total_added += added
             if error:
@@ -2238,6 +5697,22 @@ def sync_existing_tournament_phases():
         sync_lock.release()
 
 
+# Rows whose header metadata (time, team logos) still needs a repair. The
+# partial index idx_matches_needs_metadata is declared with this exact
+# expression, so the query below must keep using it verbatim.
+NEEDS_METADATA_SQL = (
+    "(unix_timestamp = 0 "
+    "OR LOWER(COALESCE(team1_logo, '')) LIKE '%/vlr.png' "
+    "OR LOWER(COALESCE(team2_logo, '')) LIKE '%/vlr.png' "
+    "OR ((team1_logo IS NULL OR team1_logo = '' OR LOWER(team1_logo) LIKE '%/vlr.png') AND LOWER(TRIM(team1)) NOT IN ('', 'tbd', 'tba', 'bye')) "
+    "OR ((team2_logo IS NULL OR team2_logo = '' OR LOWER(team2_logo) LIKE '%/vlr.png') AND LOWER(TRIM(team2)) NOT IN ('', 'tbd', 'tba', 'bye')))"
+)
+
+NEEDS_METADATA_QUERY = (
+    f"SELECT * FROM matches WHERE {NEEDS_METADATA_SQL} AND {NOT_IGNORED_SQL} "
+    "ORDER BY last_updated ASC LIMIT ?"
+)
+
 def backfill_match_metadata(limit=12, delay=0.35):
     """Repair missing match times/logos from lightweight match headers.
 
@@ -2247,15 +5722,7 @@ def backfill_match_metadata(limit=12, delay=0.35):
     """
     _ensure_db()
     with _get_conn() as conn:
-        rows = conn.execute(
-            "SELECT * FROM matches WHERE unix_timestamp = 0 "
-            "OR LOWER(COALESCE(team1_logo, '')) LIKE '%/vlr.png' "
-            "OR LOWER(COALESCE(team2_logo, '')) LIKE '%/vlr.png' "
-            "OR ((team1_logo IS NULL OR team1_logo = '' OR LOWER(team1_logo) LIKE '%/vlr.png') AND LOWER(TRIM(team1)) NOT IN ('', 'tbd', 'tba', 'bye')) "
-            "OR ((team2_logo IS NULL OR team2_logo = '' OR LOWER(team2_logo) LIKE '%/vlr.png') AND LOWER(TRIM(team2)) NOT IN ('', 'tbd', 'tba', 'bye')) "
-            "ORDER BY last_updated ASC LIMIT ?",
-            (max(1, int(limit)),),
-        ).fetchall()
+        rows = conn.execute(NEEDS_METADATA_QUERY, (max(1, int(limit)),)).fetchall()
 
     repaired = 0
     for row in rows:
@@ -2280,24 +5747,65 @@ def backfill_match_metadata(limit=12, delay=0.35):
             repaired += 1
         if delay:
             time.sleep(delay)
+    flush_match_writes()
     return repaired
 
 
-def _loose_name_match(a, b):
-    """Loose tournament-name match: exact, or containment either direction.
+# Tournaments that still have rows without an event id, one sample match
+# each (served by the partial index idx_matches_missing_event).
+MISSING_EVENT_QUERY = (
+    "SELECT tournament, MAX(href) AS href FROM matches "
+    f"WHERE event_id IS NULL AND tournament != '' AND {NOT_IGNORED_SQL} "
+    "GROUP BY tournament"
+)
+
+# Tournaments whose sample match page had no event link; not retried until restart.
+_event_lookup_failed = set()
+
+def backfill_event_ids(limit=5, delay=0.35):
+    """Link tournaments stored before event ids existed to their VLR event.
 
-    Names can differ slightly between the /events list and the DB (e.g. "VCT
-    2026: EMEA Stage 2" vs "Stage 2 W3"); a minimum length avoids false
-    positives on short shared substrings.
+    Reads the event link from one match page per tournament (at most `limit`
+    per call) and gives every row of that tournament the id, so later syncs,
+    phase backfills and the added/ignored flags work by id. Returns the
+    number of tournaments linked.
     """
-    if not a or not b:
-        return False
-    a = a.strip().lower()
-    b = b.strip().lower()
-    if a == b:
-        return True
-    return len(a) >= 8 and len(b) >= 8 and (a in b or b in a)
+    _ensure_db()
+    with _get_conn() as conn:
+        rows = [
+            row for row in conn.execute(MISSING_EVENT_QUERY).fetchall()
+            if row["tournament"] not in _event_lookup_failed
+        ][:max(1, int(limit))]
 
+    global _cached_matches
+    linked = 0
+    for index, row in enumerate(rows):
+        metadata = fetch_match_metadata_page(row["href"] or "")
+        event_id = (metadata or {}).get("event_id")
+        if not event_id:
+            _event_lookup_failed.add(row["tournament"])
+        else:
+            with _get_conn() as conn:
+                _resolve_event(conn, row["tournament"], event_id)
+                renamed, renamed_ids = _link_event_rows(conn, {(row["tournament"], event_id)})
+                if renamed_ids:
+                    _refresh_match_stats(conn, touch_ids=renamed_ids)
+            if renamed:
+                _invalidate_standings(renamed)
+                with _cache_lock:
+                    _cached_matches = None
+            linked += 1
+        if delay and index + 1 < len(rows):
+            time.sleep(delay)
+    return linked
+
+
+MISSING_TOURNAMENT_LOGOS_QUERY = f"""
+    SELECT tournament
+    FROM tournament_summary
+    WHERE tournament IS NOT NULL AND tournament != '' AND {NOT_IGNORED_SQL}
+        AND COALESCE(tournament_logo, '') = ''
+"""
 
 def backfill_tournament_logos():
     """Fill empty tournament_logo values using the cached /events tournament list.
@@ -2305,41 +5813,35 @@ def backfill_tournament_logos():
     Tournaments added before logos were stored (or whose matches never carried
     an icon) have an empty tournament_logo in the DB, so the sidebar shows a
     placeholder instead of the real logo. This matches each such tournament
-    against the cached /events list and stores the logo locally, without
-    re-adding anything or hitting VLR.gg for every tournament.
+    against the cached /events list (by event id, or by exact name for
+    tournaments not linked to an event yet) and stores the logo locally,
+    without re-adding anything or hitting VLR.gg for every tournament.
 
     Called after each sync so pressing the sync button eventually fills all
     missing logos. Returns the number of tournaments filled.
     """
     _ensure_db()
     with _get_conn() as conn:
-        rows = conn.execute(
-            """
-            SELECT tournament
-            FROM matches
-            WHERE tournament IS NOT NULL AND tournament != ''
-            GROUP BY tournament
-            HAVING MAX(CASE WHEN tournament_logo IS NOT NULL AND tournament_logo != '' THEN 1 ELSE 0 END) = 0
-            """
-        ).fetchall()
+        rows = conn.execute(MISSING_TOURNAMENT_LOGOS_QUERY).fetchall()
     names = [r["tournament"] for r in rows]
     if not names:
         return 0
 
-    result = get_tournaments(pages=1)
-    tournaments = result["tournaments"]
-    if not tournaments:
+    load_tournament_catalog(pages=1)
+    with _get_conn() as conn:
+        placeholders = ",".join("?" for _ in names)
+        event_ids = {
+            row["name"]: row["event_id"]
+            for row in conn.execute(f"SELECT event_id, name FROM events WHERE name IN ({placeholders})", names)
+        }
+    catalog = get_catalog_tournaments(event_ids=event_ids.values(), names=names)
+    by_id, by_name = catalog["ids"], catalog["names"]
+    if not by_id and not by_name:
         return 0
-
-    # Prefer the most specific (longest) cache name so generic DB names like
-    # "VCT 2026" don't grab an arbitrary league's logo.
     updates = []
     for name in names:
-        hits = [t for t in tournaments if _loose_name_match(name, t.get("name", ""))]
-        if not hits:
-            continue
-        hit = max(hits, key=lambda t: len(t.get("name", "")))
-        if not hit.get("logo"):
+        hit = by_id.get(event_ids.get(name)) or by_name.get(name)
+        if not hit or not hit.get("logo"):
             continue
         local = download_image(hit["logo"])
         if not local or not local.startswith("/static/images_cache/"):
@@ -2352,7 +5854,261 @@ def backfill_tournament_logos():
                 updates,
             )
             conn.commit()
+        _invalidate_standings(name for _, name in updates)
         for _, name in updates:
             print(f"Backfilled tournament logo for '{name}'")
     return len(updates)
 
+
+# Online snapshots of matches.db and the archives through SQLite's backup
+# API. Each file is copied BACKUP_PAGES_PER_STEP pages at a time with a short
+# sleep between steps, on a dedicated connection (never a pooled one), so
+# syncs and requests keep running. In WAL mode a write from another
+# connection restarts a stepped copy; after BACKUP_MAX_RESTARTS restarts the
+# file is copied in one step, which reads a single WAL snapshot and still
+# does not block writers. Files are copied one after another, so a
+# tournament archived between two copies would be in the snapshot twice (or
+# not at all): the whole copy holds _archive_lock, which keeps
+# archive_old_tournaments, the only writer of archive files while serving,
+# from running until the backup is done. Run `archive` from the command
+# line only while no backup is running.
+BACKUP_KEEP = 7
+BACKUP_PAGES_PER_STEP = 512
+BACKUP_STEP_SLEEP = 0.02
+BACKUP_MAX_RESTARTS = 3
+_backup_lock = threading.Lock()
+_backup_status_lock = threading.Lock()
+_backup_status = {"active": False, "snapshot": None, "file": None, "done": 0, "total": 0, "error": None, "finished_at": None}
+
+class _BackupRestarted(Exception):
+    pass
+
+def _set_backup_status(**values):
+    with _backup_status_lock:
+        _backup_status.update(values)
+
+def get_backup_status():
+    """Copy of the current/last backup run (safe to jsonify)."""
+    with _backup_status_lock:
+        return dict(_backup_status)
+
+def _backup_sources():
+    """{name inside a snapshot: live path} for every database worth backing up."""
+    sources = {"matches.db": DB_PATH}
+    for year, path in _archive_paths().items():
+        sources[f"archive/matches_{year}.db"] = path
+    return sources
+
+def _copy_database(src_path, dest_path):
+    """Copy one live database into dest_path with the online backup API."""
+    restarts = 0
+    last = {"remaining": None}
+
+    def progress(status, remaining, total):
+        nonlocal restarts
+        if last["remaining"] is not None and remaining > last["remaining"]:
+            restarts += 1
+            if restarts > BACKUP_MAX_RESTARTS:
+                raise _BackupRestarted()
+        last["remaining"] = remaining
+        _set_backup_status(done=total - remaining, total=total)
+
+    source = sqlite3.connect(src_path, timeout=30)
+    try:
+        dest = sqlite3.connect(dest_path)
+        try:
+            try:
+                source.backup(dest, pages=BACKUP_PAGES_PER_STEP, progress=progress, sleep=BACKUP_STEP_SLEEP)
+            except _BackupRestarted:
+                print(f"Backup of {os.path.basename(src_path)} kept restarting; copying it in one step.")
+                source.backup(dest)
+        finally:
+            dest.close()
+    finally:
+        source.close()
+
+def _rotate_backups(keep):
+    # The snapshot just written is always kept.
+    snapshots = list_backups()
+    for entry in snapshots[max(1, int(keep)):]:
+        shutil.rmtree(os.path.join(BACKUP_DIR, entry["name"]), ignore_errors=True)
+
+def list_backups():
+    """Snapshots in BACKUP_DIR, newest first."""
+    if not os.path.isdir(BACKUP_DIR):
+        return []
+    snapshots = []
+    for name in sorted(os.listdir(BACKUP_DIR), reverse=True):
+        manifest_path = os.path.join(BACKUP_DIR, name, "manifest.json")
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+        snapshots.append({"name": name, **manifest})
+    return snapshots
+
+def backup_databases(compress=True, keep=BACKUP_KEEP):
+    """Write a consistent snapshot of every database and rotate old ones.
+
+    Keeps the newest `keep` snapshots (at least one). Returns the snapshot
+    name (a UTC timestamp directory under BACKUP_DIR), or None if another
+    backup is already running.
+    """
+    keep = max(1, int(keep))
+    if not _backup_lock.acquire(blocking=False):
+        print("Backup already in progress. Skipping.")
+        return None
+    name = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    try:
+        _ensure_db()
+        # Queued single-match writes belong in the snapshot.
+        flush_match_writes()
+        folder = os.path.join(BACKUP_DIR, name)
+        os.makedirs(folder, exist_ok=True)
+        _set_backup_status(active=True, snapshot=name, error=None, done=0, total=0)
+        files = []
+        with _archive_lock:
+            for rel, src in _backup_sources().items():
+                _set_backup_status(file=rel, done=0, total=0)
+                target = os.path.join(folder, rel)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                _copy_database(src, target + ".tmp")
+                if compress:
+                    with open(target + ".tmp", "rb") as raw, gzip.open(target + ".gz", "wb", compresslevel=6) as packed:
+                        shutil.copyfileobj(raw, packed, 1024 * 1024)
+                    os.remove(target + ".tmp")
+                    rel += ".gz"
+                else:
+                    os.replace(target + ".tmp", target)
+                files.append({"file": rel, "bytes": os.path.getsize(os.path.join(folder, rel))})
+        manifest = {"created_at": int(time.time()), "compressed": bool(compress), "files": files}
+        with open(os.path.join(folder, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        _rotate_backups(keep)
+        print(f"Backup {name} written ({len(files)} file(s)).")
+        return name
+    except Exception as e:
+        _set_backup_status(error=str(e))
+        shutil.rmtree(os.path.join(BACKUP_DIR, name), ignore_errors=True)
+        raise
+    finally:
+        _set_backup_status(active=False, file=None, finished_at=int(time.time()))
+        _backup_lock.release()
+
+def start_backup(compress=True, keep=BACKUP_KEEP):
+    """Run backup_databases on a daemon thread; False if one is already running."""
+    if _backup_lock.locked():
+        return False
+
+    def run():
+        try:
+            backup_databases(compress=compress, keep=keep)
+        except Exception as e:
+            print(f"Backup failed: {e}")
+
+    threading.Thread(target=run, name="db-backup", daemon=True).start()
+    return True
+
+def restore_backup(name, target_dir=None, overwrite=False):
+    """Restore snapshot `name` into target_dir (BASE_DIR by default).
+
+    Each file is decompressed to a temporary file next to its target and
+    copied in with the backup API in one step, which also resets any WAL of
+    an existing target. Archives in the target that the snapshot does not
+    list (tournaments archived after it was taken) would hold a second copy
+    of matches restored into matches.db, so they are renamed to
+    matches_<year>.db.before-<name> first. Refuses to replace or rename
+    existing databases unless overwrite is set; the server using them
+    should be stopped first. Returns the restored paths.
+    """
+    folder = os.path.join(BACKUP_DIR, os.path.basename(str(name)))
+    with open(os.path.join(folder, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    target_dir = target_dir or BASE_DIR
+    plan = []
+    for entry in manifest.get("files", []):
+        rel = entry["file"]
+        target = os.path.join(target_dir, rel[:-3] if rel.endswith(".gz") else rel)
+        if os.path.exists(target) and not overwrite:
+            raise FileExistsError(f"{target} exists (use overwrite to replace it)")
+        plan.append((os.path.join(folder, rel), target))
+    targets = {os.path.abspath(target) for _, target in plan}
+    stale = [
+        path for path in _archive_paths(os.path.join(target_dir, "archive")).values()
+        if os.path.abspath(path) not in targets
+    ]
+    if stale and not overwrite:
+        raise FileExistsError(f"{stale[0]} is not in snapshot {name} (use overwrite to move it aside)")
+    for path in stale:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.replace(path + suffix, f"{path}.before-{os.path.basename(folder)}{suffix}")
+        print(f"Moved {os.path.basename(path)} aside: it is newer than snapshot {name}")
+    restored = []
+    for src, target in plan:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        staged = src
+        if src.endswith(".gz"):
+            staged = target + ".restore.tmp"
+            with gzip.open(src, "rb") as packed, open(staged, "wb") as raw:
+                shutil.copyfileobj(packed, raw, 1024 * 1024)
+        try:
+            source = sqlite3.connect(staged)
+            dest = sqlite3.connect(target, timeout=30)
+            try:
+                source.backup(dest)
+            finally:
+                dest.close()
+                source.close()
+        finally:
+            if staged != src:
+                os.remove(staged)
+        restored.append(target)
+    if os.path.abspath(target_dir) == os.path.abspath(BASE_DIR):
+        close_db_connections()
+        global _cached_matches
+        with _cache_lock:
+            _cached_matches = None
+        _invalidate_standings()
+    return restored
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="VLR scraper database tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("check-archives", help="fail if a match is stored both in matches.db and an archive")
+    archive = commands.add_parser("archive", help="move old completed tournaments to per-year archives")
+    archive.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS, help="minimum age of the last match")
+    backup = commands.add_parser("backup", help="write an online snapshot of the databases")
+    backup.add_argument("--no-compress", action="store_true", help="store plain .db files instead of .gz")
+    backup.add_argument("--keep", type=int, default=BACKUP_KEEP, help="number of snapshots to keep")
+    backup.add_argument("--list", action="store_true", help="list snapshots instead of writing one")
+    restore = commands.add_parser("restore", help="restore a snapshot (stop the server first)")
+    restore.add_argument("snapshot", help="snapshot name, see 'backup --list'")
+    restore.add_argument("--to", default=None, help="target directory (default: this folder)")
+    restore.add_argument("--force", action="store_true", help="replace existing databases")
+    args = parser.parse_args()
+
+    if args.command == "check-archives":
+        duplicates = find_duplicate_match_ids()
+        for mid in duplicates:
+            print(f"Match {mid} is stored more than once")
+        print(f"{len(duplicates)} duplicate match id(s) found." if duplicates else "No duplicate match ids.")
+        sys.exit(1 if duplicates else 0)
+    elif args.command == "archive":
+        names = archive_old_tournaments(args.days)
+        print(f"Archived {len(names)} tournament(s).")
+    elif args.command == "backup":
+        if args.list:
+            for entry in list_backups():
+                size = sum(f["bytes"] for f in entry.get("files", []))
+                print(f"{entry['name']}  {len(entry.get('files', []))} file(s)  {size / 1048576:.1f} MB")
+        else:
+            sys.exit(0 if backup_databases(compress=not args.no_compress, keep=args.keep) else 1)
+    elif args.command == "restore":
+        for path in restore_backup(args.snapshot, target_dir=args.to, overwrite=args.force):
+            print(f"Restored {path}")
@@ -1,6 +1,15 @@
 document.addEventListener("DOMContentLoaded", () => {
     // DOM Elements
 
+    // Save only the given settings keys (server merges them in one transaction)
+    function patchSettings(changes) {
+        return fetch("/api/settings", {
+            method: "PATCH",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify(changes)
+        });
+    }
+
 
 
     // Theme toggle
@@ -14,13 +23,7 @@ document.addEventListener("DOMContentLoaded", () => {
         const isLight = document.body.classList.toggle("light");
         if (themeIcon) themeIcon.className = isLight ? "fa-solid fa-sun" : "fa-solid fa-moon";
         // Persist theme to server settings
-        const settings = await fetch("/api/settings").then(r => r.json());
-        settings.theme = isLight ? "light" : "dark";
-        fetch("/api/settings", {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify(settings)
-        });
+        patchSettings({ theme: isLight ? "light" : "dark" });
     });
 
     // Restore scroll position on page load
@@ -467,13 +470,7 @@ document.addEventListener("DOMContentLoaded", () => {
         });
         
         try {
-            const current = await fetch("/api/settings").then(r => r.json());
-            current.unchecked_tournaments = unchecked;
-            await fetch("/api/settings", {
-                method: "POST",
-                headers: { "Content-Type": "application/json" },
-                body: JSON.stringify(current)
-            });
+            await patchSettings({ unchecked_tournaments: unchecked });
         } catch (err) {
             console.error("Failed to save settings:", err);
         }
@@ -532,11 +529,11 @@ document.addEventListener("DOMContentLoaded", () => {
     }
 
     async function saveSidebarFilters() {
-        const cur = await fetch("/api/settings").then(r => r.json()).catch(() => ({}));
-        cur.filter_year = filterYear ? filterYear.value : "all";
-        cur.filter_custom_series = customSeriesFilters;
-        cur.tourney_sort_order = sortTourneyOrder ? sortTourneyOrder.value : "none";
-        await fetch("/api/settings", { method: "POST", headers: {"Content-Type":"application/json"}, body: JSON.stringify(cur) });
+        await patchSettings({
+            filter_year: filterYear ? filterYear.value : "all",
+            filter_custom_series: customSeriesFilters,
+            tourney_sort_order: sortTourneyOrder ? sortTourneyOrder.value : "none"
+        });
     }
 
     function sortTourneyByDate() {
@@ -601,9 +598,7 @@ document.addEventListener("DOMContentLoaded", () => {
     let ctxTarget = null;
 
     async function saveTournamentOrder() {
-        const cur = await fetch("/api/settings").then(r => r.json()).catch(() => ({}));
-        cur.tournament_order = tournamentOrder;
-        await fetch("/api/settings", { method: "POST", headers: {"Content-Type":"application/json"}, body: JSON.stringify(cur) });
+        await patchSettings({ tournament_order: tournamentOrder });
     }
 
     function setPinOrder(name, newPos) {
@@ -828,8 +823,15 @@ document.addEventListener("DOMContentLoaded", () => {
             // the final map/player data does not exist until they finish.
             const eligible = status === "live" || status === "completed" || isPast || looksCompleted || hasUnknownTime;
             const incomplete = status === "live" || !matchHasCompleteStats(m) || !matchHasCompleteDetails(m);
-            return eligible && incomplete;
-        });
+            // Server-side retry schedule: matches VLR hasn't published stats
+            // for are retried with backoff and eventually given up.
+            const due = (m.next_attempt_at || 0) * 1000 <= Date.now();
+            return eligible && incomplete && due;
+        }).sort((a, b) =>
+            ((b.status || "").toLowerCase() === "live") - ((a.status || "").toLowerCase() === "live")
+            || (a.attempt_count || 0) - (b.attempt_count || 0)
+            || (b.unix_timestamp || 0) - (a.unix_timestamp || 0)
+        );
     }
 
     function updateMissingStatsLoaderButton() {
@@ -1091,8 +1093,8 @@ document.addEventListener("DOMContentLoaded", () => {
             }, 4500);
         }
 
-        // Stats in the DB changed — the leaderboard/standings cache is stale
-        cachedAllMatches = null;
+        // Stats in the DB changed — the standings cache is stale
+        cachedStandings = null;
 
         // Send completion notification
         const remainingLiveCount = getMissingStatsMatches().filter(m => (m.status || "").toLowerCase() === "live").length;
@@ -1223,10 +1225,7 @@ document.addEventListener("DOMContentLoaded", () => {
 
     perPageSelect?.addEventListener("change", () => {
         applyFilters();
-        fetch("/api/settings").then(r => r.json()).then(s => {
-            s.per_page = perPageSelect.value;
-            fetch("/api/settings", { method: "POST", headers: {"Content-Type":"application/json"}, body: JSON.stringify(s) });
-        });
+        patchSettings({ per_page: perPageSelect.value });
     });
 
     // 4. Input Listeners
@@ -1303,8 +1302,8 @@ document.addEventListener("DOMContentLoaded", () => {
                 // Keep the in-memory leaderboard dataset updated
                 INITIAL_MATCHES = matches;
 
-                // Full-stats dataset (leaderboard/standings) is now stale — refetch on next open
-                cachedAllMatches = null;
+                // Standings are now stale — refetch on next open
+                cachedStandings = null;
 
                 const scrollY = window.scrollY;
 
@@ -1336,6 +1335,8 @@ document.addEventListener("DOMContentLoaded", () => {
     const tournamentBrowserList = document.getElementById("tournament-browser-list");
     const tournamentBrowserSearch = document.getElementById("tournament-browser-search");
     const tournamentBrowserLimit = document.getElementById("tournament-browser-limit");
+    const tournamentBrowserRegion = document.getElementById("tournament-browser-region");
+    const tournamentBrowserStatusFilter = document.getElementById("tournament-browser-status-filter");
     const tournamentBrowserRefresh = document.getElementById("tournament-browser-refresh");
     const tournamentBrowserLoadMore = document.getElementById("tournament-browser-loadmore");
     const tournamentBrowserLoadMoreLabel = document.getElementById("tournament-browser-loadmore-label");
@@ -1345,14 +1346,17 @@ document.addEventListener("DOMContentLoaded", () => {
     const tournamentBrowserAdd = document.getElementById("tournament-browser-add");
     const tournamentBrowserSelectedCount = document.getElementById("tournament-browser-selected-count");
 
-    let tournamentBrowserData = [];              // full cached list from the server
-    let tournamentBrowserSelected = new Set();   // selected tournament ids
-    let tournamentBrowserVisible = 50;           // how many rows are currently shown
-    let tournamentBrowserLoading = false;
+    let tournamentBrowserData = [];              // rows of the result pages loaded so far
+    let tournamentBrowserSelected = new Map();   // selected tournament id -> item (kept across filters)
+    let tournamentBrowserPage = 0;               // last result page loaded for the current filters
+    let tournamentBrowserTotal = 0;              // rows matching the current filters on the server
+    let tournamentBrowserRequest = 0;            // newest query; older responses are dropped
+    let tournamentBrowserLoading = false;        // a VLR.gg fetch (refresh / more pages) is running
     let tournamentBrowserAdding = false;
     let tournamentBrowserPagesFetched = 1;       // how many /events pages the server has loaded
     let tournamentBrowserTotalPages = 1;         // total pages available on VLR.gg
     let tournamentPagesPerLoad = 5;              // pages fetched per "Load more" click (configurable in Settings)
+    let tournamentBrowserSearchTimer = null;
 
     function escapeHtml(s) {
         return String(s == null ? "" : s)
@@ -1369,16 +1373,10 @@ document.addEventListener("DOMContentLoaded", () => {
 
     function renderTournamentBrowser() {
         if (!tournamentBrowserList) return;
-        const q = (tournamentBrowserSearch?.value || "").trim().toLowerCase();
-        const limitVal = tournamentBrowserLimit?.value || "50";
-        const filtered = tournamentBrowserData.filter(t =>
-            !q || (t.name || "").toLowerCase().includes(q)
-        );
-        const pageSize = limitVal === "all" ? filtered.length : Math.min(parseInt(limitVal) || 50, filtered.length);
-        const showCount = Math.max(pageSize, tournamentBrowserVisible);
-        const visible = filtered.slice(0, showCount);
+        const q = (tournamentBrowserSearch?.value || "").trim();
+        const filtered = Boolean(q || tournamentBrowserRegion?.value || tournamentBrowserStatusFilter?.value);
 
-        tournamentBrowserList.innerHTML = visible.map(t => {
+        tournamentBrowserList.innerHTML = tournamentBrowserData.map(t => {
             const isSelected = tournamentBrowserSelected.has(String(t.id));
             const nameHtml = escapeHtml(t.name);
             let badge = "";
@@ -1397,11 +1395,11 @@ document.addEventListener("DOMContentLoaded", () => {
             `;
         }).join("");
 
-        if (visible.length === 0) {
+        if (tournamentBrowserData.length === 0) {
             tournamentBrowserList.innerHTML = `
                 <div class="tbr-empty">
                     <i class="fa-solid fa-trophy"></i>
-                    <p>${q ? `No tournaments match "${escapeHtml(q)}".` : "No tournaments found."}</p>
+                    <p>${q ? `No tournaments match "${escapeHtml(q)}".` : filtered ? "No tournaments match these filters." : "No tournaments found."}</p>
                 </div>`;
         }
 
@@ -1409,20 +1407,57 @@ document.addEventListener("DOMContentLoaded", () => {
         if (tournamentBrowserAdd) tournamentBrowserAdd.disabled = tournamentBrowserSelected.size === 0 || tournamentBrowserAdding;
     }
 
-    async function loadTournamentBrowser(refresh = false) {
-        if (tournamentBrowserLoading) return;
-        tournamentBrowserLoading = true;
+    // Keep the region/status menus in step with what the catalog contains
+    function fillTournamentFilter(select, values, allLabel) {
+        if (!select || !Array.isArray(values)) return;
+        const current = select.value;
+        select.innerHTML = `<option value="">${allLabel}</option>` +
+            values.map(v => `<option value="${escapeHtml(v)}">${escapeHtml(v)}</option>`).join("");
+        select.value = values.includes(current) ? current : "";
+    }
+
+    function setTournamentBrowserStatus(data) {
+        if (!tournamentBrowserStatus) return;
+        if (data.error) {
+            tournamentBrowserStatus.textContent = data.error;
+            tournamentBrowserStatus.classList.add("tbr-status-error");
+            return;
+        }
+        tournamentBrowserStatus.classList.remove("tbr-status-error");
+        // total_pages of 1 means the server hasn't learned the real
+        // page count yet — never treat that as "all loaded"
+        const allLoaded = tournamentBrowserTotalPages > 1 && tournamentBrowserPagesFetched >= tournamentBrowserTotalPages;
+        const shown = `Showing ${tournamentBrowserData.length} of ${tournamentBrowserTotal} tournament${tournamentBrowserTotal === 1 ? "" : "s"}`;
+        if (!tournamentBrowserTotal && !(tournamentBrowserSearch?.value || tournamentBrowserRegion?.value || tournamentBrowserStatusFilter?.value)) {
+            tournamentBrowserStatus.textContent = "No tournaments found. Click Refresh to fetch the list.";
+        } else if (allLoaded) {
+            tournamentBrowserStatus.textContent = `${shown} — all ${tournamentBrowserTotalPages} page${tournamentBrowserTotalPages === 1 ? "" : "s"} loaded. Select the ones you want to add.`;
+        } else {
+            tournamentBrowserStatus.textContent = `${shown} (page ${tournamentBrowserPagesFetched} of ${tournamentBrowserTotalPages} loaded from VLR.gg). Select the ones you want to add, or click Load more.`;
+        }
+    }
+
+    // Fetch one result page for the current filters. `append` adds the next
+    // page to the list; `pages`/`refresh` first make the server fetch
+    // /events pages from VLR.gg.
+    async function loadTournamentBrowser({ refresh = false, pages = 0, append = false } = {}) {
+        const fetchesVlr = refresh || pages > 0;
+        if (fetchesVlr && tournamentBrowserLoading) return;
+        const requestId = ++tournamentBrowserRequest;
         const refreshIcon = tournamentBrowserRefresh ? tournamentBrowserRefresh.querySelector(".fa-arrows-rotate") : null;
-        if (tournamentBrowserRefresh) tournamentBrowserRefresh.disabled = true;
-        if (tournamentBrowserLoadMore) tournamentBrowserLoadMore.disabled = true;
-        if (refreshIcon) refreshIcon.classList.add("spinning");
+        if (fetchesVlr) {
+            tournamentBrowserLoading = true;
+            if (tournamentBrowserRefresh) tournamentBrowserRefresh.disabled = true;
+            if (tournamentBrowserLoadMore) tournamentBrowserLoadMore.disabled = true;
+            if (refreshIcon) refreshIcon.classList.add("spinning");
+        }
         if (tournamentBrowserStatus) {
             tournamentBrowserStatus.classList.remove("tbr-status-error");
             if (refresh) {
                 tournamentBrowserStatus.textContent = `Refreshing ${Math.max(tournamentBrowserPagesFetched, 1)} page${Math.max(tournamentBrowserPagesFetched, 1) === 1 ? "" : "s"} from VLR.gg…`;
-            } else if (tournamentBrowserData.length) {
+            } else if (pages > 0) {
                 tournamentBrowserStatus.textContent = `Loading more — fetching page ${Math.min(tournamentBrowserPagesFetched + 1, tournamentBrowserTotalPages)} of ${tournamentBrowserTotalPages}…`;
-            } else {
+            } else if (!append) {
                 tournamentBrowserStatus.textContent = "Loading…";
             }
         }
@@ -1432,63 +1467,61 @@ document.addEventListener("DOMContentLoaded", () => {
             refreshProgressTimer = setInterval(pollRefreshProgress, 700);
         }
         try {
-            // First open fetches just page 1; "Load more" fetches the next batch.
-            // Refresh re-fetches EXACTLY the pages the user already has loaded —
-            // requesting page 1 alone would silently shrink the cache back to 69.
-            const targetPages = (refresh || tournamentBrowserData.length === 0)
-                ? Math.max(tournamentBrowserPagesFetched, 1)
-                : tournamentBrowserPagesFetched + tournamentPagesPerLoad;
-            const url = `/api/tournaments?pages=${targetPages}${refresh ? "&refresh=true" : ""}`;
-            const data = await fetch(url).then(r => r.json());
-            tournamentBrowserData = data.tournaments || [];
+            const params = new URLSearchParams({
+                page: String(append ? tournamentBrowserPage + 1 : 1),
+                per_page: tournamentBrowserLimit?.value || "50",
+            });
+            const q = (tournamentBrowserSearch?.value || "").trim();
+            if (q) params.set("q", q);
+            if (tournamentBrowserRegion?.value) params.set("region", tournamentBrowserRegion.value);
+            if (tournamentBrowserStatusFilter?.value) params.set("status", tournamentBrowserStatusFilter.value);
+            if (pages > 0) params.set("pages", String(pages));
+            if (refresh) params.set("refresh", "true");
+            const data = await fetch(`/api/tournaments?${params}`).then(r => r.json());
+            if (requestId !== tournamentBrowserRequest) return;
+            const rows = data.tournaments || [];
+            tournamentBrowserData = append ? tournamentBrowserData.concat(rows) : rows;
+            tournamentBrowserPage = data.page || 1;
+            tournamentBrowserTotal = data.total || 0;
             tournamentBrowserPagesFetched = data.pages_fetched || 1;
             tournamentBrowserTotalPages = data.total_pages || 1;
-            tournamentBrowserSelected = new Set();
-            tournamentBrowserVisible = Math.max(tournamentBrowserVisible, tournamentBrowserPagesFetched * 50);
+            if (refresh) tournamentBrowserSelected = new Map();
+            fillTournamentFilter(tournamentBrowserRegion, data.regions, "All regions");
+            fillTournamentFilter(tournamentBrowserStatusFilter, data.statuses, "All statuses");
             renderTournamentBrowser();
-            if (tournamentBrowserStatus) {
-                if (data.error) {
-                    tournamentBrowserStatus.textContent = data.error;
-                    tournamentBrowserStatus.classList.add("tbr-status-error");
-                } else if (tournamentBrowserData.length) {
-                    // total_pages of 1 means the server hasn't learned the real
-                    // page count yet — never treat that as "all loaded"
-                    const allLoaded = tournamentBrowserTotalPages > 1 && tournamentBrowserPagesFetched >= tournamentBrowserTotalPages;
-                    tournamentBrowserStatus.textContent = allLoaded
-                        ? `${tournamentBrowserData.length} tournaments available — all ${tournamentBrowserTotalPages} page${tournamentBrowserTotalPages === 1 ? "" : "s"} loaded. Select the ones you want to add.`
-                        : `${tournamentBrowserData.length} tournaments loaded (page ${tournamentBrowserPagesFetched} of ${tournamentBrowserTotalPages}). Select the ones you want to add, or click Load more.`;
-                    tournamentBrowserStatus.classList.remove("tbr-status-error");
-                } else {
-                    tournamentBrowserStatus.textContent = "No tournaments found. Click Refresh to fetch the list.";
-                    tournamentBrowserStatus.classList.remove("tbr-status-error");
-                }
-            }
+            setTournamentBrowserStatus(data);
         } catch (err) {
             console.error("Failed to load tournaments:", err);
-            if (tournamentBrowserStatus) {
+            if (tournamentBrowserStatus && requestId === tournamentBrowserRequest) {
                 tournamentBrowserStatus.textContent = "Failed to load tournaments: " + err.message;
                 tournamentBrowserStatus.classList.add("tbr-status-error");
             }
         } finally {
-            tournamentBrowserLoading = false;
-            if (tournamentBrowserRefresh) tournamentBrowserRefresh.disabled = false;
-            if (tournamentBrowserLoadMore) tournamentBrowserLoadMore.disabled = false;
-            if (refreshIcon) refreshIcon.classList.remove("spinning");
-            stopRefreshProgressPolling();
+            if (fetchesVlr) {
+                tournamentBrowserLoading = false;
+                if (tournamentBrowserRefresh) tournamentBrowserRefresh.disabled = false;
+                if (tournamentBrowserLoadMore) tournamentBrowserLoadMore.disabled = false;
+                if (refreshIcon) refreshIcon.classList.remove("spinning");
+                stopRefreshProgressPolling();
+            }
             updateTournamentLoadMoreButton();
         }
     }
 
-    // Show/hide and label the "Load more" button based on current progress
+    // Show/hide and label the "Load more" button: the next result page while
+    // the server has more matching rows, then the next /events pages
     function updateTournamentLoadMoreButton() {
         if (!tournamentBrowserLoadMore) return;
+        const moreRows = tournamentBrowserData.length < tournamentBrowserTotal;
         // total_pages of 1 means the count is unknown — keep the button available
         const allLoaded = tournamentBrowserTotalPages > 1 && tournamentBrowserPagesFetched >= tournamentBrowserTotalPages;
-        tournamentBrowserLoadMore.style.display = allLoaded ? "none" : "";
+        tournamentBrowserLoadMore.style.display = (moreRows || !allLoaded) ? "" : "none";
         if (tournamentBrowserLoadMoreLabel) {
-            tournamentBrowserLoadMoreLabel.textContent = allLoaded
-                ? "Load more tournaments"
-                : `Load more tournaments (page ${Math.min(tournamentBrowserPagesFetched + tournamentPagesPerLoad, tournamentBrowserTotalPages)} of ${tournamentBrowserTotalPages})`;
+            tournamentBrowserLoadMoreLabel.textContent = moreRows
+                ? `Show more (${tournamentBrowserData.length} of ${tournamentBrowserTotal})`
+                : allLoaded
+                    ? "Load more tournaments"
+                    : `Load more tournaments (page ${Math.min(tournamentBrowserPagesFetched + tournamentPagesPerLoad, tournamentBrowserTotalPages)} of ${tournamentBrowserTotalPages})`;
         }
     }
 
@@ -1522,7 +1555,7 @@ document.addEventListener("DOMContentLoaded", () => {
 
     browseTournamentsBtn?.addEventListener("click", () => {
         if (tournamentBrowserModal) tournamentBrowserModal.style.display = "flex";
-        loadTournamentBrowser(false);
+        loadTournamentBrowser();
     });
     tournamentBrowserClose?.addEventListener("click", closeTournamentBrowser);
     tournamentBrowserModal?.addEventListener("click", e => {
@@ -1532,21 +1565,27 @@ document.addEventListener("DOMContentLoaded", () => {
         if (e.key === "Escape" && tournamentBrowserModal && tournamentBrowserModal.style.display !== "none") closeTournamentBrowser();
     });
 
+    // Filters are applied by the server; typing waits for a short pause
     tournamentBrowserSearch?.addEventListener("input", () => {
-        tournamentBrowserVisible = tournamentBrowserLimit.value === "all" ? 999999 : (parseInt(tournamentBrowserLimit.value) || 50);
-        renderTournamentBrowser();
+        clearTimeout(tournamentBrowserSearchTimer);
+        tournamentBrowserSearchTimer = setTimeout(() => loadTournamentBrowser(), 250);
     });
-    tournamentBrowserLimit?.addEventListener("change", () => {
-        tournamentBrowserVisible = tournamentBrowserLimit.value === "all" ? 999999 : (parseInt(tournamentBrowserLimit.value) || 50);
-        renderTournamentBrowser();
+    [tournamentBrowserLimit, tournamentBrowserRegion, tournamentBrowserStatusFilter].forEach(select => {
+        select?.addEventListener("change", () => loadTournamentBrowser());
     });
     tournamentBrowserLoadMore?.addEventListener("click", () => {
-        loadTournamentBrowser(false);
+        if (tournamentBrowserData.length < tournamentBrowserTotal) {
+            loadTournamentBrowser({ append: true });
+        } else {
+            loadTournamentBrowser({ pages: tournamentBrowserPagesFetched + tournamentPagesPerLoad, append: true });
+        }
     });
     tournamentBrowserRefresh?.addEventListener("click", () => {
         // No confirm dialog — the button is already an explicit action, and the
         // spinning icon + status text show the refresh is running.
-        loadTournamentBrowser(true);
+        // Refresh re-fetches EXACTLY the pages the user already has loaded —
+        // requesting page 1 alone would silently shrink the catalog.
+        loadTournamentBrowser({ refresh: true, pages: Math.max(tournamentBrowserPagesFetched, 1) });
     });
 
     // Settings: pages fetched per "Load more" click
@@ -1558,12 +1597,7 @@ document.addEventListener("DOMContentLoaded", () => {
         tournamentPagesPerLoad = val;
         if (tournamentPagesPerLoadInput) tournamentPagesPerLoadInput.value = val;
         try {
-            const cur = await fetch("/api/settings").then(r => r.json()).catch(() => ({}));
-            await fetch("/api/settings", {
-                method: "POST",
-                headers: { "Content-Type": "application/json" },
-                body: JSON.stringify({ ...cur, tournament_pages_per_load: val })
-            });
+            await patchSettings({ tournament_pages_per_load: val });
         } catch (err) {
             console.error("Failed to save tournament pages per load:", err);
         }
@@ -1573,7 +1607,8 @@ document.addEventListener("DOMContentLoaded", () => {
     tournamentBrowserList?.addEventListener("change", e => {
         if (e.target.classList.contains("tbr-checkbox")) {
             const id = String(e.target.value);
-            if (e.target.checked) tournamentBrowserSelected.add(id);
+            const item = tournamentBrowserData.find(t => String(t.id) === id);
+            if (e.target.checked && item) tournamentBrowserSelected.set(id, item);
             else tournamentBrowserSelected.delete(id);
             if (tournamentBrowserSelectedCount) tournamentBrowserSelectedCount.textContent = String(tournamentBrowserSelected.size);
             if (tournamentBrowserAdd) tournamentBrowserAdd.disabled = tournamentBrowserSelected.size === 0 || tournamentBrowserAdding;
@@ -1581,7 +1616,7 @@ document.addEventListener("DOMContentLoaded", () => {
     });
 
     tournamentBrowserAdd?.addEventListener("click", async () => {
-        const selected = tournamentBrowserData.filter(t => tournamentBrowserSelected.has(String(t.id)));
+        const selected = [...tournamentBrowserSelected.values()];
         if (selected.length === 0 || tournamentBrowserAdding) return;
         tournamentBrowserAdding = true;
         if (tournamentBrowserAdd) {
@@ -1632,8 +1667,7 @@ document.addEventListener("DOMContentLoaded", () => {
             const end = Math.max(start, parseInt(scrapeEnd?.value) || start);
             if (scrapeStart) scrapeStart.value = start;
             if (scrapeEnd) scrapeEnd.value = end;
-            const cur = await fetch("/api/settings").then(r => r.json()).catch(() => ({}));
-            await fetch("/api/settings", { method: "POST", headers: {"Content-Type":"application/json"}, body: JSON.stringify({...cur, scrape_start: start, scrape_end: end}) });
+            await patchSettings({ scrape_start: start, scrape_end: end });
             savePagesBtnEl.innerHTML = '<i class="fa-solid fa-check"></i>';
             setTimeout(() => { savePagesBtnEl.innerHTML = '<i class="fa-solid fa-floppy-disk"></i>'; }, 1500);
         });
@@ -1650,8 +1684,7 @@ document.addEventListener("DOMContentLoaded", () => {
             if (scrapeStart) scrapeStart.value = newStart;
             if (scrapeEnd) scrapeEnd.value = newEnd;
             
-            const cur = await fetch("/api/settings").then(r => r.json()).catch(() => ({}));
-            await fetch("/api/settings", { method: "POST", headers: {"Content-Type":"application/json"}, body: JSON.stringify({...cur, scrape_start: newStart, scrape_end: newEnd}) });
+            await patchSettings({ scrape_start: newStart, scrape_end: newEnd });
             
             advancePagesBtnEl.innerHTML = '<i class="fa-solid fa-check"></i>';
             setTimeout(() => { advancePagesBtnEl.innerHTML = '<i class="fa-solid fa-arrow-right"></i>'; }, 1500);
@@ -1665,12 +1698,7 @@ document.addEventListener("DOMContentLoaded", () => {
         if (checklist) {
             checklist.classList.toggle("highlight-tournaments", isChecked);
         }
-        const cur = await fetch("/api/settings").then(r => r.json()).catch(() => ({}));
-        await fetch("/api/settings", {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({ ...cur, highlight_loaded_tournaments: isChecked })
-        });
+        await patchSettings({ highlight_loaded_tournaments: isChecked });
     });
 
 
@@ -2055,13 +2083,7 @@ document.addEventListener("DOMContentLoaded", () => {
     }
 
     async function saveWhiteLogoTeams() {
-        const cur = await fetch("/api/settings").then(r => r.json()).catch(() => ({}));
-        cur.white_logo_teams = Array.from(whiteLogoTeams);
-        await fetch("/api/settings", {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify(cur)
-        });
+        await patchSettings({ white_logo_teams: Array.from(whiteLogoTeams) });
         applyWhiteLogoStylesToCurrentCards();
     }
 
@@ -2108,13 +2130,7 @@ document.addEventListener("DOMContentLoaded", () => {
         if (whiteLogoBgColorText) whiteLogoBgColorText.value = color;
         
         // Save to settings
-        const cur = await fetch("/api/settings").then(r => r.json()).catch(() => ({}));
-        cur.white_logo_bg_color = color;
-        await fetch("/api/settings", {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify(cur)
-        });
+        await patchSettings({ white_logo_bg_color: color });
     }
 
     whiteLogoBgColorPicker?.addEventListener("input", (e) => {
@@ -2308,158 +2324,23 @@ document.addEventListener("DOMContentLoaded", () => {
     });
 
     // Player Aggregated Stats / Leaderboard Functions
-    function calculatePlayerAggregates(matches, selectedTourneys, splitByTeam = false) {
-        const playersMap = {};
-
-        if (!Array.isArray(matches)) return [];
-
-        matches.forEach(m => {
-            if (m && m.tournament && selectedTourneys && selectedTourneys.has(m.tournament)) {
-                if (m.players && typeof m.players === "object" && m.players.all && typeof m.players.all === "object") {
-                    const teams = ["team1", "team2"];
-                    teams.forEach(tKey => {
-                        const playersList = m.players.all[tKey];
-                        const currentTeamLogo = (tKey === "team1") ? (m.team1_logo || "") : (m.team2_logo || "");
-                        const currentTeamName = (tKey === "team1") ? (m.team1 || "") : (m.team2 || "");
-                        if (Array.isArray(playersList)) {
-                            playersList.forEach(p => {
-                                if (!p || !p.name) return;
-                                
-                                const key = splitByTeam ? `${p.name}||${currentTeamName}` : p.name;
-                                
-                                if (!playersMap[key]) {
-                                    playersMap[key] = {
-                                        name: p.name,
-                                        photo: p.photo || "",
-                                        teamLogo: splitByTeam ? currentTeamLogo : "",
-                                        teamName: splitByTeam ? currentTeamName : "",
-                                        agents: {}, // name -> { icon, count }
-                                        matchesPlayed: 0,
-                                        ratingsList: [],
-                                        acsList: [],
-                                        kills: 0,
-                                        deaths: 0,
-                                        assists: 0,
-                                        kastList: [],
-                                        adrList: [],
-                                        hsList: [],
-                                        fk: 0,
-                                        fd: 0
-                                    };
-                                }
-
-                                const agg = playersMap[key];
-                                agg.matchesPlayed++;
-                                
-                                if (!agg.photo && p.photo) agg.photo = p.photo;
-                                if (splitByTeam) {
-                                    if (!agg.teamLogo && currentTeamLogo) agg.teamLogo = currentTeamLogo;
-                                    if (!agg.teamName && currentTeamName) agg.teamName = currentTeamName;
-                                }
-
-                                if (Array.isArray(p.agents)) {
-                                    p.agents.forEach(a => {
-                                        if (a && a.name) {
-                                            if (!agg.agents[a.name]) {
-                                                agg.agents[a.name] = { icon: a.icon || "", count: 0 };
-                                            }
-                                            agg.agents[a.name].count++;
-                                        }
-                                    });
-                                }
-
-                                const ratingVal = parseFloat(p.rating);
-                                if (!isNaN(ratingVal)) agg.ratingsList.push(ratingVal);
-
-                                const acsVal = parseFloat(p.acs);
-                                if (!isNaN(acsVal)) agg.acsList.push(acsVal);
-
-                                const kVal = parseInt(p.k);
-                                if (!isNaN(kVal)) agg.kills += kVal;
-
-                                const dVal = parseInt(p.d);
-                                if (!isNaN(dVal)) agg.deaths += dVal;
-
-                                const aVal = parseInt(p.a);
-                                if (!isNaN(aVal)) agg.assists += aVal;
-
-                                if (p.kast && typeof p.kast === "string") {
-                                    const kastVal = parseFloat(p.kast.replace("%", ""));
-                                    if (!isNaN(kastVal)) agg.kastList.push(kastVal);
-                                }
-
-                                const adrVal = parseFloat(p.adr);
-                                if (!isNaN(adrVal)) agg.adrList.push(adrVal);
-
-                                if (p.hs && typeof p.hs === "string") {
-                                    const hsVal = parseFloat(p.hs.replace("%", ""));
-                                    if (!isNaN(hsVal)) agg.hsList.push(hsVal);
-                                }
-
-                                const fkVal = parseInt(p.fk);
-                                if (!isNaN(fkVal)) agg.fk += fkVal;
-
-                                const fdVal = parseInt(p.fd);
-                                if (!isNaN(fdVal)) agg.fd += fdVal;
-                            });
-                        }
-                    });
-                }
-            }
-        });
-
-        return Object.values(playersMap).map(agg => {
-            const avg = list => list.length ? (list.reduce((sum, val) => sum + val, 0) / list.length) : 0;
-            
-            const avgRating = avg(agg.ratingsList);
-            const avgAcs = avg(agg.acsList);
-            const avgKast = avg(agg.kastList);
-            const avgAdr = avg(agg.adrList);
-            const avgHs = avg(agg.hsList);
-
-            const sortedAgents = Object.entries(agg.agents)
-                .sort((a, b) => b[1].count - a[1].count)
-                .map(([name, data]) => ({ name, icon: data.icon }));
-
-            return {
-                name: agg.name,
-                photo: agg.photo,
-                teamLogo: agg.teamLogo,
-                teamName: agg.teamName,
-                agents: sortedAgents,
-                matchesPlayed: agg.matchesPlayed,
-                rating: avgRating ? avgRating.toFixed(2) : "N/A",
-                acs: avgAcs ? Math.round(avgAcs) : "N/A",
-                k: agg.kills,
-                d: agg.deaths,
-                a: agg.assists,
-                kd_diff: agg.kills - agg.deaths,
-                kast: avgKast ? Math.round(avgKast) + "%" : "N/A",
-                adr: avgAdr ? Math.round(avgAdr) : "N/A",
-                hs: avgHs ? Math.round(avgHs) + "%" : "N/A",
-                fk: agg.fk,
-                fd: agg.fd,
-                fk_diff: agg.fk - agg.fd
-            };
-        });
-    }
-
     async function openLeaderboard() {
         try {
-            // Leaderboard needs full player stats — fetch them on demand from
-            // /api/matches/all (the slim /api/matches list only carries has_stats).
-            // Share the cachedAllMatches dataset with the standings view.
-            if (!cachedAllMatches) {
-                cachedAllMatches = await fetch("/api/matches/all").then(r => r.json()).catch(() => null);
-            }
-            const matches = cachedAllMatches || [];
+            // Aggregates are maintained server-side (player_aggregates table);
+            // only the top rows for the checked tournaments are transferred.
             const selectedTourneys = typeof checkedTournaments !== "undefined" ? checkedTournaments : new Set();
             
             // Read split statistics toggle state
             const teamSplitCheckbox = document.getElementById("setting-team-split-stats");
             const splitByTeam = teamSplitCheckbox ? teamSplitCheckbox.checked : false;
 
-            const aggregates = calculatePlayerAggregates(matches, selectedTourneys, splitByTeam);
+            const params = new URLSearchParams();
+            selectedTourneys.forEach(t => params.append("tournament", t));
+            params.set("split", splitByTeam ? "true" : "false");
+            params.set("limit", "300");
+            const aggregates = selectedTourneys.size
+                ? ((await fetch(`/api/leaderboard?${params}`).then(r => r.json()).catch(() => null)) || {}).players || []
+                : [];
 
             const tbody = document.getElementById("leaderboard-tbody");
             if (!tbody) {
@@ -2706,7 +2587,10 @@ document.addEventListener("DOMContentLoaded", () => {
         }
     }
 
-    async function renderTeamHistory(teamName) {
+    // Paged server-side history used when the "selected tournaments" filter is off
+    let thrHistoryState = null;
+
+    async function renderTeamHistory(teamName, loadMore = false) {
         const resultsContainer = document.getElementById("team-history-results");
         if (!resultsContainer) return;
 
@@ -2728,64 +2612,87 @@ document.addEventListener("DOMContentLoaded", () => {
             return;
         }
 
-        // Determine data source based on toggle
-        let allMatches;
+        let teamMatches;
+        let foundLogo = "";
+        let wins = 0;
+        let losses = 0;
+        let draws = 0;
+
         if (thrFilterSelectedTourneys) {
             // ON: filter to only checked sidebar tournaments from INITIAL_MATCHES
-            allMatches = typeof INITIAL_MATCHES !== "undefined" ? INITIAL_MATCHES : [];
-        } else {
-            // OFF: fetch ALL matches from every tournament in the DB
-            try {
-                allMatches = await fetch("/api/matches/all").then(r => r.json());
-            } catch (err) {
-                console.error("Failed to fetch all matches:", err);
-                allMatches = typeof INITIAL_MATCHES !== "undefined" ? INITIAL_MATCHES : [];
-            }
-        }
-
-        let teamMatches = allMatches.filter(m => {
-            const isTeam = m.team1 === teamName || m.team2 === teamName;
-            if (!isTeam) return false;
-            return thrShowFutureMatches ? true : (m.status === "Completed");
-        });
+            const allMatches = typeof INITIAL_MATCHES !== "undefined" ? INITIAL_MATCHES : [];
+            teamMatches = allMatches.filter(m => {
+                const isTeam = m.team1 === teamName || m.team2 === teamName;
+                if (!isTeam) return false;
+                return thrShowFutureMatches ? true : (m.status === "Completed");
+            });
 
-        if (thrFilterSelectedTourneys) {
             const checkedT = new Set(
                 Array.from(document.querySelectorAll("#tournament-checklist .tourney-checkbox:checked")).map(cb => cb.value)
             );
             teamMatches = teamMatches.filter(m => checkedT.has(m.tournament));
-        }
 
-        // Find best logo across all available matches
-        let foundLogo = "";
-        for (const m of allMatches) {
-            if (m.team1 === teamName && m.team1_logo) { foundLogo = m.team1_logo; break; }
-            if (m.team2 === teamName && m.team2_logo) { foundLogo = m.team2_logo; break; }
-        }
-        if (!foundLogo && typeof INITIAL_MATCHES !== "undefined") {
-            for (const m of INITIAL_MATCHES) {
+            // Find best logo across all available matches
+            for (const m of allMatches) {
                 if (m.team1 === teamName && m.team1_logo) { foundLogo = m.team1_logo; break; }
                 if (m.team2 === teamName && m.team2_logo) { foundLogo = m.team2_logo; break; }
             }
-        }
 
-        // Calculate Win Rate / Wins / Losses
-        let wins = 0;
-        let losses = 0;
-        let draws = 0;
+            // Calculate Win Rate / Wins / Losses
+            teamMatches.forEach(m => {
+                const isTeam1 = m.team1 === teamName;
 
-        teamMatches.forEach(m => {
-            const isTeam1 = m.team1 === teamName;
+                if (m.status !== "Completed" && m.status) return; // skip upcoming/live matches for stats calculation
 
-            if (m.status !== "Completed" && m.status) return; // skip upcoming/live matches for stats calculation
+                const myScore = parseInt(isTeam1 ? m.score1 : m.score2) || 0;
+                const oppScore = parseInt(isTeam1 ? m.score2 : m.score1) || 0;
 
-            const myScore = parseInt(isTeam1 ? m.score1 : m.score2) || 0;
-            const oppScore = parseInt(isTeam1 ? m.score2 : m.score1) || 0;
+                if (myScore > oppScore) wins++;
+                else if (oppScore > myScore) losses++;
+                else draws++;
+            });
+        } else {
+            // OFF: page through every tournament in the DB via /api/team/<name>/history.
+            // "Load more" appends the next keyset page to the same state.
+            const status = thrShowFutureMatches ? "all" : "completed";
+            const appending = loadMore && thrHistoryState && thrHistoryState.team === teamName
+                && thrHistoryState.status === status && thrHistoryState.cursor;
+            if (!loadMore || appending) {
+                const params = new URLSearchParams({ status, limit: "100" });
+                if (appending) params.set("cursor", thrHistoryState.cursor);
+                try {
+                    const page = await fetch(`/api/team/${encodeURIComponent(teamName)}/history?${params}`).then(r => r.json());
+                    if (appending) {
+                        thrHistoryState.matches = thrHistoryState.matches.concat(page.matches || []);
+                        thrHistoryState.cursor = page.next_cursor;
+                    } else {
+                        thrHistoryState = {
+                            team: teamName,
+                            status,
+                            matches: page.matches || [],
+                            cursor: page.next_cursor,
+                            summary: page.summary || { wins: 0, losses: 0, draws: 0 },
+                            logo: page.logo || "",
+                        };
+                    }
+                } catch (err) {
+                    console.error("Failed to fetch team history:", err);
+                    thrHistoryState = { team: teamName, status, matches: [], cursor: null, summary: { wins: 0, losses: 0, draws: 0 }, logo: "" };
+                }
+            }
+            teamMatches = thrHistoryState.matches;
+            foundLogo = thrHistoryState.logo;
+            wins = thrHistoryState.summary.wins;
+            losses = thrHistoryState.summary.losses;
+            draws = thrHistoryState.summary.draws;
+        }
 
-            if (myScore > oppScore) wins++;
-            else if (oppScore > myScore) losses++;
-            else draws++;
-        });
+        if (!foundLogo && typeof INITIAL_MATCHES !== "undefined") {
+            for (const m of INITIAL_MATCHES) {
+                if (m.team1 === teamName && m.team1_logo) { foundLogo = m.team1_logo; break; }
+                if (m.team2 === teamName && m.team2_logo) { foundLogo = m.team2_logo; break; }
+            }
+        }
 
         const total = wins + losses + draws;
         const winrate = total > 0 ? Math.round((wins / total) * 100) : 0;
@@ -2925,8 +2832,16 @@ document.addEventListener("DOMContentLoaded", () => {
             `;
         });
         
+        if (!thrFilterSelectedTourneys && thrHistoryState && thrHistoryState.cursor) {
+            html += `<button type="button" class="refresh-btn thr-load-more" style="margin: 12px auto; display: block;">Load more</button>`;
+        }
+
         resultsContainer.innerHTML = html;
 
+        resultsContainer.querySelector(".thr-load-more")?.addEventListener("click", () => {
+            renderTeamHistory(teamName, true);
+        });
+
         resultsContainer.querySelectorAll(".team-history-row").forEach(row => {
             row.addEventListener("click", () => {
                 const mid = row.getAttribute("data-id");
@@ -3057,13 +2972,7 @@ document.addEventListener("DOMContentLoaded", () => {
             const color = e.target.value;
             tournamentColors[tourney] = color;
             try {
-                const cur = await fetch("/api/settings").then(r => r.json()).catch(() => ({}));
-                cur.tournament_colors = tournamentColors;
-                await fetch("/api/settings", {
-                    method: "POST",
-                    headers: { "Content-Type": "application/json" },
-                    body: JSON.stringify(cur)
-                });
+                await patchSettings({ tournament_colors: tournamentColors });
             } catch (err) {
                 console.error("Failed to save tournament colors:", err);
             }
@@ -3092,9 +3001,7 @@ document.addEventListener("DOMContentLoaded", () => {
         thrFilterSelectedTourneys = !showAll;
         // Persist to settings
         try {
-            const cur = await fetch("/api/settings").then(r => r.json()).catch(() => ({}));
-            cur.thr_show_all_tournaments = showAll;
-            await fetch("/api/settings", { method: "POST", headers: {"Content-Type":"application/json"}, body: JSON.stringify(cur) });
+            await patchSettings({ thr_show_all_tournaments: showAll });
         } catch (err) { console.error("Failed to save thr setting:", err); }
         // Re-render if modal is open
         if (selectedTeamHistoryName) renderTeamHistory(selectedTeamHistoryName);
@@ -3163,29 +3070,14 @@ document.addEventListener("DOMContentLoaded", () => {
     const tournamentStandingsContent = document.getElementById("tournament-standings-content");
     const standingsSearchInput = document.getElementById("standings-search");
 
-    // Full-stats dataset shared by the leaderboard and standings views.
-    // Fetched once from /api/matches/all and reused until the next Sync.
-    let cachedAllMatches = null;
+    // Server-computed standings for the current tournament selection.
+    // Reused while typing in the search box; dropped after Sync / stats loads.
+    let cachedStandings = null;
 
     async function renderTournamentStandings() {
         if (!tournamentStandingsContent) return;
 
         try {
-            if (!cachedAllMatches) {
-                const response = await fetch("/api/matches/all");
-                cachedAllMatches = await response.json();
-            }
-            const matches = cachedAllMatches || [];
-
-            if (!matches || matches.length === 0) {
-                tournamentStandingsContent.innerHTML = `<p style="padding: 30px; text-align: center; color: var(--text-muted);">No match data found.</p>`;
-                return;
-            }
-
-            const standingsByTourney = {};
-            const tourneyLogos = {};
-            const teamLogos = {};
-
             const visibleCheckedItems = Array.from(document.querySelectorAll("#tournament-checklist .tourney-item"))
                 .filter(item => item.style.display !== "none")
                 .map(item => item.querySelector(".tourney-checkbox"))
@@ -3193,64 +3085,27 @@ document.addEventListener("DOMContentLoaded", () => {
                 .map(cb => cb.value);
 
             const activeTournaments = new Set(visibleCheckedItems);
+            const cacheKey = visibleCheckedItems.join("\u001f");
 
-            matches.forEach(m => {
-                if (m.status?.toLowerCase() !== "completed" || m.score1 === null || m.score2 === null) return;
-                const tourney = m.tournament;
-                if (!tourney || !activeTournaments.has(tourney)) return;
-
-                const s1 = parseInt(m.score1);
-                const s2 = parseInt(m.score2);
-                if (isNaN(s1) || isNaN(s2)) return;
-
-                if (m.tournament_logo && !tourneyLogos[tourney]) tourneyLogos[tourney] = m.tournament_logo;
-                if (m.team1 && m.team1_logo && !teamLogos[m.team1]) teamLogos[m.team1] = m.team1_logo;
-                if (m.team2 && m.team2_logo && !teamLogos[m.team2]) teamLogos[m.team2] = m.team2_logo;
-
-                if (!standingsByTourney[tourney]) standingsByTourney[tourney] = { matchesCount: 0, teams: {} };
-                const tourneyData = standingsByTourney[tourney];
-                tourneyData.matchesCount++;
-
-                const t1 = m.team1 || "TBD";
-                const t2 = m.team2 || "TBD";
-
-                if (!tourneyData.teams[t1]) tourneyData.teams[t1] = { name: t1, w: 0, l: 0, mapW: 0, mapL: 0 };
-                if (!tourneyData.teams[t2]) tourneyData.teams[t2] = { name: t2, w: 0, l: 0, mapW: 0, mapL: 0 };
-
-                if (s1 > s2) {
-                    tourneyData.teams[t1].w++;
-                    tourneyData.teams[t2].l++;
-                } else if (s2 > s1) {
-                    tourneyData.teams[t2].w++;
-                    tourneyData.teams[t1].l++;
-                }
+            if (!cachedStandings || cachedStandings.key !== cacheKey) {
+                const params = new URLSearchParams();
+                visibleCheckedItems.forEach(t => params.append("tournament", t));
+                const data = visibleCheckedItems.length
+                    ? await fetch(`/api/standings?${params}`).then(r => r.json())
+                    : { standings: [] };
+                cachedStandings = { key: cacheKey, standings: data.standings || [] };
+            }
 
-                // Aggregate map scores
-                const maps = m.maps || [];
-                if (maps.length > 0) {
-                    maps.forEach(mp => {
-                        const ms1 = parseInt(mp.score1) || 0;
-                        const ms2 = parseInt(mp.score2) || 0;
-                        if (mp.winner === 0) {
-                            tourneyData.teams[t1].mapW++;
-                            tourneyData.teams[t2].mapL++;
-                        } else if (mp.winner === 1) {
-                            tourneyData.teams[t2].mapW++;
-                            tourneyData.teams[t1].mapL++;
-                        } else if (ms1 > ms2) {
-                            tourneyData.teams[t1].mapW++;
-                            tourneyData.teams[t2].mapL++;
-                        } else if (ms2 > ms1) {
-                            tourneyData.teams[t2].mapW++;
-                            tourneyData.teams[t1].mapL++;
-                        }
-                    });
-                } else {
-                    tourneyData.teams[t1].mapW += s1;
-                    tourneyData.teams[t1].mapL += s2;
-                    tourneyData.teams[t2].mapW += s2;
-                    tourneyData.teams[t2].mapL += s1;
-                }
+            const standingsByTourney = {};
+            const tourneyLogos = {};
+            const teamLogos = {};
+            cachedStandings.standings.forEach(st => {
+                st.teams.forEach(t => {
+                    if (t.logo && !teamLogos[t.name]) teamLogos[t.name] = t.logo;
+                });
+                // Keep the server's ranking order (an array, not a name-keyed object)
+                standingsByTourney[st.tournament] = { matchesCount: st.matches_count, teams: st.teams };
+                if (st.tournament_logo) tourneyLogos[st.tournament] = st.tournament_logo;
             });
 
             const query = (standingsSearchInput?.value || "").toLowerCase().trim();
@@ -3258,7 +3113,7 @@ document.addEventListener("DOMContentLoaded", () => {
             const tourneyEntries = Object.entries(standingsByTourney).filter(([tourneyName, data]) => {
                 if (!query) return true;
                 if (tourneyName.toLowerCase().includes(query)) return true;
-                return Object.keys(data.teams).some(tName => tName.toLowerCase().includes(query));
+                return data.teams.some(t => t.name.toLowerCase().includes(query));
             });
 
             if (tourneyEntries.length === 0) {
@@ -3273,20 +3128,14 @@ document.addEventListener("DOMContentLoaded", () => {
 
             tourneyEntries.forEach(([tourneyName, data]) => {
                 const logo = tourneyLogos[tourneyName] || "";
-                let teamsList = Object.values(data.teams);
+                let teamsList = data.teams.slice();
 
                 if (query && !tourneyName.toLowerCase().includes(query)) {
                     teamsList = teamsList.filter(t => t.name.toLowerCase().includes(query));
                 }
 
-                // Default sorting: Wins desc, Series Losses asc, Map Diff desc
-                teamsList.sort((a, b) => {
-                    if (b.w !== a.w) return b.w - a.w;
-                    if (a.l !== b.l) return a.l - b.l;
-                    const diffA = a.mapW - a.mapL;
-                    const diffB = b.mapW - b.mapL;
-                    return diffB - diffA;
-                });
+                // Teams arrive ranked by the server: Wins desc, Series Losses asc,
+                // Map Diff desc, Round Diff desc
 
                 html += `
                     <div class="standings-tourney-card">
@@ -3303,6 +3152,7 @@ document.addEventListener("DOMContentLoaded", () => {
                                     <th class="r"><span>Series (W-L)</span></th>
                                     <th class="r"><span>Maps (W-L)</span></th>
                                     <th class="r"><span>Map Diff</span></th>
+                                    <th class="r"><span>Round Diff</span></th>
                                     <th class="r"><span>Win Rate</span></th>
                                 </tr>
                             </thead>
@@ -3330,6 +3180,7 @@ document.addEventListener("DOMContentLoaded", () => {
                             <td class="r" style="font-weight: 700;">${team.w} – ${team.l}</td>
                             <td class="r">${team.mapW} – ${team.mapL}</td>
                             <td class="r">${formatDiff(mapDiff)}</td>
+                            <td class="r">${formatDiff(team.roundDiff)}</td>
                             <td class="r"><span class="standings-win-rate-pill">${winRate}%</span></td>
                         </tr>
                     `;
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The app imports scraper as a top-level module from the vlr folder.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,56 @@
+"""Run scraper against a throwaway folder (shared by the tests)."""
+import os
+from contextlib import contextmanager
+
+import scraper
+
+# Every file or folder scraper reads or writes, relative to its folder.
+# Migrations read the legacy JSON files and ignored_matches.db, so all of
+# them must point into the scratch folder, not just matches.db.
+SCRATCH_PATHS = {
+    "JSON_PATH": "matches.json",
+    "DB_PATH": "matches.db",
+    "IGNORED_DB_PATH": "ignored_matches.db",
+    "ARCHIVE_DIR": "archive",
+    "BACKUP_DIR": "backups",
+    "IMAGE_CACHE_DIR": "images_cache",
+    "IGNORELIST_PATH": "ignorelist.json",
+    "SETTINGS_JSON_PATH": "settings.json",
+    "TOURNAMENTS_CACHE_PATH": "tournaments_cache.json",
+}
+
+
+def _reset_caches():
+    with scraper._cache_lock:
+        scraper._cached_matches = None
+    scraper._invalidate_standings()
+
+
+@contextmanager
+def scratch_database(base_dir):
+    """Point every scraper path at base_dir for the duration of a block.
+
+    Only for a separate process such as the tests: a server sharing the
+    module would send its other threads to the scratch database.
+    """
+    scraper.flush_match_writes()
+    saved = {name: getattr(scraper, name) for name in ("BASE_DIR", *SCRATCH_PATHS)}
+    saved_initialized = scraper._db_initialized
+    # restore_backup writes into BASE_DIR by default.
+    scraper.BASE_DIR = base_dir
+    for name, relative in SCRATCH_PATHS.items():
+        setattr(scraper, name, os.path.join(base_dir, relative))
+    scraper._db_initialized = False
+    _reset_caches()
+    try:
+        yield
+    finally:
+        scraper._sql_trace = None
+        scraper.flush_match_writes()
+        scraper._pool_for(scraper.DB_PATH).close_idle()
+        with scraper._pools_lock:
+            scraper._pools.pop(scraper.DB_PATH, None)
+        for name, value in saved.items():
+            setattr(scraper, name, value)
+        scraper._db_initialized = saved_initialized
+        _reset_caches()
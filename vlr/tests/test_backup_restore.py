@@ -0,0 +1,30 @@
+import os
+import time
+
+import scraper
+from scratch import scratch_database
+
+
+def _match(mid, tournament, ts):
+    return {
+        "id": str(mid), "href": f"/{mid}/restore", "date": "", "time": "", "team1": "Alpha",
+        "team2": "Beta", "score1": "2", "score2": "0", "tournament": tournament,
+        "series": "Final", "tournament_logo": "", "eta": "", "status": "Completed",
+        "unix_timestamp": ts,
+    }
+
+
+def test_restore_moves_archives_newer_than_the_snapshot_aside(tmp_path):
+    with scratch_database(str(tmp_path)):
+        scraper._upsert_matches_to_db([_match(1, "Old Cup", 1500000000), _match(2, "New Cup", int(time.time()))])
+        snapshot = scraper.backup_databases(compress=False)
+        assert scraper.archive_old_tournaments() == ["Old Cup"]
+        archive = scraper._archive_path(2017)
+
+        scraper.restore_backup(snapshot, overwrite=True)
+
+        assert scraper._archive_paths() == {}
+        assert os.path.exists(f"{archive}.before-{snapshot}")
+        assert scraper.find_duplicate_match_ids() == []
+        with scraper._get_conn() as conn:
+            assert [row[0] for row in conn.execute("SELECT id FROM matches ORDER BY id")] == ["1", "2"]
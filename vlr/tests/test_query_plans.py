@@ -0,0 +1,155 @@
+"""Fail if a DB reader or writer does a full table scan of a large table.
+
+Runs every DB path of scraper on a scratch database with statement tracing
+on, then explains every traced statement (plus the queries of
+network-bound functions and of the summary triggers).
+"""
+import re
+
+import scraper
+from scratch import scratch_database
+
+# Tables that grow with the number of matches. A plan step that reads one of
+# them without an index is a full table scan.
+LARGE_TABLES = (
+    "matches", "match_maps", "player_map_stats", "player_aggregates", "player_week_stats", "team_week_stats",
+)
+
+
+def plan_full_scans(conn, sql, params=()):
+    pattern = re.compile(rf"^SCAN (\w+\.)?({'|'.join(LARGE_TABLES)})\b")
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return [row[3] for row in plan if pattern.match(row[3]) and " INDEX" not in row[3]]
+
+
+def _listing(mid, tournament, team1, team2, status, ts):
+    return {
+        "id": str(mid), "href": f"/{mid}/check", "date": "", "time": "", "team1": team1,
+        "team2": team2, "score1": "2", "score2": "1", "tournament": tournament,
+        "series": "Group A: Round 1", "tournament_logo": "", "eta": "", "status": status,
+        "unix_timestamp": ts,
+    }
+
+
+def check_query_plans(base_dir):
+    """Seed a few matches in base_dir and explain the queries of every DB path.
+
+    Returns a list of {"step", "sql", "scans"} for statements that fully
+    scan a large table; steps that must read everything are exempt.
+    """
+    player = {
+        "name": "player", "href": "/player/1/player", "photo": "", "agents": [], "rating": "1.10",
+        "acs": "220", "k": "18", "d": "14", "a": "5", "kd_diff": "+4", "kast": "72%", "adr": "140",
+        "hs": "25%", "fk": "3", "fd": "2", "fk_diff": "+1",
+    }
+    tables = {"team1": [player], "team2": [dict(player, name="other")]}
+    detail = dict(
+        _listing(1, "Check Cup", "Alpha", "Beta", "Completed", 1700000000),
+        maps=[{"name": "Ascent", "score1": "13", "score2": "9", "winner": 0}],
+        players={"all": tables, "0": tables},
+    )
+    rows = [
+        _listing(1, "Check Cup", "Alpha", "Beta", "Completed", 1700000000),
+        _listing(2, "Check Cup", "Beta", "Gamma", "Live", 1700003600),
+        _listing(3, "Other Cup", "Alpha", "Gamma", "Upcoming", 0),
+        _listing(4, "Old Cup", "Alpha", "Beta", "Completed", 1500000000),
+    ]
+    def catalog():
+        with scraper._get_conn() as conn:
+            scraper._store_catalog_items(conn, [
+                {"id": "7", "name": "Check Cup", "href": "/event/7/check-cup", "region": "Europe", "status": "Ongoing"},
+            ], 1, 0, 0)
+        scraper.query_tournament_catalog(query="check", region="Europe", status="ongoing")
+        scraper.query_tournament_catalog(page=2)
+        scraper.get_catalog_tournaments(event_ids=[7], names=["Check Cup"])
+
+    s = scraper
+    steps = (
+        ("listing sync", lambda: s._upsert_matches_to_db([dict(r) for r in rows]), False),
+        ("listing resync", lambda: s._upsert_matches_to_db([dict(r) for r in rows]), False),
+        ("detail write", lambda: (s.upsert_match(detail), s.flush_match_writes()), False),
+        ("load_match", lambda: s.load_match("1"), False),
+        ("load_matches(tournaments)", lambda: s.load_matches(["Check Cup"], include_payload=False), False),
+        ("load_matches(all)", lambda: s.load_matches(exclude_tournaments=["Other Cup"]), True),
+        ("tournament overview", lambda: s.load_tournament_overview(["Other Cup"]), False),
+        ("leaderboard(tournaments)", lambda: s.get_player_leaderboard(["Check Cup"], split_by_team=True, query="p"), False),
+        ("leaderboard(all)", lambda: s.get_player_leaderboard(), True),
+        ("player form", lambda: s.get_player_form(1699000000, 1701000000, players=["player"], split_by_team=True), False),
+        ("team form", lambda: s.get_team_form(1699000000, 1701000000, teams=["Alpha"], tournament_names=["Check Cup"]), False),
+        ("standings", lambda: s.get_tournament_standings(["Check Cup"]), False),
+        ("team history", lambda: s.get_team_history("Alpha", statuses=["Completed"], since=1, tournament_names=["Check Cup"]), False),
+        ("team history page", lambda: s.get_team_history("Alpha", cursor="1700000000:1"), False),
+        ("known tournaments", s.get_known_tournament_names, False),
+        ("event add", lambda: s._upsert_matches_to_db([dict(r, event_id=99) for r in rows[:2]]), False),
+        ("event respelled", lambda: s._upsert_matches_to_db([dict(rows[0], tournament="Check Cup Finals", score1="3")]), False),
+        ("known events", lambda: (s.get_known_events(), s.get_ignored_event_ids(), s.get_event_names([99])), False),
+        ("tournament catalog", catalog, False),
+        ("player photos", lambda: (
+            s.record_player_photos({"/player/1/player": "", "/player/2/new": None}, names={"/player/1/player": "player"}),
+            s.get_cached_player_photos(["/player/1/player", "/player/3/x"]),
+        ), False),
+        ("search", lambda: s.search_entities("alp", kinds=["team", "tournament", "series"]), False),
+        ("ignore", lambda: s.set_tournaments_ignored(["Other Cup"]), False),
+        ("unignore", lambda: s.set_tournaments_ignored(["Other Cup"], ignored=False), False),
+        ("ignore with stats", lambda: (
+            s.set_tournaments_ignored(["Check Cup"]), s.set_tournaments_ignored(["Check Cup"], ignored=False),
+        ), False),
+        ("archive", s.archive_old_tournaments, False),
+        ("team history with archives", lambda: s.get_team_history("Alpha", statuses=["Completed"]), False),
+        ("leaderboard with archives", lambda: s.get_player_leaderboard(["Old Cup"]), False),
+        ("archived match", lambda: s.load_match("4"), False),
+        ("ignore with archives", lambda: (
+            s.set_tournaments_ignored(["Old Cup"]), s.set_tournaments_ignored(["Old Cup"], ignored=False),
+        ), False),
+        ("archived rewrite", lambda: (
+            s.upsert_match(dict(rows[3], score1="3")), s.flush_match_writes(),
+            s._upsert_matches_to_db([dict(rows[3], score1="3")]),
+        ), False),
+        ("form with archives", lambda: (s.get_player_form(1499000000, 1501000000), s.get_team_form(1499000000)), False),
+    )
+    extra = (
+        ("load_missing_stats", s.MISSING_STATS_QUERY, (0, 30)),
+        ("backfill_match_metadata", s.NEEDS_METADATA_QUERY, (12,)),
+        ("backfill_tournament_logos", s.MISSING_TOURNAMENT_LOGOS_QUERY, ()),
+        ("backfill_tournament_logos events", "SELECT event_id, name FROM events WHERE name IN (?)", ("",)),
+        ("backfill_event_ids", s.MISSING_EVENT_QUERY, ()),
+        ("backfill_event_ids link", "SELECT id FROM matches WHERE tournament = ? AND event_id IS NULL", ("",)),
+        ("tournament summary trigger", f"{s._TOURNAMENT_SUMMARY_SELECT} WHERE tournament = ? GROUP BY tournament", ("",)),
+        ("search triggers", "SELECT (SELECT group_concat(name, ' ') FROM team_aliases WHERE team_id = ?), "
+         "(SELECT group_concat(name, ' ') FROM event_aliases WHERE event_id = ?)", ("", 0)),
+        ("search cleanup", "SELECT 1 FROM matches WHERE team2_id = ? UNION ALL "
+         "SELECT 1 FROM matches WHERE team2 = ? AND team2_id IS NULL UNION ALL "
+         "SELECT 1 FROM matches WHERE tournament = ? AND series = ?", ("", "", "", "")),
+    )
+    problems = []
+    with scratch_database(base_dir):
+        s._ensure_db()
+        traced = []
+        for label, run, allow_scan in steps:
+            s._sql_trace = []
+            try:
+                run()
+                s.flush_match_writes()
+            finally:
+                statements, s._sql_trace = s._sql_trace, None
+            for sql in dict.fromkeys(statements):
+                if not re.match(r"\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b", sql, re.I):
+                    continue
+                traced.append((label, sql, (), allow_scan))
+        traced.extend((label, sql, params, False) for label, sql, params in extra)
+        with s._get_conn() as conn, s._with_archives(conn):
+            for label, sql, params, allow_scan in traced:
+                scans = plan_full_scans(conn, sql, params)
+                if scans and not allow_scan:
+                    problems.append({"step": label, "sql": " ".join(sql.split()), "scans": scans})
+        # Archived rewrites must not put a second copy back into matches.db.
+        duplicates = s.find_duplicate_match_ids()
+        if duplicates:
+            problems.append({
+                "step": "archived rewrite", "sql": "all_matches", "scans": [f"ids stored twice: {', '.join(duplicates)}"],
+            })
+    return problems
+
+
+def test_no_full_table_scans(tmp_path):
+    assert check_query_plans(str(tmp_path)) == []
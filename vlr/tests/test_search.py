@@ -0,0 +1,42 @@
+import scraper
+from scratch import scratch_database
+
+
+def _match(mid, tournament, team1, team2, ts, players=None):
+    match = {
+        "id": str(mid), "href": f"/{mid}/search", "date": "", "time": "", "team1": team1,
+        "team2": team2, "score1": "2", "score2": "0", "tournament": tournament,
+        "series": "Final", "tournament_logo": "", "eta": "", "status": "Completed",
+        "unix_timestamp": ts,
+    }
+    if players:
+        tables = {"team1": players, "team2": []}
+        match.update(maps=[{"name": "Bind", "score1": "13", "score2": "5", "winner": 0}],
+                     players={"all": tables, "0": tables})
+    return match
+
+
+def _found(query):
+    return {(row["kind"], row["name"]): row["detail"] for row in scraper.search_entities(query)}
+
+
+def test_search_leaves_out_teams_and_players_of_ignored_tournaments(tmp_path):
+    player = {
+        "name": "Sentry", "href": "/player/5/sentry", "photo": "", "agents": [], "rating": "1.10",
+        "acs": "220", "k": "18", "d": "14", "a": "5", "kd_diff": "+4", "kast": "72%", "adr": "140",
+        "hs": "25%", "fk": "3", "fd": "2", "fk_diff": "+1",
+    }
+    with scratch_database(str(tmp_path)):
+        scraper._upsert_matches_to_db([_match(1, "Main Cup", "Liquid", "Beta", 1700000000)])
+        scraper.upsert_match(_match(2, "Side Cup", "Liquid", "Solo", 1700100000, players=[player]))
+        scraper.flush_match_writes()
+
+        scraper.set_tournaments_ignored(["Side Cup"])
+        assert _found("liq") == {("team", "Liquid"): "Main Cup"}
+        assert _found("solo") == {}
+        assert _found("sent") == {}
+
+        scraper.set_tournaments_ignored(["Side Cup"], ignored=False)
+        assert _found("liq") == {("team", "Liquid"): "Side Cup"}
+        assert _found("solo") == {("team", "Solo"): "Side Cup"}
+        assert _found("sent") == {("player", "Sentry"): "Liquid"}